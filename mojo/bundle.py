@@ -0,0 +1,180 @@
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Union
+
+import mujoco
+import numpy as np
+from dm_control import mjcf
+
+from mojo.elements.utils import model_to_mjb
+
+_MAGIC = b"MOJOBNDL"
+_VERSION = 1
+# Magic, version and header length
+_PREAMBLE = struct.Struct("<8sIQ")
+# Sections start on cache line boundaries so that they can be viewed in place
+_ALIGNMENT = 64
+_MODEL_SECTION = "model"
+_MJCF_SECTION = "mjcf"
+_STATE_SECTION = "state"
+_ASSET_PREFIX = "asset:"
+# Names are laid out differently between models compiled from equivalent MJCF
+_SKIPPED_MODEL_FIELDS = ("name_", "names")
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_bundle(
+    path: Union[str, Path], sections: dict[str, bytes], metadata: dict = None
+) -> None:
+    """Write named byte sections into a single file.
+
+    The file starts with a JSON header holding the offset and size of every
+    section, followed by the sections, each aligned to 64 bytes.
+
+    :param path: Output file path.
+    :param sections: Section name to contents.
+    :param metadata: Optional JSON serializable metadata stored in the header.
+    """
+    layout, offset = {}, 0
+    for name, contents in sections.items():
+        layout[name] = {"offset": offset, "size": len(contents)}
+        offset = _align(offset + len(contents))
+    header = json.dumps({"sections": layout, "metadata": metadata or {}}).encode()
+    data_start = _align(_PREAMBLE.size + len(header))
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(_MAGIC, _VERSION, len(header)))
+        f.write(header)
+        for name, contents in sections.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(contents)
+
+
+def read_bundle(path: Union[str, Path]) -> tuple[dict, dict[str, memoryview]]:
+    """Memory map a bundle written by `write_bundle`.
+
+    :param path: Path to the bundle.
+    :return: The metadata and a zero-copy view of every section.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, header_size = _PREAMBLE.unpack_from(buffer)
+    if magic != _MAGIC:
+        raise ValueError(f"{path} is not a Mojo bundle.")
+    if version != _VERSION:
+        raise ValueError(f"Unsupported bundle version {version}.")
+    header_end = _PREAMBLE.size + header_size
+    header = json.loads(bytes(buffer[_PREAMBLE.size : header_end]))
+    data_start = _align(header_end)
+    view = memoryview(buffer)
+    sections = {
+        name: view[data_start + s["offset"] : data_start + s["offset"] + s["size"]]
+        for name, s in header["sections"].items()
+    }
+    return header["metadata"], sections
+
+
+def copy_model_values(source: mujoco.MjModel, target: mujoco.MjModel) -> None:
+    """Copy the numeric fields of a model into an identically laid out model.
+
+    Used to carry values written to a compiled model at runtime over to a model
+    compiled from the same MJCF.
+    """
+    for field in dir(source):
+        if field.startswith("_") or field.startswith(_SKIPPED_MODEL_FIELDS):
+            continue
+        value = getattr(source, field)
+        if not isinstance(value, np.ndarray):
+            continue
+        target_value = getattr(target, field)
+        if target_value.shape == value.shape and value.flags.writeable:
+            target_value[...] = value
+
+
+def get_state(model: mujoco.MjModel, data: mujoco.MjData) -> np.ndarray:
+    spec = mujoco.mjtState.mjSTATE_INTEGRATION
+    state = np.empty(mujoco.mj_stateSize(model, spec))
+    mujoco.mj_getState(model, data, state, spec)
+    return state
+
+
+def set_state(model: mujoco.MjModel, data: mujoco.MjData, state: np.ndarray):
+    mujoco.mj_setState(model, data, state, mujoco.mjtState.mjSTATE_INTEGRATION)
+
+
+def save_scene(
+    path: Union[str, Path],
+    model_mjcf: mjcf.RootElement,
+    model: mujoco.MjModel,
+    data: mujoco.MjData,
+) -> None:
+    """Save the compiled model, MJCF, assets and state of a scene to a bundle."""
+    xml = model_mjcf.to_xml_string()
+    assets = model_mjcf.get_assets()
+    # Names are escaped once the MJCF is parsed back from XML, so compile the
+    # stored model from the MJCF exactly as `load_scene` will parse it. Element
+    # bindings then resolve against the loaded model.
+    parsed_mjcf = mjcf.from_xml_string(xml, escape_separators=True, assets=assets)
+    parsed_model = mjcf.Physics.from_mjcf_model(parsed_mjcf).model.ptr
+    copy_model_values(model, parsed_model)
+    sections = {
+        _MODEL_SECTION: model_to_mjb(parsed_model),
+        _MJCF_SECTION: xml.encode(),
+        _STATE_SECTION: get_state(model, data).tobytes(),
+    }
+    for name, contents in assets.items():
+        contents = contents.encode() if isinstance(contents, str) else contents
+        sections[f"{_ASSET_PREFIX}{name}"] = contents
+    write_bundle(path, sections)
+
+
+def _load_sections(sections: dict[str, memoryview]) -> tuple[mjcf.Physics, np.ndarray]:
+    # MuJoCo allocates its own model buffers, so the MJB is copied into them
+    physics = mjcf.Physics.from_byte_string(bytes(sections[_MODEL_SECTION]))
+    state = np.frombuffer(sections[_STATE_SECTION], dtype=np.float64)
+    return physics, state
+
+
+def load_physics(path: Union[str, Path]) -> mjcf.Physics:
+    """Load the compiled model of a bundle in its saved state.
+
+    The MJCF and assets are not parsed, which makes this the fastest way to
+    restore a scene that is only simulated, not edited.
+
+    :return: The physics of the compiled model.
+    """
+    _, sections = read_bundle(path)
+    physics, state = _load_sections(sections)
+    set_state(physics.model.ptr, physics.data.ptr, state)
+    mujoco.mj_forward(physics.model.ptr, physics.data.ptr)
+    return physics
+
+
+def load_scene(
+    path: Union[str, Path]
+) -> tuple[mjcf.RootElement, mjcf.Physics, np.ndarray]:
+    """Load a bundle written by `save_scene` without compiling.
+
+    Sections are memory mapped, but the model and asset bytes are copied while
+    loading and the MJCF is parsed from XML so that the scene stays editable.
+    Use `load_physics` when only the physics is needed.
+
+    :return: The MJCF, the physics of the compiled model and the saved state.
+    """
+    _, sections = read_bundle(path)
+    assets = {
+        name[len(_ASSET_PREFIX) :]: bytes(contents)
+        for name, contents in sections.items()
+        if name.startswith(_ASSET_PREFIX)
+    }
+    model_mjcf = mjcf.from_xml_string(
+        bytes(sections[_MJCF_SECTION]).decode(),
+        escape_separators=True,
+        assets=assets,
+    )
+    physics, state = _load_sections(sections)
+    return model_mjcf, physics, state
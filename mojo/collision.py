@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Union
+
+import numpy as np
+from dm_control import mjcf
+
+from mojo.elements.body import Body
+from mojo.elements.geom import Geom
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+
+class CollisionLayers:
+    """Named collision layers compiled down to contype/conaffinity bitmasks.
+
+    Each layer owns one bit. A geom in a layer gets that bit as its contype and
+    the bits of every layer it collides with as its conaffinity. Since the
+    collision matrix is symmetric, MuJoCo's test
+    `(contype1 & conaffinity2) || (contype2 & conaffinity1)` reproduces it
+    exactly. Changing layers or the matrix only touches the bitmasks, which are
+    written straight to the compiled model without a recompile. Only geoms put
+    in a layer with `set_layer` are touched, other geoms keep their masks.
+    """
+
+    MAX_LAYERS = 31
+    DEFAULT_LAYER = "default"
+
+    def __init__(self, mojo: Mojo):
+        self._mojo = mojo
+        # Layer 0 matches MuJoCo's default contype=conaffinity=1
+        self._layers: dict[str, int] = {self.DEFAULT_LAYER: 0}
+        self._matrix = np.zeros((self.MAX_LAYERS, self.MAX_LAYERS), dtype=bool)
+        self._matrix[0, 0] = True
+        # Geoms put in a layer, keyed by the id of their MJCF element
+        self._members: dict[int, tuple[mjcf.Element, str]] = {}
+
+    def copy(self, mojo: Mojo) -> CollisionLayers:
+        """Copy the layers, collision matrix and members for another Mojo instance."""
+        layers = CollisionLayers(mojo)
+        layers._layers = dict(self._layers)
+        layers._matrix = self._matrix.copy()
+        layers._members = dict(self._members)
+        return layers
+
+    def remap(self, resolve: Callable[[mjcf.Element], Optional[mjcf.Element]]):
+        """Move the members to other MJCF elements, dropping unresolved ones.
+
+        :param resolve: Maps the MJCF element of a member to its new element.
+        """
+        members = self._members.values()
+        self._members = {
+            id(target): (target, layer)
+            for geom_mjcf, layer in members
+            if (target := resolve(geom_mjcf)) is not None
+        }
+
+    @property
+    def layers(self) -> list[str]:
+        return list(self._layers.keys())
+
+    def _bit(self, layer: str) -> int:
+        if layer not in self._layers:
+            raise ValueError(f"Unknown collision layer '{layer}'.")
+        return self._layers[layer]
+
+    def add_layer(self, name: str, collides_with: Sequence[str] = None) -> None:
+        """Add a new collision layer.
+
+        :param name: Name of the layer.
+        :param collides_with: Layers that collide with the new layer. Use the new
+        layer's own name to make geoms within the layer collide with each other.
+        Defaults to colliding with everything, including itself.
+        """
+        if name in self._layers:
+            raise ValueError(f"Collision layer '{name}' already exists.")
+        if len(self._layers) == self.MAX_LAYERS:
+            raise ValueError(f"Cannot have more than {self.MAX_LAYERS} layers.")
+        self._layers[name] = len(self._layers)
+        collides_with = self.layers if collides_with is None else collides_with
+        for other in collides_with:
+            self._set_matrix(name, other, True)
+        self._apply_matrix()
+
+    def _set_matrix(self, layer_a: str, layer_b: str, value: bool):
+        bit_a, bit_b = self._bit(layer_a), self._bit(layer_b)
+        self._matrix[bit_a, bit_b] = value
+        self._matrix[bit_b, bit_a] = value
+
+    def set_collides(self, layer_a: str, layer_b: str, value: bool = True) -> None:
+        """Set whether two layers collide with each other."""
+        self._set_matrix(layer_a, layer_b, value)
+        self._apply_matrix()
+
+    def collides(self, layer_a: str, layer_b: str) -> bool:
+        return bool(self._matrix[self._bit(layer_a), self._bit(layer_b)])
+
+    def get_contype(self, layer: str) -> int:
+        return 1 << self._bit(layer)
+
+    def get_conaffinity(self, layer: str) -> int:
+        return self._affinity_table()[self._bit(layer)]
+
+    def _affinity_table(self) -> list[int]:
+        weights = 1 << np.arange(self.MAX_LAYERS, dtype=np.int64)
+        return [int(w) for w in self._matrix.astype(np.int64) @ weights]
+
+    def set_layer(self, element: Union[Geom, Body], layer: str) -> None:
+        """Move a geom, or all geoms of a body, to a collision layer."""
+        geoms = element.geoms if isinstance(element, Body) else [element]
+        contype, conaffinity = self.get_contype(layer), self.get_conaffinity(layer)
+        physics = self._mojo.physics
+        for geom in geoms:
+            self._mojo.mirror_to_mjcf(
+                geom.mjcf, contype=contype, conaffinity=conaffinity
+            )
+            self._members[id(geom.mjcf)] = (geom.mjcf, layer)
+        if geoms:
+            binded = physics.bind([g.mjcf for g in geoms])
+            binded.contype = contype
+            binded.conaffinity = conaffinity
+
+    def discard(self, geom: Geom) -> None:
+        """Take a geom out of its layer, leaving its bitmasks as they are."""
+        geom_mjcf, _ = self._members.get(id(geom.mjcf), (None, None))
+        if geom_mjcf is geom.mjcf:
+            del self._members[id(geom.mjcf)]
+
+    def get_layer(self, geom: Geom) -> Optional[str]:
+        """Get the collision layer of a geom, or None if it is not in a layer."""
+        geom_mjcf, layer = self._members.get(id(geom.mjcf), (None, None))
+        return layer if geom_mjcf is geom.mjcf else None
+
+    def _apply_matrix(self):
+        geoms_mjcf = self._mojo.root_element.mjcf.find_all("geom")
+        # Forget geoms that were removed from the scene
+        present = {id(geom_mjcf) for geom_mjcf in geoms_mjcf}
+        self._members = {
+            key: member for key, member in self._members.items() if key in present
+        }
+        if not self._members:
+            return
+        table = self._affinity_table()
+        members = list(self._members.values())
+        conaffinities = [table[self._layers[layer]] for _, layer in members]
+        for (geom_mjcf, _), conaffinity in zip(members, conaffinities):
+            # Keep the MJCF in sync so that the layers survive a recompile
+            self._mojo.mirror_to_mjcf(geom_mjcf, conaffinity=conaffinity)
+        binded = self._mojo.physics.bind([geom_mjcf for geom_mjcf, _ in members])
+        binded.conaffinity = conaffinities
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Union
+
+import numpy as np
+
+from mojo.elements.body import Body
+from mojo.elements.element import MujocoElement
+from mojo.elements.geom import Geom
+from mojo.spatial import subtree_body_ids, subtree_geom_ids
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+ContactCallback = Callable[[MujocoElement, MujocoElement], None]
+
+
+class ContactTracker:
+    """Emits events when contacts between geoms or bodies begin and end.
+
+    Contact pairs are encoded as sorted integer keys and diffed against the
+    previous update with vectorized set operations, so the cost of an update
+    only depends on the number of contacts.
+    """
+
+    def __init__(
+        self,
+        mojo: Mojo,
+        per_body: bool = False,
+        elements: Sequence[Union[Geom, Body]] = None,
+        on_begin: Optional[ContactCallback] = None,
+        on_end: Optional[ContactCallback] = None,
+        update_on_step: bool = True,
+    ):
+        """Create a contact tracker.
+
+        :param mojo: The Mojo instance.
+        :param per_body: If true, contacts are tracked between bodies instead of
+        geoms, so touching a body with several of its geoms is a single contact.
+        :param elements: If set, only contacts involving one of these geoms or
+        bodies, including their descendants, are tracked.
+        :param on_begin: Callback executed with both elements of a new contact.
+        :param on_end: Callback executed with both elements of a finished contact.
+        :param update_on_step: If true, contacts are updated after every step.
+        """
+        self._mojo = mojo
+        self._per_body = per_body
+        self._elements = None if elements is None else list(elements)
+        self._on_begin = on_begin
+        self._on_end = on_end
+        self._generation = -1
+        self._num_ids = 0
+        self._mask: Optional[np.ndarray] = None
+        self._active = np.zeros(0, dtype=np.int64)
+        self._began = np.zeros(0, dtype=np.int64)
+        self._ended = np.zeros(0, dtype=np.int64)
+        self._update_on_step = update_on_step
+        if update_on_step:
+            mojo.add_step_callback(self.update)
+
+    def _resolve(self):
+        _ = self._mojo.physics
+        if self._generation == self._mojo.generation:
+            return
+        model = self._mojo.model
+        self._num_ids = model.nbody if self._per_body else model.ngeom
+        self._mask = None
+        if self._elements is not None:
+            self._mask = np.zeros(self._num_ids, dtype=bool)
+            for element in self._elements:
+                element_id = int(element.id)
+                if isinstance(element, Body) and not self._per_body:
+                    self._mask[subtree_geom_ids(model, element_id)] = True
+                elif isinstance(element, Body):
+                    self._mask[subtree_body_ids(model, element_id)] = True
+                elif isinstance(element, Geom) and self._per_body:
+                    self._mask[model.geom_bodyid[element_id]] = True
+                else:
+                    self._mask[element_id] = True
+        # Ids are not stable across compiles, so start from a clean slate
+        self._active = np.zeros(0, dtype=np.int64)
+        self._generation = self._mojo.generation
+
+    def _current_keys(self) -> np.ndarray:
+        data = self._mojo.data
+        contact = data.contact
+        first, second = contact.geom1, contact.geom2
+        if self._per_body:
+            body_ids = self._mojo.model.geom_bodyid
+            first, second = body_ids[first], body_ids[second]
+        low = np.minimum(first, second).astype(np.int64)
+        high = np.maximum(first, second).astype(np.int64)
+        if self._mask is not None:
+            keep = self._mask[low] | self._mask[high]
+            low, high = low[keep], high[keep]
+        return np.unique(low * self._num_ids + high)
+
+    def _to_pairs(self, keys: np.ndarray) -> np.ndarray:
+        return np.stack(np.divmod(keys, self._num_ids), axis=-1)
+
+    def update(self):
+        """Diff the current contacts against the previous update."""
+        self._resolve()
+        current = self._current_keys()
+        self._began = np.setdiff1d(current, self._active, assume_unique=True)
+        self._ended = np.setdiff1d(self._active, current, assume_unique=True)
+        self._active = current
+        if self._on_begin is not None:
+            for first, second in self._to_pairs(self._began):
+                self._on_begin(self._element(first), self._element(second))
+        if self._on_end is not None:
+            for first, second in self._to_pairs(self._ended):
+                self._on_end(self._element(first), self._element(second))
+
+    def _element(self, element_id: int) -> Union[Geom, Body]:
+        if self._per_body:
+            return self._mojo.get_body(int(element_id))
+        return self._mojo.get_geom(int(element_id))
+
+    @property
+    def began(self) -> np.ndarray:
+        """Id pairs of the contacts that began in the last update."""
+        return self._to_pairs(self._began)
+
+    @property
+    def ended(self) -> np.ndarray:
+        """Id pairs of the contacts that ended in the last update."""
+        return self._to_pairs(self._ended)
+
+    @property
+    def active(self) -> np.ndarray:
+        """Id pairs of all contacts present at the last update."""
+        return self._to_pairs(self._active)
+
+    def in_contact(
+        self, element: Union[Geom, Body], other: Union[Geom, Body] = None
+    ) -> bool:
+        """Check whether an element was in contact at the last update.
+
+        Geoms count for their body when tracking per body, and bodies count
+        through their own geoms otherwise.
+
+        :param element: A geom or a body.
+        :param other: If set, only contacts with this element are considered.
+        """
+        pairs = self.active
+        involved = np.any(np.isin(pairs, self._tracked_ids(element)), axis=-1)
+        if other is not None:
+            involved &= np.any(np.isin(pairs, self._tracked_ids(other)), axis=-1)
+        return bool(involved.any())
+
+    def _tracked_ids(self, element: Union[Geom, Body]) -> np.ndarray:
+        if not isinstance(element, (Geom, Body)):
+            raise TypeError(f"Expected a geom or a body, got {type(element).__name__}.")
+        model = self._mojo.model
+        element_id = int(element.id)
+        if isinstance(element, Geom) and self._per_body:
+            return np.array([model.geom_bodyid[element_id]])
+        if isinstance(element, Body) and not self._per_body:
+            return np.flatnonzero(model.geom_bodyid == element_id)
+        return np.array([element_id])
+
+    def close(self):
+        """Stop updating after every step."""
+        if self._update_on_step:
+            self._mojo.remove_step_callback(self.update)
+            self._update_on_step = False
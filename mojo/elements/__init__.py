@@ -1,8 +1,12 @@
-from mojo.elements.body import Body
+from mojo.elements.actuator import Actuator, ActuatorGroup
+from mojo.elements.body import Body, MocapGroup
 from mojo.elements.camera import Camera
 from mojo.elements.element import MujocoElement
+from mojo.elements.equality import Equality
 from mojo.elements.geom import Geom
+from mojo.elements.heightfield import HeightField
 from mojo.elements.joint import Joint
 from mojo.elements.light import Light
 from mojo.elements.model import MujocoModel
+from mojo.elements.sensor import Sensor, SensorGroup
 from mojo.elements.site import Site
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Union
+
+import numpy as np
+from mujoco_utils import mjcf_utils
+from typing_extensions import Self
+
+from mojo.elements.consts import ActuatorType
+from mojo.elements.element import MujocoElement
+from mojo.elements.joint import Joint
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+
+class Actuator(MujocoElement):
+    __slots__ = ()
+
+    @staticmethod
+    def get(
+        mojo: Mojo,
+        name: str,
+        parent: MujocoElement = None,
+    ) -> Self:
+        root_mjcf = mojo.root_element.mjcf if parent is None else parent.mjcf
+        mjcf = mjcf_utils.safe_find(root_mjcf, "actuator", name)
+        return Actuator(mojo, mjcf)
+
+    @staticmethod
+    def create(
+        mojo: Mojo,
+        joint: Joint,
+        actuator_type: ActuatorType = ActuatorType.MOTOR,
+        name: str = None,
+        ctrl_range: np.ndarray = None,
+        gear: float = 1.0,
+        kp: float = 1.0,
+        kv: float = 1.0,
+    ) -> Self:
+        """Create an actuator driving a joint.
+
+        :param mojo: The Mojo instance.
+        :param joint: The joint to actuate.
+        :param actuator_type: Motor, position or velocity actuator.
+        :param name: Optional name of the actuator.
+        :param ctrl_range: Range the control is clamped to. Unlimited if None.
+        :param gear: Scale from control to joint force.
+        :param kp: Position gain of position actuators.
+        :param kv: Velocity gain of velocity actuators.
+        :return: The new actuator.
+        """
+        mojo.prepare_edit()
+        kwargs = {"joint": joint.mjcf, "gear": [gear, 0, 0, 0, 0, 0]}
+        if name is not None:
+            kwargs["name"] = name
+        if ctrl_range is not None:
+            kwargs["ctrllimited"] = "true"
+            kwargs["ctrlrange"] = ctrl_range
+        if actuator_type == ActuatorType.POSITION:
+            kwargs["kp"] = kp
+        elif actuator_type == ActuatorType.VELOCITY:
+            kwargs["kv"] = kv
+        new_actuator = mojo.root_element.mjcf.actuator.add(
+            actuator_type.value, **kwargs
+        )
+        mojo.mark_dirty()
+        return Actuator(mojo, new_actuator)
+
+    def get_actuator_type(self) -> ActuatorType:
+        return ActuatorType(self.mjcf.tag)
+
+    def get_joint(self) -> Joint:
+        return Joint(self._mojo, self.mjcf.joint)
+
+    def get_ctrl_range(self) -> Optional[np.ndarray]:
+        """Get the control range, or None if the control is unlimited."""
+        binded = self._mojo.physics.bind(self.mjcf)
+        if not binded.ctrllimited:
+            return None
+        return binded.ctrlrange.copy()
+
+    def get_control(self) -> float:
+        return float(self._mojo.physics.bind(self.mjcf).ctrl.item())
+
+    def set_control(self, value: float):
+        ctrl_range = self.get_ctrl_range()
+        if ctrl_range is not None:
+            value = np.clip(value, *ctrl_range)
+        self._mojo.physics.bind(self.mjcf).ctrl = value
+
+
+class ActuatorGroup:
+    """Writes whole action vectors into `ctrl` with one indexed assignment.
+
+    Actuator indices and control limits are resolved once per model generation,
+    so setting controls costs one vectorized clip and one write.
+    """
+
+    def __init__(self, mojo: Mojo, actuators: list[Actuator]):
+        self._mojo = mojo
+        self._actuators = list(actuators)
+        self._generation = -1
+        self._indices: Union[np.ndarray, slice, None] = None
+        self._lower: Optional[np.ndarray] = None
+        self._upper: Optional[np.ndarray] = None
+        self._buffer: Optional[np.ndarray] = None
+
+    @property
+    def actuators(self) -> list[Actuator]:
+        return list(self._actuators)
+
+    def __len__(self) -> int:
+        return len(self._actuators)
+
+    def _update_indices(self):
+        physics = self._mojo.physics
+        if self._generation == self._mojo.generation:
+            return
+        model = self._mojo.model
+        ids = np.zeros(0, dtype=np.int64)
+        if self._actuators:
+            mjcf = [a.mjcf for a in self._actuators]
+            ids = np.atleast_1d(physics.bind(mjcf).element_id).astype(np.int64)
+        limited = model.actuator_ctrllimited[ids].astype(bool)
+        ranges = model.actuator_ctrlrange[ids]
+        self._lower = np.where(limited, ranges[:, 0], -np.inf)
+        self._upper = np.where(limited, ranges[:, 1], np.inf)
+        self._buffer = np.zeros(len(ids))
+        # Contiguous actuators are written through a slice, which avoids a gather
+        if len(ids) > 0 and np.array_equal(ids, np.arange(ids[0], ids[0] + len(ids))):
+            self._indices = slice(int(ids[0]), int(ids[0]) + len(ids))
+        else:
+            self._indices = ids
+        self._generation = self._mojo.generation
+
+    @property
+    def ctrl_range(self) -> np.ndarray:
+        """Lower and upper control limits, infinite for unlimited actuators."""
+        self._update_indices()
+        return np.stack([self._lower, self._upper], axis=-1)
+
+    def set_controls(self, action: np.ndarray, clip: bool = True):
+        """Write an action vector to the controls of all actuators.
+
+        :param action: One control per actuator, in group order.
+        :param clip: If true, the action is clamped to the control ranges.
+        """
+        self._update_indices()
+        if clip:
+            action = np.clip(action, self._lower, self._upper, out=self._buffer)
+        self._mojo.data.ctrl[self._indices] = action
+
+    def get_controls(self, out: np.ndarray = None) -> np.ndarray:
+        """Gather the current controls of all actuators.
+
+        :param out: Optional array to write into.
+        :return: The controls, in group order.
+        """
+        self._update_indices()
+        controls = self._mojo.data.ctrl[self._indices]
+        if out is None:
+            return np.array(controls)
+        out[:] = controls
+        return out
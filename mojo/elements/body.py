@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import warnings
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Sequence, Union
 
+import mujoco
 import numpy as np
 import quaternion
 from mujoco_utils import mjcf_utils
@@ -17,6 +18,8 @@ if TYPE_CHECKING:
 
 
 class Body(MujocoElement):
+    __slots__ = ()
+
     @staticmethod
     def get(
         mojo: Mojo,
@@ -36,6 +39,7 @@ class Body(MujocoElement):
     ) -> Self:
         position = np.array([0, 0, 0]) if position is None else position
         quaternion = np.array([1, 0, 0, 0]) if quaternion is None else quaternion
+        mojo.prepare_edit()
         parent_mjcf = (
             mojo.root_element.mjcf.worldbody if parent is None else parent.mjcf
         )
@@ -49,15 +53,66 @@ class Body(MujocoElement):
 
     @property
     def geoms(self) -> list[geom.Geom]:
-        # Loop through all children
-        geoms = self.mjcf.find_all("geom") or []
-        return [geom.Geom(self._mojo, mjcf) for mjcf in geoms]
+        return self._find_children("geom", geom.Geom)
 
     @property
     def joints(self) -> list[joint.Joint]:
-        # Loop through all children
-        joints = self.mjcf.find_all("joint") or []
-        return [joint.Joint(self._mojo, mjcf) for mjcf in joints]
+        return self._find_children("joint", joint.Joint)
+
+    def set_position(self, position: np.ndarray):
+        if self.is_mocap():
+            position = np.array(position)  # ensure is numpy array
+            self._mojo.physics.bind(self.mjcf).mocap_pos = position
+            self._mojo.mirror_to_mjcf(self.mjcf, pos=position)
+            return
+        super().set_position(position)
+
+    def get_position(self) -> np.ndarray:
+        if self.is_mocap():
+            return self._mojo.physics.bind(self.mjcf).mocap_pos.copy()
+        return super().get_position()
+
+    def set_quaternion(self, quaternion: np.ndarray):
+        if self.is_mocap():
+            quaternion = np.array(quaternion)  # ensure is numpy array
+            self._mojo.physics.bind(self.mjcf).mocap_quat = quaternion
+            self._mojo.mirror_to_mjcf(self.mjcf, quat=quaternion)
+            return
+        super().set_quaternion(quaternion)
+
+    def get_quaternion(self) -> np.ndarray:
+        if self.is_mocap():
+            return self._mojo.physics.bind(self.mjcf).mocap_quat.copy()
+        return super().get_quaternion()
+
+    @property
+    def id(self):
+        if self.is_mocap():
+            # Mocap bodies are bound in their own namespace, which has no element ids
+            return mujoco.mj_name2id(
+                self._mojo.model, mujoco.mjtObj.mjOBJ_BODY, self.mjcf.full_identifier
+            )
+        return super().id
+
+    def set_mocap(self, value: bool):
+        """Make the pose of the body a direct input of the simulation. Recompiles.
+
+        Poses of mocap bodies are written straight to `data.mocap_pos` and
+        `data.mocap_quat` and are applied on the next step. Only bodies without
+        joints whose parent is the world body can be mocap bodies.
+        """
+        if value == self.is_mocap():
+            return
+        if value and self.mjcf.parent.tag != "worldbody":
+            raise ValueError("Only children of the world body can be mocap bodies.")
+        if value and self.is_kinematic():
+            raise ValueError("Mocap bodies cannot have joints.")
+        self._mojo.prepare_edit()
+        self.mjcf.mocap = value
+        self._mojo.mark_dirty()
+
+    def is_mocap(self) -> bool:
+        return bool(self.mjcf.mocap)
 
     def set_euler(self, euler: np.ndarray):
         self.set_quaternion(
@@ -78,8 +133,20 @@ class Body(MujocoElement):
         for g in self.geoms:
             g.set_collidable(value)
 
+    def set_collision_layer(self, layer: str):
+        self._mojo.collision_layers.set_layer(self, layer)
+
+    def exclude_collision(self, other: Body):
+        """Exclude all contacts between this body and another. Recompiles."""
+        self._mojo.prepare_edit()
+        self._mojo.root_element.mjcf.contact.add(
+            "exclude", body1=self.mjcf, body2=other.mjcf
+        )
+        self._mojo.mark_dirty()
+
     def is_collidable(self) -> bool:
-        return len(self.geoms) > 0 and self.geoms[0].is_collidable()
+        geoms = self.geoms
+        return len(geoms) > 0 and geoms[0].is_collidable()
 
     def has_collided(self, other: Body = None, warn: bool = True):
         if (
@@ -91,17 +158,90 @@ class Body(MujocoElement):
         # If None, return true if there is any contact
         if other is None:
             return len(self._mojo.physics.data.contact) > 0
-        this_object_id = self._mojo.physics.bind(self.mjcf).element_id
-        other_object_id = self._mojo.physics.bind(other.mjcf).element_id
+        this_object_id = self.id
+        other_object_id = other.id
         return has_collision(self._mojo.physics, other_object_id, this_object_id)
 
     def remove(self):
+        self._mojo.prepare_edit()
         self.mjcf.remove()
+        self._mojo.mark_dirty()
 
     def set_kinematic(self, value: bool):
+        if value and self.is_mocap():
+            raise ValueError("Mocap bodies cannot have joints.")
         if value and not self.is_kinematic():
+            self._mojo.prepare_edit()
             self.mjcf.add("freejoint")
             self._mojo.mark_dirty()
         elif not value and self.is_kinematic():
             self.remove_all_joints()
             self._mojo.mark_dirty()
+
+
+class MocapGroup:
+    """Writes the poses of many mocap bodies with one indexed assignment.
+
+    Mocap indices are resolved once per model generation.
+    """
+
+    def __init__(self, mojo: Mojo, bodies: Sequence[Body]):
+        self._mojo = mojo
+        self._bodies = list(bodies)
+        self._generation = -1
+        self._indices: Union[np.ndarray, slice, None] = None
+
+    @property
+    def bodies(self) -> list[Body]:
+        return list(self._bodies)
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def _update_indices(self):
+        model = self._mojo.model
+        if self._generation == self._mojo.generation:
+            return
+        ids = [b.id for b in self._bodies]
+        mocap_ids = model.body_mocapid[np.array(ids, dtype=np.int64)]
+        if np.any(mocap_ids < 0):
+            raise ValueError("All bodies of a mocap group must be mocap bodies.")
+        start = int(mocap_ids[0]) if len(mocap_ids) > 0 else 0
+        if np.array_equal(mocap_ids, np.arange(start, start + len(mocap_ids))):
+            self._indices = slice(start, start + len(mocap_ids))
+        else:
+            self._indices = mocap_ids
+        self._generation = self._mojo.generation
+
+    def set_poses(
+        self,
+        positions: Optional[np.ndarray] = None,
+        quaternions: Optional[np.ndarray] = None,
+    ):
+        """Write the poses of all bodies, applied on the next step.
+
+        :param positions: Positions of shape (N, 3), in group order.
+        :param quaternions: Quaternions (wxyz) of shape (N, 4), in group order.
+        """
+        self._update_indices()
+        data = self._mojo.data
+        if positions is not None:
+            data.mocap_pos[self._indices] = positions
+        if quaternions is not None:
+            data.mocap_quat[self._indices] = quaternions
+
+    def get_positions(self, out: np.ndarray = None) -> np.ndarray:
+        self._update_indices()
+        positions = self._mojo.data.mocap_pos[self._indices]
+        if out is None:
+            return np.array(positions)
+        out[:] = positions
+        return out
+
+    def get_quaternions(self, out: np.ndarray = None) -> np.ndarray:
+        self._update_indices()
+        quaternions = self._mojo.data.mocap_quat[self._indices]
+        if out is None:
+            return np.array(quaternions)
+        out[:] = quaternions
+        return out
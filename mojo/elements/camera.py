@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
 
 import numpy as np
 from mujoco_utils import mjcf_utils
@@ -11,9 +11,12 @@ from mojo.elements.element import MujocoElement
 
 if TYPE_CHECKING:
     from mojo import Mojo
+    from mojo.raycast import RaycastResult
 
 
 class Camera(MujocoElement):
+    __slots__ = ()
+
     @staticmethod
     def get(
         mojo: Mojo,
@@ -38,6 +41,7 @@ class Camera(MujocoElement):
         quaternion = np.array([1, 0, 0, 0]) if quaternion is None else quaternion
         if parent is not None and not isinstance(parent, Body):
             raise ValueError("Parent must be of type body for camera.")
+        mojo.prepare_edit()
         parent_mjcf = (
             mojo.root_element.mjcf.worldbody if parent is None else parent.mjcf
         )
@@ -55,6 +59,7 @@ class Camera(MujocoElement):
         return Camera(mojo, new_camera)
 
     def set_focal(self, focal: np.ndarray):
+        self._mojo.prepare_edit()
         if self.mjcf.sensorsize is None:
             self.mjcf.sensorsize = np.array([0, 0])
         if self.mjcf.resolution is None:
@@ -66,6 +71,7 @@ class Camera(MujocoElement):
         return self.mjcf.focal
 
     def set_sensor_size(self, sensor_size: np.ndarray):
+        self._mojo.prepare_edit()
         # Either focal or focalpixel must be set
         if self.mjcf.focal is None or self.mjcf.focalpixel is None:
             self.mjcf.focal = np.array([0, 0])
@@ -79,6 +85,7 @@ class Camera(MujocoElement):
         return self.mjcf.sensorsize
 
     def set_focal_pixel(self, focal_pixel: np.ndarray):
+        self._mojo.prepare_edit()
         if self.mjcf.sensorsize is None:
             self.mjcf.sensorsize = np.array([0, 0])
         if self.mjcf.resolution is None:
@@ -90,8 +97,34 @@ class Camera(MujocoElement):
         return self.mjcf.focalpixel
 
     def set_fovy(self, fovy: float):
+        self._mojo.prepare_edit()
         self.mjcf.fovy = fovy
         self._mojo.mark_dirty()
 
     def get_fovy(self) -> np.ndarray:
         return self.mjcf.fovy
+
+    def cast_rays(
+        self,
+        directions: np.ndarray,
+        max_dist: float = np.inf,
+        geomgroup: Sequence[bool] = None,
+        exclude_body: Body = None,
+    ) -> RaycastResult:
+        """Cast rays from the camera frame.
+
+        For repeated casts of the same pattern use a `RayCaster`, which reuses
+        its buffers.
+
+        :param directions: Ray directions of shape (N, 3) in the camera frame.
+        The camera looks along its -z axis.
+        :param max_dist: Hits further than this are treated as misses.
+        :param geomgroup: Six flags selecting the geom groups rays can hit.
+        :param exclude_body: Optional body whose geoms are ignored.
+        :return: Hit distances and geom ids, -1 for misses.
+        """
+        from mojo.raycast import RayCaster
+
+        caster = RayCaster(self._mojo, directions, max_dist, geomgroup, exclude_body)
+        binded = self._mojo.physics.bind(self.mjcf)
+        return caster.cast(binded.xpos, binded.xmat)
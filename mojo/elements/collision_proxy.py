@@ -0,0 +1,130 @@
+import os
+from pathlib import Path
+
+import numpy as np
+from scipy.spatial import ConvexHull
+
+from mojo.elements.consts import CollisionProxy
+from mojo.elements.utils import file_digest, get_cache_dir
+
+_CACHE_NAME = "collision_proxies"
+_HULL_KEY = "hull"
+_POSITION_KEY = "pos"
+_SIZE_KEY = "size"
+_STL_HEADER_SIZE = 80
+_STL_TRIANGLE = np.dtype(
+    [
+        ("normal", "<f4", (3,)),
+        ("vertices", "<f4", (3, 3)),
+        ("attribute", "<u2"),
+    ]
+)
+
+
+def _read_obj(path: str) -> tuple[np.ndarray, np.ndarray]:
+    vertices, faces = [], []
+    with open(path) as f:
+        for line in f:
+            if line.startswith("v "):
+                vertices.append([float(v) for v in line.split()[1:4]])
+            elif line.startswith("f "):
+                face = [int(v.split("/")[0]) for v in line.split()[1:]]
+                # Negative indices are relative to the end of the vertex list
+                face = [i - 1 if i > 0 else len(vertices) + i for i in face]
+                # Triangulate polygons as a fan
+                faces.extend(
+                    [face[0], face[i], face[i + 1]] for i in range(1, len(face) - 1)
+                )
+    return np.array(vertices, dtype=np.float64), np.array(faces, dtype=np.int32)
+
+
+def _read_stl(path: str) -> tuple[np.ndarray, np.ndarray]:
+    with open(path, "rb") as f:
+        contents = f.read()
+    num_triangles = int(np.frombuffer(contents, "<u4", 1, _STL_HEADER_SIZE)[0])
+    binary_size = _STL_HEADER_SIZE + 4 + num_triangles * _STL_TRIANGLE.itemsize
+    if len(contents) == binary_size:
+        triangles = np.frombuffer(contents, _STL_TRIANGLE, num_triangles, 84)
+        vertices = triangles["vertices"].reshape(-1, 3).astype(np.float64)
+    else:
+        vertices = np.array(
+            [
+                [float(v) for v in line.split()[1:4]]
+                for line in contents.decode().splitlines()
+                if line.strip().startswith("vertex")
+            ]
+        )
+    faces = np.arange(len(vertices), dtype=np.int32).reshape(-1, 3)
+    return vertices, faces
+
+
+def read_mesh(path: str) -> tuple[np.ndarray, np.ndarray]:
+    """Read vertices and triangle faces of an OBJ or STL mesh."""
+    extension = Path(path).suffix.lower()
+    if extension == ".obj":
+        return _read_obj(path)
+    if extension == ".stl":
+        return _read_stl(path)
+    raise ValueError(f"Unsupported mesh format for collision proxies: {extension}")
+
+
+def _convex_decomposition(vertices: np.ndarray, faces: np.ndarray) -> list[np.ndarray]:
+    try:
+        import coacd
+    except ImportError as e:
+        raise ImportError(
+            "Convex decomposition requires the 'coacd' package. "
+            "Install it with 'pip install coacd'."
+        ) from e
+    parts = coacd.run_coacd(coacd.Mesh(vertices, faces))
+    return [np.asarray(part_vertices) for part_vertices, _ in parts]
+
+
+def _compute_proxy(path: str, proxy: CollisionProxy) -> dict[str, np.ndarray]:
+    vertices, faces = read_mesh(path)
+    lower, upper = vertices.min(0), vertices.max(0)
+    center = (lower + upper) / 2
+    if proxy == CollisionProxy.CONVEX_HULL:
+        return {f"{_HULL_KEY}_0": vertices[ConvexHull(vertices).vertices]}
+    if proxy == CollisionProxy.CONVEX_DECOMPOSITION:
+        return {
+            f"{_HULL_KEY}_{i}": part[ConvexHull(part).vertices]
+            for i, part in enumerate(_convex_decomposition(vertices, faces))
+        }
+    if proxy == CollisionProxy.BOX:
+        return {_POSITION_KEY: center, _SIZE_KEY: (upper - lower) / 2}
+    if proxy == CollisionProxy.SPHERE:
+        radius = np.linalg.norm(vertices - center, axis=1).max()
+        return {_POSITION_KEY: center, _SIZE_KEY: np.array([radius])}
+    raise ValueError(f"Unknown collision proxy: {proxy}")
+
+
+def get_collision_proxy(path: str, proxy: CollisionProxy) -> dict[str, np.ndarray]:
+    """Compute a collision proxy of a mesh, cached on disk by mesh content.
+
+    :param path: Path to the mesh file.
+    :param proxy: The type of proxy to compute.
+    :return: Either 'hull_<i>' vertex arrays in mesh coordinates, or the 'pos' and
+    'size' of a primitive fitted to the mesh.
+    """
+    cache_path = get_cache_dir(_CACHE_NAME) / f"{file_digest(path)}_{proxy.value}.npz"
+    if cache_path.exists():
+        with np.load(cache_path) as cached:
+            return dict(cached)
+    result = _compute_proxy(path, proxy)
+    # Write then rename, so concurrent readers never see a partial file.
+    temp_path = cache_path.with_suffix(f".{os.getpid()}.npz")
+    np.savez(temp_path, **result)
+    os.replace(temp_path, cache_path)
+    return result
+
+
+def get_proxy_hulls(proxy_data: dict[str, np.ndarray]) -> list[np.ndarray]:
+    hulls = [k for k in proxy_data if k.startswith(_HULL_KEY)]
+    return [proxy_data[k] for k in sorted(hulls, key=lambda k: int(k.split("_")[1]))]
+
+
+def get_proxy_primitive(
+    proxy_data: dict[str, np.ndarray]
+) -> tuple[np.ndarray, np.ndarray]:
+    return proxy_data[_POSITION_KEY], proxy_data[_SIZE_KEY]
@@ -21,6 +21,13 @@ class SiteType(Enum):
     BOX = "box"
 
 
+class CollisionProxy(Enum):
+    CONVEX_HULL = "convex_hull"
+    CONVEX_DECOMPOSITION = "convex_decomposition"
+    BOX = "box"
+    SPHERE = "sphere"
+
+
 class TextureMapping(Enum):
     PLANAR = "2d"
     CUBE = "cube"
@@ -37,3 +44,36 @@ class JointType(Enum):
     BALL = "ball"
     SLIDE = "slide"
     HINGE = "hinge"
+
+
+class SensorType(Enum):
+    TOUCH = "touch"
+    ACCELEROMETER = "accelerometer"
+    VELOCIMETER = "velocimeter"
+    GYRO = "gyro"
+    FORCE = "force"
+    TORQUE = "torque"
+    MAGNETOMETER = "magnetometer"
+    RANGEFINDER = "rangefinder"
+    JOINT_POSITION = "jointpos"
+    JOINT_VELOCITY = "jointvel"
+    FRAME_POSITION = "framepos"
+    FRAME_QUATERNION = "framequat"
+    FRAME_LINEAR_VELOCITY = "framelinvel"
+    FRAME_ANGULAR_VELOCITY = "frameangvel"
+    FRAME_LINEAR_ACCELERATION = "framelinacc"
+    FRAME_ANGULAR_ACCELERATION = "frameangacc"
+    SUBTREE_COM = "subtreecom"
+    SUBTREE_LINEAR_VELOCITY = "subtreelinvel"
+    SUBTREE_ANGULAR_MOMENTUM = "subtreeangmom"
+
+
+class ActuatorType(Enum):
+    MOTOR = "motor"
+    POSITION = "position"
+    VELOCITY = "velocity"
+
+
+class EqualityType(Enum):
+    WELD = "weld"
+    CONNECT = "connect"
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from abc import ABC
-from typing import TYPE_CHECKING
+import weakref
+from abc import ABC, ABCMeta
+from typing import TYPE_CHECKING, Callable, Optional
 
 import mujoco
 import numpy as np
@@ -37,64 +38,58 @@ def _find_freejoint(elem: mjcf.Element):
     return _find_freejoint(elem.parent)
 
 
-class MujocoElement(ABC):
-    def __init__(self, mojo: Mojo, mjcf_elem: mjcf.Element):
-        self._mojo = mojo
-        self._mjcf_elem = mjcf_elem
+class _InternedElementMeta(ABCMeta):
+    """Returns the existing handle of an MJCF element if there is one."""
 
-    @property
-    def mjcf(self):
-        return self._mjcf_elem
+    # Handles keep their Mojo instance and MJCF element alive, so the ids in a
+    # key cannot be reused while its handle exists
+    _handles: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
 
-    def set_position(self, position: np.ndarray, reset_dynamics: bool = True):
-        position = np.array(position)  # ensure is numpy array
-        if freejoint := _find_freejoint(self.mjcf):
-            freejoint = self._mojo.physics.bind(freejoint)
-            freejoint.qpos[:3] = position
-            if reset_dynamics:
-                freejoint.qvel *= 0
-                freejoint.qacc *= 0
-        else:
-            self._mojo.physics.bind(self.mjcf).pos = position
-        self.mjcf.pos = position
+    def __call__(cls, mojo: Mojo, mjcf_elem: mjcf.Element):
+        key = (cls, id(mojo), id(mjcf_elem))
+        element = cls._handles.get(key)
+        if element is None:
+            element = super().__call__(mojo, mjcf_elem)
+            cls._handles[key] = element
+        return element
 
-    def get_position(self) -> np.ndarray:
-        # if the element has a free joint (and thus is a body), then access qpos
-        if freejoint := _find_freejoint(self.mjcf):
-            return self._mojo.physics.bind(freejoint).qpos[:3].copy()
-        return self._mojo.physics.bind(self.mjcf).xpos.copy()
 
-    def set_quaternion(self, quaternion: np.ndarray, reset_dynamics: bool = True):
-        # wxyz
-        quaternion = np.array(quaternion)  # ensure is numpy array
-        if freejoint := _find_freejoint(self.mjcf):
-            freejoint = self._mojo.physics.bind(freejoint)
-            freejoint.qpos[3:] = quaternion
-            if reset_dynamics:
-                freejoint.qvel *= 0
-                freejoint.qacc *= 0
-        binded = self._mojo.physics.bind(self.mjcf)
-        if binded.quat is not None:
-            binded.quat = quaternion
-        mat = np.zeros(9)
-        mujoco.mju_quat2Mat(mat, quaternion)
-        binded.xmat = mat
-        self.mjcf.quat = quaternion
+def rebind_handles(
+    mojo: Mojo, resolve: Callable[[mjcf.Element], Optional[mjcf.Element]]
+) -> None:
+    """Move the handles of a Mojo instance to the elements of a copied MJCF."""
+    handles = _InternedElementMeta._handles
+    for key, element in list(handles.items()):
+        if key[1] != id(mojo):
+            continue
+        mjcf_elem = resolve(element._mjcf_elem)
+        if mjcf_elem is None:
+            continue
+        del handles[key]
+        element._mjcf_elem = mjcf_elem
+        element._children = None
+        handles[(key[0], key[1], id(mjcf_elem))] = element
 
-    def get_quaternion(self) -> np.ndarray:
-        quat = np.zeros(4)
-        mujoco.mju_mat2Quat(quat, self._mojo.physics.bind(self.mjcf).xmat)
-        return quat
 
-    def is_kinematic(self) -> bool:
-        return _is_kinematic(self.mjcf)
+class MujocoElement(ABC, metaclass=_InternedElementMeta):
+    """Handle of an MJCF element.
 
-    def remove_all_joints(self):
-        _remove_all_joints(self.mjcf)
+    Handles are interned per Mojo instance, so looking up the same element twice
+    returns the same object while it is referenced. Handles compare by their
+    Mojo instance and MJCF element, and hash by a key of the element that is
+    kept when a clone copies its MJCF.
+    """
+
+    __slots__ = ("_mojo", "_mjcf_elem", "_children", "__weakref__")
+
+    def __init__(self, mojo: Mojo, mjcf_elem: mjcf.Element):
+        self._mojo = mojo
+        self._mjcf_elem = mjcf_elem
+        self._children: Optional[dict[str, tuple[int, list]]] = None
 
     @property
-    def id(self):
-        return self._mojo.physics.bind(self.mjcf).element_id
+    def mjcf(self):
+        return self._mjcf_elem
 
     def set_position(self, position: np.ndarray):
         position = np.array(position)  # ensure is numpy array
@@ -102,7 +97,7 @@ class MujocoElement(ABC):
             self._mojo.physics.bind(freejoint).qpos[:3] = position
         else:
             self._mojo.physics.bind(self.mjcf).pos = position
-        self.mjcf.pos = position
+        self._mojo.mirror_to_mjcf(self.mjcf, pos=position)
 
     def get_position(self) -> np.ndarray:
         # if the element has a free joint (and thus is a body), then access qpos
@@ -116,10 +111,13 @@ class MujocoElement(ABC):
         if freejoint := _find_freejoint(self.mjcf):
             self._mojo.physics.bind(freejoint).qpos[3:] = quaternion
         else:
+            binded = self._mojo.physics.bind(self.mjcf)
+            # Write the local frame too, so that it survives kinematic updates
+            binded.quat = quaternion
             mat = np.zeros(9)
             mujoco.mju_quat2Mat(mat, quaternion)
-            self._mojo.physics.bind(self.mjcf).xmat = mat
-        self.mjcf.quat = quaternion
+            binded.xmat = mat
+        self._mojo.mirror_to_mjcf(self.mjcf, quat=quaternion)
 
     def get_quaternion(self) -> np.ndarray:
         quat = np.zeros(4)
@@ -129,12 +127,34 @@ class MujocoElement(ABC):
     def is_kinematic(self) -> bool:
         return _is_kinematic(self.mjcf)
 
+    def remove_all_joints(self):
+        self._mojo.prepare_edit()
+        _remove_all_joints(self.mjcf)
+
     @property
     def id(self):
         return self._mojo.physics.bind(self.mjcf).element_id
 
+    def _find_children(
+        self, tag: str, factory: Callable[[Mojo, mjcf.Element], MujocoElement]
+    ) -> list:
+        """Find all descendants with a tag, cached until the scene is edited."""
+        version = self._mojo.structure_version
+        if self._children is None:
+            self._children = {}
+        cached = self._children.get(tag)
+        if cached is None or cached[0] != version:
+            children = self.mjcf.find_all(tag) or []
+            cached = (version, [factory(self._mojo, mjcf) for mjcf in children])
+            self._children[tag] = cached
+        return list(cached[1])
+
     def __eq__(self, other):
         return (
             isinstance(other, MujocoElement)
-            and self.mjcf.full_identifier == other.mjcf.full_identifier
+            and self._mojo is other._mojo
+            and self._mjcf_elem is other._mjcf_elem
         )
+
+    def __hash__(self):
+        return hash((id(self._mojo), self._mojo.element_key(self._mjcf_elem)))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import mujoco
+import numpy as np
+from mujoco_utils import mjcf_utils
+from typing_extensions import Self
+
+from mojo.elements import body
+from mojo.elements.consts import EqualityType
+from mojo.elements.element import MujocoElement
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+
+def _inverse_rotate(quaternion: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    inverse, result = np.zeros(4), np.zeros(3)
+    mujoco.mju_negQuat(inverse, quaternion)
+    mujoco.mju_rotVecQuat(result, vector, inverse)
+    return result
+
+
+class Equality(MujocoElement):
+    """Weld or connect constraint between two bodies, toggled at runtime.
+
+    Declare constraints between all candidate body pairs while building the
+    scene, then attach and detach bodies through `data.eq_active` without
+    recompiling.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def get(mojo: Mojo, name: str) -> Self:
+        mjcf = mjcf_utils.safe_find(mojo.root_element.mjcf, "equality", name)
+        return Equality(mojo, mjcf)
+
+    @staticmethod
+    def create(
+        mojo: Mojo,
+        body1: body.Body,
+        body2: Optional[body.Body] = None,
+        equality_type: EqualityType = EqualityType.WELD,
+        anchor: np.ndarray = None,
+        active: bool = False,
+        name: str = None,
+    ) -> Self:
+        """Declare a constraint between two bodies.
+
+        :param mojo: The Mojo instance.
+        :param body1: The first body.
+        :param body2: The second body. Defaults to the world.
+        :param equality_type: Weld the bodies together, or connect them with a
+        ball joint at the anchor.
+        :param anchor: For welds, the point on body2 that is held in place, for
+        connects, the point on body1 the bodies are connected at.
+        :param active: Whether the constraint is active initially.
+        :param name: Name of the constraint.
+        """
+        anchor = np.array([0, 0, 0]) if anchor is None else anchor
+        mojo.prepare_edit()
+        kwargs = {}
+        if body2 is not None:
+            kwargs["body2"] = body2.mjcf
+        new_equality = mojo.root_element.mjcf.equality.add(
+            equality_type.value,
+            name=name,
+            body1=body1.mjcf,
+            anchor=anchor,
+            active=active,
+            **kwargs,
+        )
+        mojo.mark_dirty()
+        return Equality(mojo, new_equality)
+
+    def get_equality_type(self) -> EqualityType:
+        return EqualityType(self.mjcf.tag)
+
+    def is_active(self) -> bool:
+        return bool(self._mojo.data.eq_active[self.id])
+
+    def activate(self, keep_pose: bool = True):
+        """Attach the bodies.
+
+        :param keep_pose: If true, the bodies are held at their current relative
+        pose. Poses are taken from the last step, so call `forward_kinematics`
+        on the Mojo instance first after teleporting bodies. Otherwise the
+        relative pose of the compiled model is used.
+        """
+        equality_id = self.id
+        if keep_pose:
+            self._hold_current_pose(equality_id)
+        self._mojo.data.eq_active[equality_id] = True
+        self._mojo.mirror_to_mjcf(self.mjcf, active=True)
+
+    def deactivate(self):
+        """Detach the bodies."""
+        self._mojo.data.eq_active[self.id] = False
+        self._mojo.mirror_to_mjcf(self.mjcf, active=False)
+
+    def _hold_current_pose(self, equality_id: int):
+        model, data = self._mojo.model, self._mojo.data
+        eq_data = model.eq_data[equality_id]
+        body1_id, body2_id = model.eq_obj1id[equality_id], model.eq_obj2id[equality_id]
+        position1, quaternion1 = data.xpos[body1_id], data.xquat[body1_id]
+        position2, quaternion2 = data.xpos[body2_id], data.xquat[body2_id]
+        if self.get_equality_type() == EqualityType.WELD:
+            # Anchor on body2 and orientation of body2, both in the frame of body1
+            anchor = np.zeros(3)
+            mujoco.mju_rotVecQuat(anchor, eq_data[:3], quaternion2)
+            eq_data[3:6] = _inverse_rotate(quaternion1, position2 + anchor - position1)
+            inverse1 = np.zeros(4)
+            mujoco.mju_negQuat(inverse1, quaternion1)
+            mujoco.mju_mulQuat(eq_data[6:10], inverse1, quaternion2)
+            self._mojo.mirror_to_mjcf(self.mjcf, relpose=eq_data[3:10].copy())
+        else:
+            # Anchor on body1 expressed in the frame of body2
+            anchor = np.zeros(3)
+            mujoco.mju_rotVecQuat(anchor, eq_data[:3], quaternion1)
+            eq_data[3:6] = _inverse_rotate(quaternion2, position1 + anchor - position2)
+            self._mojo.store_connect_anchor(self.mjcf, eq_data[3:6])
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import uuid
 import warnings
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
+import mujoco
 import numpy as np
 from mujoco_utils import mjcf_utils
 from typing_extensions import Self
 
 from mojo.elements import body
-from mojo.elements.consts import GeomType, TextureMapping
+from mojo.elements.collision_proxy import (
+    get_collision_proxy,
+    get_proxy_hulls,
+    get_proxy_primitive,
+)
+from mojo.elements.consts import CollisionProxy, GeomType, TextureMapping
 from mojo.elements.element import MujocoElement
 from mojo.elements.utils import has_collision, load_mesh, load_texture
 
@@ -16,8 +23,13 @@ if TYPE_CHECKING:
     from mojo import Mojo
     from mojo.elements.body import Body
 
+# Geoms in group 3 are hidden by default in the viewer.
+_COLLISION_PROXY_GROUP = 3
+
 
 class Geom(MujocoElement):
+    __slots__ = ()
+
     @staticmethod
     def get(
         mojo: Mojo,
@@ -47,6 +59,7 @@ class Geom(MujocoElement):
         quaternion = np.array([1, 0, 0, 0]) if quaternion is None else quaternion
         size = np.array([0.1, 0.1, 0.1]) if size is None else size
         color = np.array([1, 1, 1, 1]) if color is None else color
+        mojo.prepare_edit()
         parent = body.Body.create(mojo) if parent is None else parent
         if (
             mesh_path
@@ -91,7 +104,7 @@ class Geom(MujocoElement):
         if len(color) == 3:
             color = np.concatenate([color, [1]])  # add alpha
         self._mojo.physics.bind(self.mjcf).rgba = color
-        self.mjcf.rgba = color
+        self._mojo.mirror_to_mjcf(self.mjcf, rgba=color)
 
     def get_color(self) -> np.ndarray:
         return np.array(self._mojo.physics.bind(self.mjcf).rgba)
@@ -108,6 +121,7 @@ class Geom(MujocoElement):
         reflectance: float = 0.0,
         color: np.ndarray = None,
     ):
+        self._mojo.prepare_edit()
         # First check if we have loaded this texture
         key_name = (
             f"{texture_path}_{mapping.value}_{tex_uniform}_{tex_repeat}_"
@@ -115,6 +129,7 @@ class Geom(MujocoElement):
         )
         material = self._mojo.get_material(key_name)
         if material is None:
+            max_resolution = self._mojo.get_texture_max_resolution(mapping)
             material = load_texture(
                 self._mojo.root_element.mjcf,
                 texture_path,
@@ -126,6 +141,8 @@ class Geom(MujocoElement):
                 shininess,
                 reflectance,
                 color,
+                max_resolution,
+                self._mojo.get_prefetched(texture_path, max_resolution),
             )
             self._mojo.store_material(key_name, material)
         self.mjcf.material = material
@@ -134,12 +151,32 @@ class Geom(MujocoElement):
             self.set_color(np.ones(4))
         self._mojo.mark_dirty()
 
-    def set_mesh(self, mesh_path: str, scale: np.ndarray = None):
+    def set_mesh(
+        self,
+        mesh_path: str,
+        scale: np.ndarray = None,
+        collision_proxy: CollisionProxy = None,
+        proxy_density: float = 1000,
+    ):
+        """Set the visual mesh of the geom.
+
+        :param mesh_path: Path to the mesh file.
+        :param scale: Scale of the mesh.
+        :param collision_proxy: If set, invisible collision geoms approximating the
+        mesh are added to the parent body. Proxies are cached on disk.
+        :param proxy_density: Density of the collision proxies.
+        """
         scale = np.array([1, 1, 1]) if scale is None else scale
+        self._mojo.prepare_edit()
         # First check if we have loaded this mesh
         mesh = self._mojo.get_mesh(mesh_path)
         if mesh is None:
-            mesh = load_mesh(self._mojo.root_element.mjcf, mesh_path, scale)
+            mesh = load_mesh(
+                self._mojo.root_element.mjcf,
+                mesh_path,
+                scale,
+                self._mojo.get_prefetched(mesh_path),
+            )
             self._mojo.store_mesh(mesh_path, mesh)
         self.mjcf.type = GeomType.MESH.value
         self.mjcf.mesh = mesh.name
@@ -147,19 +184,87 @@ class Geom(MujocoElement):
         self.mjcf.conaffinity = 0
         self.mjcf.group = 1
         self.mjcf.density = 0
+        # Proxies of a previous mesh no longer match the geom
+        for proxy in self._mojo.pop_collision_proxies(self.mjcf):
+            proxy.remove()
+        if collision_proxy is not None:
+            self._add_collision_proxies(
+                mesh_path, np.array(scale), collision_proxy, proxy_density
+            )
         self._mojo.mark_dirty()
 
+    def _add_collision_proxies(
+        self,
+        mesh_path: str,
+        scale: np.ndarray,
+        collision_proxy: CollisionProxy,
+        density: float,
+    ):
+        proxy_data = get_collision_proxy(mesh_path, collision_proxy)
+        position = np.zeros(3) if self.mjcf.pos is None else self.mjcf.pos
+        quaternion = (
+            np.array([1, 0, 0, 0]) if self.mjcf.quat is None else self.mjcf.quat
+        )
+        proxy_kwargs = {
+            "quat": quaternion,
+            "group": _COLLISION_PROXY_GROUP,
+            "density": density,
+            "contype": 1,
+            "conaffinity": 1,
+        }
+        proxies = []
+        if collision_proxy in (CollisionProxy.BOX, CollisionProxy.SPHERE):
+            center, size = get_proxy_primitive(proxy_data)
+            offset = np.zeros(3)
+            mujoco.mju_rotVecQuat(offset, center * scale, quaternion)
+            proxies.append(
+                self.mjcf.parent.add(
+                    "geom",
+                    type=collision_proxy.value,
+                    pos=position + offset,
+                    size=size * (scale if len(size) == 3 else scale.max()),
+                    **proxy_kwargs,
+                )
+            )
+        else:
+            for i, hull in enumerate(get_proxy_hulls(proxy_data)):
+                key = f"{mesh_path}_{collision_proxy.value}_{i}_{scale}"
+                mesh = self._mojo.get_proxy_mesh(key)
+                if mesh is None:
+                    mesh = self._mojo.root_element.mjcf.asset.add(
+                        "mesh",
+                        name=f"mesh_{uuid.uuid4()}_proxy",
+                        vertex=hull.ravel(),
+                        scale=scale,
+                    )
+                    self._mojo.store_proxy_mesh(key, mesh)
+                proxies.append(
+                    self.mjcf.parent.add(
+                        "geom",
+                        type=GeomType.MESH.value,
+                        mesh=mesh,
+                        pos=position,
+                        **proxy_kwargs,
+                    )
+                )
+        self._mojo.store_collision_proxies(self.mjcf, proxies)
+
     def set_collidable(self, value: bool):
-        self.mjcf.contype = int(value)
-        self.mjcf.conaffinity = int(value)
+        # Explicit bitmasks take the geom out of its collision layer
+        self._mojo.collision_layers.discard(self)
+        self._mojo.mirror_to_mjcf(self.mjcf, contype=int(value), conaffinity=int(value))
         self._mojo.physics.bind(self.mjcf).contype = int(value)
         self._mojo.physics.bind(self.mjcf).conaffinity = int(value)
 
     def is_collidable(self) -> bool:
-        return (
-            self._mojo.physics.bind(self.mjcf).contype == 1
-            and self._mojo.physics.bind(self.mjcf).conaffinity == 1
-        )
+        binded = self._mojo.physics.bind(self.mjcf)
+        return binded.contype != 0 or binded.conaffinity != 0
+
+    def set_collision_layer(self, layer: str):
+        self._mojo.collision_layers.set_layer(self, layer)
+
+    def get_collision_layer(self) -> Optional[str]:
+        return self._mojo.collision_layers.get_layer(self)
 
     def has_collided(self, other: Geom = None, warn: bool = True):
         if (
@@ -177,6 +282,7 @@ class Geom(MujocoElement):
 
     def set_kinematic(self, value: bool):
         if value and not self.is_kinematic():
+            self._mojo.prepare_edit()
             self.mjcf.parent.add("freejoint")
             self._mojo.mark_dirty()
         elif not value and self.is_kinematic():
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from mujoco_utils import mjcf_utils
+from typing_extensions import Self
+
+from mojo.elements import body, geom
+from mojo.elements.consts import GeomType
+from mojo.elements.element import MujocoElement
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+
+class HeightField(MujocoElement):
+    """Height field terrain whose elevation can be edited without recompiling.
+
+    Heights are given in world units above the base of the field, as arrays of
+    shape (rows, columns). Rows run along the y-axis and columns along the
+    x-axis, both starting at the negative edge of the field.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def get(mojo: Mojo, name: str) -> Self:
+        mjcf = mjcf_utils.safe_find(mojo.root_element.mjcf, "hfield", name)
+        return HeightField(mojo, mjcf)
+
+    @staticmethod
+    def create(
+        mojo: Mojo,
+        heights: np.ndarray,
+        size: np.ndarray = None,
+        max_height: float = None,
+        base: float = 0.1,
+        parent: body.Body = None,
+        position: np.ndarray = None,
+        color: np.ndarray = None,
+        name: str = None,
+    ) -> Self:
+        """Create a height field asset and the geom showing it.
+
+        :param mojo: The Mojo instance.
+        :param heights: Initial heights of shape (rows, columns).
+        :param size: Half extents of the field along x and y.
+        :param max_height: Largest height the field can represent. Defaults to
+        the largest initial height. Heights are clipped to [0, max_height].
+        :param base: Thickness of the box below the field.
+        :param parent: Body of the geom. Defaults to the world body.
+        :param position: Position of the center of the field.
+        :param color: Color of the geom.
+        :param name: Name of the height field asset.
+        """
+        heights = np.asarray(heights, dtype=np.float64)
+        if heights.ndim != 2 or min(heights.shape) < 2:
+            raise ValueError("Heights must be a 2D array with at least 2x2 values.")
+        size = np.array([1, 1]) if size is None else size
+        if max_height is None:
+            max_height = float(heights.max()) if heights.max() > 0 else 1.0
+        position = np.array([0, 0, 0]) if position is None else position
+        color = np.array([1, 1, 1, 1]) if color is None else color
+        nrow, ncol = heights.shape
+        mojo.prepare_edit()
+        hfield_mjcf = mojo.root_element.mjcf.asset.add(
+            "hfield",
+            name=name,
+            nrow=nrow,
+            ncol=ncol,
+            size=[size[0], size[1], max_height, base],
+        )
+        parent_mjcf = (
+            mojo.root_element.mjcf.worldbody if parent is None else parent.mjcf
+        )
+        parent_mjcf.add(
+            "geom",
+            type=GeomType.HFIELD.value,
+            hfield=hfield_mjcf,
+            pos=position,
+            rgba=color,
+        )
+        height_field = HeightField(mojo, hfield_mjcf)
+        mojo.store_height_field_data(hfield_mjcf, np.clip(heights, 0, max_height))
+        mojo.mark_dirty()
+        return height_field
+
+    @property
+    def geom(self) -> geom.Geom:
+        """The first geom showing this height field."""
+        for geom_mjcf in self._mojo.root_element.mjcf.find_all("geom"):
+            if geom_mjcf.hfield is self.mjcf:
+                return geom.Geom(self._mojo, geom_mjcf)
+        raise ValueError("The height field is not used by any geom.")
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        if self.mjcf.nrow is None:
+            # Fields loaded from image files take their shape from the image
+            binded = self._mojo.physics.bind(self.mjcf)
+            return int(binded.nrow), int(binded.ncol)
+        return self.mjcf.nrow, self.mjcf.ncol
+
+    @property
+    def max_height(self) -> float:
+        return float(self.mjcf.size[2])
+
+    @property
+    def cell_size(self) -> np.ndarray:
+        """Distance between neighbouring heights along x and y."""
+        nrow, ncol = self.shape
+        return 2 * np.array(self.mjcf.size[:2]) / [ncol - 1, nrow - 1]
+
+    def _heights(self) -> np.ndarray:
+        heights = self._mojo.get_height_field_data(self.mjcf)
+        if heights is None:
+            # Fields declared in XML start from their compiled heights
+            binded = self._mojo.physics.bind(self.mjcf)
+            adr, size = int(binded.adr), self.shape[0] * self.shape[1]
+            data = self._mojo.model.hfield_data[adr : adr + size]
+            heights = data.reshape(self.shape) * self.max_height
+            self._mojo.store_height_field_data(self.mjcf, heights)
+        return heights
+
+    def get_heights(self) -> np.ndarray:
+        return self._heights().copy()
+
+    def set_heights(self, heights: np.ndarray):
+        """Replace all heights in place, e.g. for the terrain of a new episode."""
+        heights = np.asarray(heights, dtype=np.float64)
+        if heights.shape != self.shape:
+            raise ValueError(f"Expected heights of shape {self.shape}.")
+        self.update_region(heights)
+
+    def update_region(self, heights: np.ndarray, row: int = 0, column: int = 0):
+        """Overwrite a rectangular tile of heights in place.
+
+        :param heights: Heights of the tile.
+        :param row: First row of the tile.
+        :param column: First column of the tile.
+        """
+        heights = np.atleast_2d(heights)
+        nrow, ncol = self.shape
+        if row < 0 or column < 0 or row + heights.shape[0] > nrow:
+            raise ValueError("The tile does not fit into the height field.")
+        if column + heights.shape[1] > ncol:
+            raise ValueError("The tile does not fit into the height field.")
+        tile = (
+            slice(row, row + heights.shape[0]),
+            slice(column, column + heights.shape[1]),
+        )
+        stored = self._heights()
+        stored[tile] = np.clip(heights, 0, self.max_height)
+        self._write(tile)
+
+    def scroll(self, rows: int, columns: int, fill: float = 0.0):
+        """Move the field by whole cells while the terrain stays in place.
+
+        Used to keep a finite field centered around a moving robot. Heights that
+        remain inside the field are shifted, the newly exposed strips are set to
+        `fill` and should be overwritten with `update_region`.
+
+        :param rows: Number of cells to move along y.
+        :param columns: Number of cells to move along x.
+        :param fill: Height of the newly exposed cells.
+        """
+        stored = self._heights()
+        nrow, ncol = self.shape
+        shifted = np.full_like(stored, min(max(fill, 0), self.max_height))
+        row_shift, column_shift = np.clip(rows, -nrow, nrow), np.clip(
+            columns, -ncol, ncol
+        )
+        source_rows = slice(max(row_shift, 0), nrow + min(row_shift, 0))
+        target_rows = slice(max(-row_shift, 0), nrow - max(row_shift, 0))
+        source_columns = slice(max(column_shift, 0), ncol + min(column_shift, 0))
+        target_columns = slice(max(-column_shift, 0), ncol - max(column_shift, 0))
+        shifted[target_rows, target_columns] = stored[source_rows, source_columns]
+        stored[:] = shifted
+        geom_mjcf = self.geom.mjcf
+        offset = np.array([columns, rows, 0]) * np.append(self.cell_size, 0)
+        position = self._mojo.physics.bind(geom_mjcf).pos + offset
+        self._mojo.physics.bind(geom_mjcf).pos = position
+        self._mojo.mirror_to_mjcf(geom_mjcf, pos=position)
+        self._write()
+
+    def _write(self, tile: tuple[slice, slice] = (slice(None), slice(None))):
+        binded = self._mojo.physics.bind(self.mjcf)
+        adr, size = int(binded.adr), self.shape[0] * self.shape[1]
+        data = self._mojo.model.hfield_data[adr : adr + size].reshape(self.shape)
+        data[tile] = self._heights()[tile] / self.max_height
+        self._mojo.upload_height_field(int(binded.element_id))
@@ -15,6 +15,8 @@ if TYPE_CHECKING:
 
 
 class Joint(MujocoElement):
+    __slots__ = ()
+
     @staticmethod
     def get(
         mojo: Mojo,
@@ -39,6 +41,7 @@ class Joint(MujocoElement):
         position = np.array([0, 0, 0]) if position is None else position
         axis = np.array([1, 0, 0]) if axis is None else axis
         range = np.array([0.0, 0.0]) if range is None else range
+        mojo.prepare_edit()
         parent = body.Body.create(mojo) if parent is None else parent
         new_geom = parent.mjcf.add(
             "joint",
@@ -59,6 +62,7 @@ class Joint(MujocoElement):
     def set_joint_position(self, value: float):
         self._mojo.physics.bind(self.mjcf).qpos *= 0
         self._mojo.physics.bind(self.mjcf).qpos += value
+        self._mojo.prepare_edit()
         self._mojo.mark_dirty()
 
     def get_joint_velocity(self) -> float:
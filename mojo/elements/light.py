@@ -15,6 +15,8 @@ if TYPE_CHECKING:
 
 
 class Light(MujocoElement):
+    __slots__ = ()
+
     @staticmethod
     def get(
         mojo: Mojo,
@@ -44,6 +46,7 @@ class Light(MujocoElement):
         specular = np.array([0.5, 0.5, 0.5]) if specular is None else specular
         if parent is not None and not isinstance(parent, Body):
             raise ValueError("Parent must be of type body for lights.")
+        mojo.prepare_edit()
         parent_mjcf = (
             mojo.root_element.mjcf.worldbody if parent is None else parent.mjcf
         )
@@ -61,43 +64,43 @@ class Light(MujocoElement):
         return Light(mojo, new_light)
 
     def set_active(self, value: bool):
-        self.mjcf.active = value
         self._mojo.physics.bind(self.mjcf).active = value
+        self._mojo.mirror_to_mjcf(self.mjcf, active=value)
 
     def is_active(self) -> bool:
         return self.mjcf.active == "true"
 
     def set_ambient(self, color: np.ndarray):
-        self.mjcf.ambient = color
         self._mojo.physics.bind(self.mjcf).ambient = color
+        self._mojo.mirror_to_mjcf(self.mjcf, ambient=color)
 
     def get_ambient(self) -> np.ndarray:
         return self.mjcf.ambient
 
     def set_diffuse(self, color: np.ndarray):
-        self.mjcf.diffuse = color
         self._mojo.physics.bind(self.mjcf).diffuse = color
+        self._mojo.mirror_to_mjcf(self.mjcf, diffuse=color)
 
     def get_diffuse(self) -> np.ndarray:
         return self.mjcf.diffuse
 
     def set_specular(self, color: np.ndarray):
-        self.mjcf.specular = color
         self._mojo.physics.bind(self.mjcf).specular = color
+        self._mojo.mirror_to_mjcf(self.mjcf, specular=color)
 
     def get_specular(self) -> np.ndarray:
         return self.mjcf.specular
 
     def set_direction(self, direction: np.ndarray):
-        self.mjcf.dir = direction
         self._mojo.physics.bind(self.mjcf).dir = direction
+        self._mojo.mirror_to_mjcf(self.mjcf, dir=direction)
 
     def get_direction(self) -> np.ndarray:
         return self.mjcf.dir
 
     def set_shadows(self, value: bool):
-        self.mjcf.castshadow = value
         self._mojo.physics.bind(self.mjcf).castshadow = value
+        self._mojo.mirror_to_mjcf(self.mjcf, castshadow=value)
 
     def is_using_shadows(self) -> bool:
         return self.mjcf.castshadow == "true"
@@ -1,20 +1,20 @@
 from __future__ import annotations
 
 import numpy as np
-from mujoco_utils import mjcf_utils
 
 from mojo.elements.body import Body
 from mojo.elements.element import MujocoElement
 
 
 class MujocoModel(MujocoElement):
+    __slots__ = ()
+
     @property
     def bodies(self) -> list[Body]:
-        # Loop through all children
-        return [
-            Body(self._mojo, mjcf)
-            for mjcf in mjcf_utils.safe_find_all(self.mjcf, "body")
-        ]
+        bodies = self._find_children("body", Body)
+        if not bodies:
+            raise ValueError("No body found in the MJCF model.")
+        return bodies
 
     def set_position(self, position: np.ndarray):
         position = np.array(position)  # ensure is numpy array
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from dm_control import mjcf
+from mujoco_utils import mjcf_utils
+from typing_extensions import Self
+
+from mojo.elements.consts import SensorType
+from mojo.elements.element import MujocoElement
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+_SITE_SENSORS = {
+    SensorType.TOUCH,
+    SensorType.ACCELEROMETER,
+    SensorType.VELOCIMETER,
+    SensorType.GYRO,
+    SensorType.FORCE,
+    SensorType.TORQUE,
+    SensorType.MAGNETOMETER,
+    SensorType.RANGEFINDER,
+}
+_JOINT_SENSORS = {SensorType.JOINT_POSITION, SensorType.JOINT_VELOCITY}
+_FRAME_SENSORS = {
+    SensorType.FRAME_POSITION,
+    SensorType.FRAME_QUATERNION,
+    SensorType.FRAME_LINEAR_VELOCITY,
+    SensorType.FRAME_ANGULAR_VELOCITY,
+    SensorType.FRAME_LINEAR_ACCELERATION,
+    SensorType.FRAME_ANGULAR_ACCELERATION,
+}
+_SUBTREE_SENSORS = {
+    SensorType.SUBTREE_COM,
+    SensorType.SUBTREE_LINEAR_VELOCITY,
+    SensorType.SUBTREE_ANGULAR_MOMENTUM,
+}
+_FRAME_TARGETS = {"body", "geom", "site", "camera"}
+
+
+def _sensor_target_kwargs(sensor_type: SensorType, target: mjcf.Element) -> dict:
+    if sensor_type in _SITE_SENSORS and target.tag == "site":
+        return {"site": target}
+    if sensor_type in _JOINT_SENSORS and target.tag == "joint":
+        return {"joint": target}
+    if sensor_type in _FRAME_SENSORS and target.tag in _FRAME_TARGETS:
+        return {"objtype": target.tag, "objname": target}
+    if sensor_type in _SUBTREE_SENSORS and target.tag == "body":
+        return {"body": target}
+    raise ValueError(
+        f"Sensor of type {sensor_type.value} cannot be attached to "
+        f"element of type {target.tag}."
+    )
+
+
+class Sensor(MujocoElement):
+    __slots__ = ("_view", "_view_generation")
+
+    def __init__(self, mojo: Mojo, mjcf_elem: mjcf.Element):
+        super().__init__(mojo, mjcf_elem)
+        self._view: Optional[np.ndarray] = None
+        self._view_generation = -1
+
+    @staticmethod
+    def get(
+        mojo: Mojo,
+        name: str,
+        parent: MujocoElement = None,
+    ) -> Self:
+        root_mjcf = mojo.root_element.mjcf if parent is None else parent.mjcf
+        mjcf = mjcf_utils.safe_find(root_mjcf, "sensor", name)
+        return Sensor(mojo, mjcf)
+
+    @staticmethod
+    def create(
+        mojo: Mojo,
+        sensor_type: SensorType,
+        target: MujocoElement,
+        name: str = None,
+        noise: float = 0.0,
+        cutoff: float = 0.0,
+    ) -> Self:
+        mojo.prepare_edit()
+        kwargs = _sensor_target_kwargs(sensor_type, target.mjcf)
+        if name is not None:
+            kwargs["name"] = name
+        new_sensor = mojo.root_element.mjcf.sensor.add(
+            sensor_type.value, noise=noise, cutoff=cutoff, **kwargs
+        )
+        mojo.mark_dirty()
+        return Sensor(mojo, new_sensor)
+
+    @property
+    def data(self) -> np.ndarray:
+        """View into `sensordata` for this sensor.
+
+        The view is shared with the simulation, so it reflects the latest step
+        without copying. It is rebound automatically after a recompile.
+        """
+        physics = self._mojo.physics
+        if self._view_generation != self._mojo.generation:
+            binded = physics.bind(self.mjcf)
+            adr, dim = int(binded.adr), int(binded.dim)
+            self._view = self._mojo.data.sensordata[adr : adr + dim]
+            self._view_generation = self._mojo.generation
+        return self._view
+
+    def get_value(self) -> np.ndarray:
+        return self.data.copy()
+
+    def get_sensor_type(self) -> SensorType:
+        return SensorType(self.mjcf.tag)
+
+
+class SensorGroup:
+    """Gathers the readings of many sensors into one preallocated array."""
+
+    def __init__(self, mojo: Mojo, sensors: list[Sensor]):
+        self._mojo = mojo
+        self._sensors = list(sensors)
+        self._generation = -1
+        self._indices: Optional[np.ndarray] = None
+        self._slices: list[slice] = []
+        self._buffer: Optional[np.ndarray] = None
+
+    @property
+    def sensors(self) -> list[Sensor]:
+        return list(self._sensors)
+
+    @property
+    def slices(self) -> list[slice]:
+        """Slice of each sensor's reading within the gathered array."""
+        self._update_indices()
+        return list(self._slices)
+
+    def _update_indices(self):
+        physics = self._mojo.physics
+        if self._generation == self._mojo.generation:
+            return
+        binded = physics.bind([s.mjcf for s in self._sensors])
+        addresses = np.atleast_1d(binded.adr)
+        dims = np.atleast_1d(binded.dim)
+        indices, self._slices, offset = [], [], 0
+        for adr, dim in zip(addresses, dims):
+            indices.append(np.arange(adr, adr + dim))
+            self._slices.append(slice(offset, offset + dim))
+            offset += dim
+        self._indices = (
+            np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+        )
+        self._buffer = np.zeros(len(self._indices))
+        self._generation = self._mojo.generation
+
+    def read(self, out: np.ndarray = None) -> np.ndarray:
+        """Gather all sensor readings.
+
+        :param out: Optional array to write into. If None, an internal buffer is
+        reused between calls, so copy the result if it must outlive the step.
+        :return: The concatenated sensor readings.
+        """
+        self._update_indices()
+        out = self._buffer if out is None else out
+        return np.take(self._mojo.data.sensordata, self._indices, out=out)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
 
 import mujoco
 import numpy as np
@@ -15,9 +15,12 @@ from mojo.elements.utils import load_texture
 if TYPE_CHECKING:
     from mojo import Mojo
     from mojo.elements.body import Body
+    from mojo.raycast import RaycastResult
 
 
 class Site(MujocoElement):
+    __slots__ = ()
+
     @staticmethod
     def get(
         mojo: Mojo,
@@ -43,6 +46,7 @@ class Site(MujocoElement):
         quaternion = np.array([1, 0, 0, 0]) if quaternion is None else quaternion
         size = np.array([0.1, 0.1, 0.1]) if size is None else size
         color = np.array([1, 1, 1, 1]) if color is None else color
+        mojo.prepare_edit()
         parent = body.Body.create(mojo) if parent is None else parent
         new_geom = parent.mjcf.add(
             "site",
@@ -69,7 +73,7 @@ class Site(MujocoElement):
         self._mojo.physics.bind(self.mjcf).xmat = np.reshape(matrix, (9,))
         quat = np.zeros(4)
         mujoco.mju_mat2Quat(quat, self._mojo.physics.bind(self.mjcf).xmat)
-        self.mjcf.quat = quat
+        self._mojo.mirror_to_mjcf(self.mjcf, quat=quat)
 
     def get_matrix(self) -> np.ndarray:
         return np.reshape(self._mojo.physics.bind(self.mjcf).xmat.copy(), (3, 3))
@@ -79,7 +83,7 @@ class Site(MujocoElement):
         if len(color) == 3:
             color = np.concatenate([color, [1]])  # add alpha
         self._mojo.physics.bind(self.mjcf).rgba = color
-        self.mjcf.rgba = color
+        self._mojo.mirror_to_mjcf(self.mjcf, rgba=color)
 
     def get_color(self) -> np.ndarray:
         return np.array(self._mojo.physics.bind(self.mjcf).rgba)
@@ -96,10 +100,12 @@ class Site(MujocoElement):
         reflectance: float = 0.0,
         color: np.ndarray = None,
     ):
+        self._mojo.prepare_edit()
         # First check if we have loaded this texture
         key_name = f"{texture_path}_{mapping.value}"
         material = self._mojo.get_material(key_name)
         if material is None:
+            max_resolution = self._mojo.get_texture_max_resolution(mapping)
             material = load_texture(
                 self._mojo.root_element.mjcf,
                 texture_path,
@@ -111,6 +117,8 @@ class Site(MujocoElement):
                 shininess,
                 reflectance,
                 color,
+                max_resolution,
+                self._mojo.get_prefetched(texture_path, max_resolution),
             )
             self._mojo.store_material(key_name, material)
         self.mjcf.material = material
@@ -118,3 +126,27 @@ class Site(MujocoElement):
             # Have a default white color for texture
             self.set_color(np.ones(4))
         self._mojo.mark_dirty()
+
+    def cast_rays(
+        self,
+        directions: np.ndarray,
+        max_dist: float = np.inf,
+        geomgroup: Sequence[bool] = None,
+        exclude_body: Body = None,
+    ) -> RaycastResult:
+        """Cast rays from the site frame.
+
+        For repeated casts of the same pattern use a `RayCaster`, which reuses
+        its buffers.
+
+        :param directions: Ray directions of shape (N, 3) in the site frame.
+        :param max_dist: Hits further than this are treated as misses.
+        :param geomgroup: Six flags selecting the geom groups rays can hit.
+        :param exclude_body: Optional body whose geoms are ignored.
+        :return: Hit distances and geom ids, -1 for misses.
+        """
+        from mojo.raycast import RayCaster
+
+        caster = RayCaster(self._mojo, directions, max_dist, geomgroup, exclude_body)
+        binded = self._mojo.physics.bind(self.mjcf)
+        return caster.cast(binded.xpos, binded.xmat)
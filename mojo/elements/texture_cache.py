@@ -0,0 +1,60 @@
+import os
+from typing import Optional
+
+from mojo.elements.utils import file_digest, get_cache_dir
+
+_CACHE_NAME = "textures"
+_PNG_FORMAT = "PNG"
+_SUPPORTED_MODES = ("RGB", "RGBA")
+
+
+def _import_pil():
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError(
+            "Texture preprocessing requires the 'Pillow' package. "
+            "Install it with 'pip install Pillow'."
+        ) from e
+    return Image
+
+
+def preprocess_texture(path: str, max_resolution: Optional[int] = None) -> str:
+    """Cap the resolution of a texture and convert it to an RGB(A) PNG.
+
+    Downsampling averages over the covered source area. Results are cached on
+    disk keyed by the source content and the target size.
+
+    :param path: Path to the source texture.
+    :param max_resolution: Maximum size of the longest side in pixels.
+    If None, the texture is only converted.
+    :return: Path to the texture that should be loaded.
+    """
+    image_module = _import_pil()
+    with image_module.open(path) as image:
+        width, height = image.size
+        scale = 1.0
+        if max_resolution is not None and max(width, height) > max_resolution:
+            scale = max_resolution / max(width, height)
+        target_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        if (
+            scale == 1.0
+            and image.format == _PNG_FORMAT
+            and image.mode in _SUPPORTED_MODES
+        ):
+            return path
+        cache_path = (
+            get_cache_dir(_CACHE_NAME)
+            / f"{file_digest(path)}_{target_size[0]}x{target_size[1]}.png"
+        )
+        if cache_path.exists():
+            return str(cache_path)
+        mode = "RGBA" if "A" in image.getbands() else "RGB"
+        processed = image.convert(mode)
+        if scale != 1.0:
+            processed = processed.resize(target_size, image_module.Resampling.BOX)
+    # Write then rename, so concurrent readers never see a partial file.
+    temp_path = cache_path.with_suffix(f".{os.getpid()}.png")
+    processed.save(temp_path, format=_PNG_FORMAT)
+    os.replace(temp_path, cache_path)
+    return str(cache_path)
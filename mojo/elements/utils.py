@@ -1,8 +1,13 @@
+import hashlib
+import os
 import uuid
 import warnings
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional
 
+import mujoco
 import numpy as np
 from dm_control import mjcf
 from lxml import etree
@@ -13,6 +18,30 @@ from mojo.elements.consts import TextureMapping
 _DEFAULT_COLLISION_MARGIN: float = 1e-8
 _FREEJOINT_TAG = "freejoint"
 _WORLDBODY_TAG = "worldbody"
+_CACHE_DIR_ENV = "MOJO_CACHE_DIR"
+_DEFAULT_CACHE_DIR = Path.home() / ".cache" / "mojo"
+_HASH_BLOCK_SIZE = 1 << 20
+_MJB_FILENAME = "model.mjb"
+_COMPILER_TAG = "compiler"
+_ASSET_DIR_ATTRIBUTE = "assetdir"
+# Tag -> (compiler directory attribute, file attributes)
+_FILE_REFERENCES = {
+    "mesh": ("meshdir", ("file",)),
+    "hfield": ("meshdir", ("file",)),
+    "skin": ("meshdir", ("file",)),
+    "texture": (
+        "texturedir",
+        (
+            "file",
+            "fileright",
+            "fileleft",
+            "fileup",
+            "filedown",
+            "filefront",
+            "fileback",
+        ),
+    ),
+}
 
 
 def has_collision(
@@ -49,8 +78,18 @@ def load_texture(
     shininess: float = 0.0,
     reflectance: float = 0.0,
     color: np.ndarray = None,
+    max_resolution: Optional[int] = None,
+    asset: Optional[mjcf.Asset] = None,
 ) -> mjcf.Element:
     tex_repeat = np.array([1, 1]) if tex_repeat is None else tex_repeat
+    if asset is not None:
+        # Prefetched contents are already preprocessed
+        path = asset
+    elif max_resolution is not None:
+        # Have to do this due to circular import
+        from mojo.elements.texture_cache import preprocess_texture
+
+        path = preprocess_texture(path, max_resolution)
     color = np.array([1, 1, 1, 1]) if color is None else color
     name = f"{uuid.uuid4()}_{mapping.value}"
     texture = mjcf_model.asset.add(
@@ -72,14 +111,107 @@ def load_texture(
 
 
 def load_mesh(
-    mjcf_model: mjcf.RootElement, path: str, scale: np.ndarray
+    mjcf_model: mjcf.RootElement,
+    path: str,
+    scale: np.ndarray,
+    asset: Optional[mjcf.Asset] = None,
 ) -> mjcf.Element:
     scale = np.array([1, 1, 1]) if scale is None else scale
     uid = str(uuid.uuid4())
-    mesh = mjcf_model.asset.add("mesh", name=f"mesh_{uid}", file=path, scale=scale)
+    file = path if asset is None else asset
+    mesh = mjcf_model.asset.add("mesh", name=f"mesh_{uid}", file=file, scale=scale)
     return mesh
 
 
+def file_digest(path: str) -> str:
+    """Hash of the file contents, used to key on-disk caches."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_cache_dir(name: str) -> Path:
+    """Directory of an on-disk cache. Override the root with $MOJO_CACHE_DIR."""
+    root = os.environ.get(_CACHE_DIR_ENV, None)
+    cache_dir = (_DEFAULT_CACHE_DIR if root is None else Path(root)) / name
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def find_asset_files(model_path: str) -> dict[str, str]:
+    """Find the asset files referenced by an MJCF file.
+
+    :param model_path: Path to the MJCF file.
+    :return: Mapping from the asset key MJCF looks up (the file reference
+    prefixed by the compiler directory) to the path on disk.
+    """
+    model_dir = os.path.dirname(model_path)
+    root = etree.parse(model_path).getroot()
+    directories = {}
+    for compiler in root.iter(_COMPILER_TAG):
+        directories.update(compiler.attrib)
+    files = {}
+    for tag, (directory_attribute, file_attributes) in _FILE_REFERENCES.items():
+        base_path = directories.get(
+            directory_attribute, directories.get(_ASSET_DIR_ATTRIBUTE, None)
+        )
+        for elem in root.iter(tag):
+            for attribute in file_attributes:
+                if (file := elem.get(attribute, None)) is None:
+                    continue
+                key = (
+                    os.path.normpath(os.path.join(base_path, file))
+                    if base_path
+                    else file
+                )
+                files[key] = os.path.join(model_dir, key)
+    return files
+
+
+def _read_file(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        # Let MJCF report missing files when it parses the model
+        return None
+
+
+def read_files(
+    paths: dict[str, str], max_workers: Optional[int] = None
+) -> dict[str, bytes]:
+    """Read files concurrently.
+
+    :param paths: Mapping from key to file path.
+    :param max_workers: Maximum number of reader threads.
+    :return: Mapping from key to file contents. Unreadable files are skipped.
+    """
+    if len(paths) == 0:
+        return {}
+    with ThreadPoolExecutor(max_workers) as executor:
+        contents = executor.map(_read_file, paths.values())
+        return {k: c for k, c in zip(paths.keys(), contents) if c is not None}
+
+
+def load_mjcf(path: str, max_workers: Optional[int] = None) -> mjcf.RootElement:
+    """Parse an MJCF file after reading all of its asset files concurrently."""
+    return mjcf.from_path(path, assets=read_files(find_asset_files(path), max_workers))
+
+
+def model_to_mjb(model: mujoco.MjModel) -> bytes:
+    """Serialize a compiled model to MJB bytes."""
+    buffer = np.empty(mujoco.mj_sizeModel(model), dtype=np.uint8)
+    mujoco.mj_saveModel(model, None, buffer)
+    return buffer.tobytes()
+
+
+def model_from_mjb(mjb: bytes) -> mujoco.MjModel:
+    """Load a compiled model from MJB bytes without compiling."""
+    return mujoco.MjModel.from_binary_path(_MJB_FILENAME, {_MJB_FILENAME: mjb})
+
+
 def resolve_freejoints(
     root_model: mjcf.RootElement, model: mjcf.RootElement
 ) -> mjcf.RootElement:
@@ -113,6 +245,14 @@ class AssetStore:
         self._store: OrderedDict[str, mjcf.Element] = OrderedDict()
         self._capacity = capacity
 
+    @property
+    def capacity(self) -> Optional[int]:
+        return self._capacity
+
+    def items(self) -> list[tuple[str, mjcf.Element]]:
+        """Get all stored paths and MJCF assets."""
+        return list(self._store.items())
+
     def get(self, path: str) -> Optional[mjcf.Element]:
         """Get MJCF asset by path."""
         return self._store.get(path, None)
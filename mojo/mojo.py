@@ -1,13 +1,223 @@
-from typing import Callable, Optional
+import copy
+import warnings
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, TypeVar, Union
 
+import mujoco
 import mujoco.viewer
 import numpy as np
 from dm_control import mjcf
+from dm_control.mujoco import wrapper
 
+from mojo import bundle, spatial
+from mojo.collision import CollisionLayers
 from mojo.elements.body import Body
-from mojo.elements.element import MujocoElement
+from mojo.elements.camera import Camera
+from mojo.elements.consts import TextureMapping
+from mojo.elements.element import MujocoElement, rebind_handles
+from mojo.elements.geom import Geom
 from mojo.elements.model import MujocoModel
-from mojo.elements.utils import AssetStore, resolve_freejoints
+from mojo.elements.texture_cache import preprocess_texture
+from mojo.elements.utils import (
+    AssetStore,
+    load_mjcf,
+    read_files,
+    resolve_freejoints,
+)
+
+if TYPE_CHECKING:
+    from mojo.recorder import RecordingReader
+
+ElementT = TypeVar("ElementT", bound=MujocoElement)
+
+_REPLAY_BLOCK_SIZE = 1000
+_REPLAY_FIELDS = ("qpos", "mocap_pos", "mocap_quat")
+# Maximum number of prefetched files kept in memory
+_PREFETCH_CAPACITY = 256
+# Number of qpos and qvel entries per joint type
+_JOINT_SIZES = {
+    mujoco.mjtJoint.mjJNT_FREE: (7, 6),
+    mujoco.mjtJoint.mjJNT_BALL: (4, 3),
+    mujoco.mjtJoint.mjJNT_SLIDE: (1, 1),
+    mujoco.mjtJoint.mjJNT_HINGE: (1, 1),
+}
+# Namespaces of elements carried across asynchronous compiles
+_OBJECT_TYPES = {
+    "joint": mujoco.mjtObj.mjOBJ_JOINT,
+    "actuator": mujoco.mjtObj.mjOBJ_ACTUATOR,
+    "body": mujoco.mjtObj.mjOBJ_BODY,
+    "equality": mujoco.mjtObj.mjOBJ_EQUALITY,
+    "geom": mujoco.mjtObj.mjOBJ_GEOM,
+    "site": mujoco.mjtObj.mjOBJ_SITE,
+    "camera": mujoco.mjtObj.mjOBJ_CAMERA,
+    "light": mujoco.mjtObj.mjOBJ_LIGHT,
+    "sensor": mujoco.mjtObj.mjOBJ_SENSOR,
+    "hfield": mujoco.mjtObj.mjOBJ_HFIELD,
+}
+# Prefixes of the model fields of mirrored MJCF attributes
+_MODEL_PREFIXES = {
+    "body": "body",
+    "geom": "geom",
+    "site": "site",
+    "camera": "cam",
+    "light": "light",
+}
+
+ElementIds = dict[int, tuple[mjcf.Element, int]]
+
+
+@dataclass
+class SerializedScene:
+    """Picklable copy of a scene and the settings of its Mojo instance."""
+
+    xml: str
+    assets: dict[str, bytes]
+    texture_store_capacity: Optional[int]
+    mesh_store_capacity: Optional[int]
+    texture_max_resolution: Union[int, dict[TextureMapping, int], None]
+
+
+class _Physics(mjcf.Physics):
+    """Physics that waits for a pending compile before binding new elements."""
+
+    _owner: Optional[weakref.ref] = None
+
+    def bind(self, mjcf_elements):
+        mojo = None if self._owner is None else self._owner()
+        if (
+            mojo is not None
+            and mojo._physics is self
+            and mojo.is_compiling
+            and not mojo._is_compiled(mjcf_elements)
+        ):
+            # Elements created since the scene was serialized need the new model
+            mojo.wait_compiled()
+            return mojo.physics.bind(mjcf_elements)
+        return super().bind(mjcf_elements)
+
+
+def _compile_physics(xml: str, assets: dict) -> mjcf.Physics:
+    return _Physics.from_xml_string(xml, assets=assets)
+
+
+def _walk_mjcf(element: mjcf.Element):
+    yield element
+    for child in element.all_children():
+        yield from _walk_mjcf(child)
+
+
+def _copy_mjcf(
+    model_mjcf: mjcf.RootElement,
+) -> tuple[mjcf.RootElement, dict[int, tuple[mjcf.Element, mjcf.Element]]]:
+    """Deep copy an MJCF tree.
+
+    :return: The copy and a table from the id of every source element to the
+    source element and its copy.
+    """
+    try:
+        model_copy = copy.deepcopy(model_mjcf)
+    except NotImplementedError as e:
+        raise RuntimeError(
+            "Scenes with attached models cannot be copied, edit the source "
+            "scene instead."
+        ) from e
+    pairs = zip(_walk_mjcf(model_mjcf), _walk_mjcf(model_copy))
+    return model_copy, {id(source): (source, target) for source, target in pairs}
+
+
+def _element_names(
+    model_mjcf: mjcf.RootElement,
+) -> dict[str, list[tuple[mjcf.Element, str]]]:
+    """Get the elements whose state is carried across compiles.
+
+    Names of unnamed elements depend on their position in the tree, so they are
+    taken from the tree exactly as it is compiled.
+    """
+    return {
+        namespace: [(e, e.full_identifier) for e in model_mjcf.find_all(namespace)]
+        for namespace in _OBJECT_TYPES
+    }
+
+
+def _element_ids(model: mujoco.MjModel, names: dict) -> dict[str, ElementIds]:
+    """Look up the compiled ids of elements returned by `_element_names`."""
+    return {
+        namespace: {
+            id(element): (
+                element,
+                mujoco.mj_name2id(model, _OBJECT_TYPES[namespace], name),
+            )
+            for element, name in elements
+        }
+        for namespace, elements in names.items()
+    }
+
+
+def _matched_ids(
+    source_ids: dict[str, ElementIds],
+    target_ids: dict[str, ElementIds],
+    namespace: str,
+):
+    """Yield the source and target ids of elements compiled into both models."""
+    sources = source_ids[namespace]
+    for key, (element, target_id) in target_ids[namespace].items():
+        source_element, source_id = sources.get(key, (None, -1))
+        if source_element is element and source_id >= 0 and target_id >= 0:
+            yield source_id, target_id
+
+
+def _transfer_state(
+    source_model: mujoco.MjModel,
+    source_data: mujoco.MjData,
+    source_ids: dict[str, ElementIds],
+    target_model: mujoco.MjModel,
+    target_data: mujoco.MjData,
+    target_ids: dict[str, ElementIds],
+):
+    """Copy the simulation state between models, matching elements by identity."""
+    target_data.time = source_data.time
+    for source_id, joint_id in _matched_ids(source_ids, target_ids, "joint"):
+        joint_type = target_model.jnt_type[joint_id]
+        if source_model.jnt_type[source_id] != joint_type:
+            continue
+        nq, nv = _JOINT_SIZES[mujoco.mjtJoint(joint_type)]
+        qpos = target_model.jnt_qposadr[joint_id]
+        source_qpos = source_model.jnt_qposadr[source_id]
+        dof = target_model.jnt_dofadr[joint_id]
+        source_dof = source_model.jnt_dofadr[source_id]
+        target_data.qpos[qpos : qpos + nq] = source_data.qpos[
+            source_qpos : source_qpos + nq
+        ]
+        target_data.qvel[dof : dof + nv] = source_data.qvel[
+            source_dof : source_dof + nv
+        ]
+    for source_id, actuator_id in _matched_ids(source_ids, target_ids, "actuator"):
+        target_data.ctrl[actuator_id] = source_data.ctrl[source_id]
+        num_act = target_model.actuator_actnum[actuator_id]
+        if num_act > 0 and source_model.actuator_actnum[source_id] == num_act:
+            act = target_model.actuator_actadr[actuator_id]
+            source_act = source_model.actuator_actadr[source_id]
+            target_data.act[act : act + num_act] = source_data.act[
+                source_act : source_act + num_act
+            ]
+    for source_id, body_id in _matched_ids(source_ids, target_ids, "body"):
+        target_data.xfrc_applied[body_id] = source_data.xfrc_applied[source_id]
+        mocap = target_model.body_mocapid[body_id]
+        source_mocap = source_model.body_mocapid[source_id]
+        if mocap >= 0 and source_mocap >= 0:
+            target_data.mocap_pos[mocap] = source_data.mocap_pos[source_mocap]
+            target_data.mocap_quat[mocap] = source_data.mocap_quat[source_mocap]
+    for source_id, equality_id in _matched_ids(source_ids, target_ids, "equality"):
+        if source_model.eq_type[source_id] != target_model.eq_type[equality_id]:
+            continue
+        target_data.eq_active[equality_id] = source_data.eq_active[source_id]
+        # Relative poses are captured into the model when constraints activate
+        target_model.eq_data[equality_id] = source_model.eq_data[source_id]
+    mujoco.mj_forward(target_model, target_data)
 
 
 class Mojo:
@@ -17,40 +227,173 @@ class Mojo:
         timestep: float = 0.01,
         texture_store_capacity: int = AssetStore.DEFAULT_CAPACITY,
         mesh_store_capacity: int = AssetStore.DEFAULT_CAPACITY,
+        texture_max_resolution: Union[int, dict[TextureMapping, int], None] = None,
+        prefetch_workers: Optional[int] = None,
+        async_compile: bool = False,
+    ):
+        """Create a Mojo instance.
+
+        :param base_model_path: Path to the base MJCF model.
+        :param timestep: The physics timestep.
+        :param texture_store_capacity: Maximum number of cached textures.
+        :param mesh_store_capacity: Maximum number of cached meshes.
+        :param texture_max_resolution: Optional cap on the longest side of loaded
+        textures, either for all mappings or per mapping. Capped textures are
+        downsampled, converted to PNG and cached on disk.
+        :param prefetch_workers: Maximum number of threads used to read asset files
+        before models are parsed. Defaults to the thread pool default.
+        :param async_compile: If true, edits to an already compiled scene are
+        compiled on a worker thread while the previous physics keeps running.
+        The new physics is swapped in at the next step, see `wait_compiled`.
+        """
+        self._prefetch_workers = prefetch_workers
+        self._setup(
+            load_mjcf(base_model_path, prefetch_workers),
+            texture_store_capacity,
+            mesh_store_capacity,
+            texture_max_resolution,
+            async_compile,
+        )
+        self.set_timestep(timestep)
+
+    def _setup(
+        self,
+        model_mjcf: mjcf.RootElement,
+        texture_store_capacity: int,
+        mesh_store_capacity: int,
+        texture_max_resolution: Union[int, dict[TextureMapping, int], None],
+        async_compile: bool,
     ):
-        model_mjcf = mjcf.from_path(base_model_path)
         self.root_element = MujocoModel(self, model_mjcf)
+        self._physics: Optional[mjcf.Physics] = None
+        self._async_compile = async_compile
+        self._compile_executor: Optional[ThreadPoolExecutor] = None
+        self._compile_future: Optional[Future] = None
+        self._compile_outdated = False
+        # Compiled ids of the elements of the current and the compiling physics
+        self._element_ids: Optional[dict[str, ElementIds]] = None
+        self._compile_names: Optional[dict] = None
+        # Mirrored writes made while compiling, applied to the compiled physics
+        self._compile_writes: list[tuple[mjcf.Element, str, Any]] = []
         self._texture_store: AssetStore = AssetStore(texture_store_capacity)
         self._mesh_store: AssetStore = AssetStore(mesh_store_capacity)
+        # Proxy hulls are referenced by geoms, so they are never evicted
+        self._proxy_mesh_store: AssetStore = AssetStore()
+        self._collision_proxies: dict[int, tuple[mjcf.Element, list]] = {}
+        self._texture_max_resolution = texture_max_resolution
+        # Prefetched file contents keyed by path and texture resolution cap
+        self._prefetched: OrderedDict[
+            tuple[str, Optional[int]], mjcf.Asset
+        ] = OrderedDict()
         self._dirty = True
         self._passive_dirty = False
         self._passive_viewer_handle = None
-        self.set_timestep(timestep)
+        self._generation = 0
+        self._structure_version = 0
+        self._step_callbacks: list[Callable[[], None]] = []
+        self._height_fields: dict[int, tuple[mjcf.Element, np.ndarray]] = {}
+        self._connect_anchors: dict[int, tuple[mjcf.Element, np.ndarray]] = {}
+        self._id_tables: dict[str, list[mjcf.Element]] = {}
+        self._id_tables_generation = -1
+        self._spatial_index: Optional[spatial.SpatialIndex] = None
+        self.collision_layers = CollisionLayers(self)
+        # Clones keep their raw data until element bindings need a physics
+        self._clone_model: Optional[mujoco.MjModel] = None
+        self._clone_data: Optional[mujoco.MjData] = None
+        self._clone_elements: dict[int, tuple[mjcf.Element, mjcf.Element]] = {}
+        # Keys of copied MJCF elements, inherited from the elements they copy
+        self._element_keys: dict[int, tuple[mjcf.Element, int]] = {}
+        # Clones share the MJCF of their source until either edits the scene
+        self._mjcf_owner: Optional[Mojo] = None
+        self._mjcf_borrowers: weakref.WeakSet[Mojo] = weakref.WeakSet()
+        self._deferred_mirrors: dict[tuple[int, str], tuple[mjcf.Element, str, Any]]
+        self._deferred_mirrors = {}
 
     def _create_physics_from_model(self):
-        self._physics = mjcf.Physics.from_mjcf_model(self.root_element.mjcf)
+        self._flush_height_fields()
+        self._set_physics(_Physics.from_mjcf_model(self.root_element.mjcf))
+
+    def _set_physics(
+        self,
+        physics: mjcf.Physics,
+        element_ids: Optional[dict[str, ElementIds]] = None,
+    ):
+        if self._async_compile and element_ids is None:
+            names = _element_names(self.root_element.mjcf)
+            element_ids = _element_ids(physics.model.ptr, names)
+        self._element_ids = element_ids
+        self._restore_height_fields(physics)
+        self._restore_connect_anchors(physics)
+        physics._owner = weakref.ref(self)
+        self._physics = physics
         self._physics.legacy_step = False
         self._dirty = False
+        self._clone_model = None
+        self._clone_data = None
+        self._generation += 1
 
     @property
     def physics(self):
         if self._dirty:
             self._create_physics_from_model()
+        elif self._physics is None:
+            self._physics = _Physics(wrapper.MjData(self._clone_data))
+            self._physics._owner = weakref.ref(self)
+            self._physics.legacy_step = False
         return self._physics
 
     @property
     def model(self):
         if self._dirty:
             self._create_physics_from_model()
+        if self._physics is None:
+            return self._clone_model
         return self._physics.model.ptr
 
     @property
     def data(self):
         if self._dirty:
             self._create_physics_from_model()
+        if self._physics is None:
+            return self._clone_data
         return self._physics.data.ptr
 
+    @property
+    def generation(self) -> int:
+        """Number of times the physics has been compiled.
+
+        Use it to invalidate model indices cached outside of the MJCF tree.
+        """
+        return self._generation
+
+    def _mjcf_by_id(self, tag: str, element_id: int) -> mjcf.Element:
+        physics = self.physics
+        if self._id_tables_generation != self._generation:
+            self._id_tables = {}
+            self._id_tables_generation = self._generation
+        if tag not in self._id_tables:
+            worldbody = self.root_element.mjcf.worldbody
+            elements = worldbody.find_all(tag)
+            if tag == "body":
+                elements = [worldbody] + elements
+            table = [None] * len(elements)
+            if elements:
+                ids = np.atleast_1d(physics.bind(elements).element_id)
+                for element, i in zip(elements, ids):
+                    table[i] = element
+            self._id_tables[tag] = table
+        return self._id_tables[tag][element_id]
+
+    def get_geom(self, geom_id: int) -> Geom:
+        """Get the geom with the given id in the compiled model."""
+        return Geom(self, self._mjcf_by_id("geom", geom_id))
+
+    def get_body(self, body_id: int) -> Body:
+        """Get the body with the given id in the compiled model."""
+        return Body(self, self._mjcf_by_id("body", body_id))
+
     def set_timestep(self, timestep: float):
+        self.prepare_edit()
         self.root_element.mjcf.option.timestep = timestep
 
     def launch_viewer(self, passive: bool = False) -> None:
@@ -70,7 +413,8 @@ class Mojo:
             raise RuntimeError("You do not have a passive viewer running.")
         if self._passive_dirty:
             self._passive_dirty = False
-            self._create_physics_from_model()
+            if self._dirty:
+                self._create_physics_from_model()
             self._passive_viewer_handle._sim().load(
                 self._physics.model.ptr, self._physics.data.ptr, ""
             )
@@ -81,15 +425,452 @@ class Mojo:
             raise RuntimeError("You do not have a passive viewer running.")
         self._passive_viewer_handle.close()
 
+    @property
+    def structure_version(self) -> int:
+        """Number of structural edits of the scene.
+
+        Use it to invalidate caches of the MJCF tree.
+        """
+        return self._structure_version
+
+    def prepare_edit(self) -> None:
+        """Make sure the MJCF can be edited. Call before changing the MJCF tree.
+
+        A clone sharing the MJCF of its source first gets its own copy, which all
+        of its element handles are moved to. Clones sharing the MJCF of this
+        instance are moved to a copy of the unedited scene.
+        """
+        if self._mjcf_owner is not None:
+            self._move_to_copy([self])
+        elif len(self._mjcf_borrowers) > 0:
+            try:
+                self._move_to_copy(list(self._mjcf_borrowers))
+            except RuntimeError:
+                # Scenes with attached models stay shared
+                pass
+
+    def mirror_to_mjcf(self, element_mjcf: mjcf.Element, **attributes) -> None:
+        """Write attributes already applied to the physics into the MJCF.
+
+        Keeps runtime changes, e.g. teleports, across recompiles. Clones sharing
+        the MJCF of their source defer the writes until they get their own copy,
+        so these changes never copy the scene.
+
+        :param element_mjcf: The MJCF element.
+        :param attributes: Attribute names and values.
+        """
+        for name, value in attributes.items():
+            key = (id(element_mjcf), name)
+            if self._mjcf_owner is not None:
+                self._deferred_mirrors[key] = (element_mjcf, name, value)
+                continue
+            for borrower in self._mjcf_borrowers:
+                previous = getattr(element_mjcf, name)
+                borrower._deferred_mirrors.setdefault(
+                    key, (element_mjcf, name, previous)
+                )
+            setattr(element_mjcf, name, value)
+            if self._compile_future is not None:
+                self._compile_writes.append((element_mjcf, name, value))
+
+    @staticmethod
+    def _move_to_copy(instances: list["Mojo"]):
+        """Move instances sharing an MJCF to one copy of it."""
+        model_copy, elements = _copy_mjcf(instances[0].root_element.mjcf)
+        owner = instances[0]
+        for mojo in instances:
+            if mojo._mjcf_owner is not None:
+                mojo._mjcf_owner._mjcf_borrowers.discard(mojo)
+            mojo._mjcf_owner = None if mojo is owner else owner
+            if mojo is not owner:
+                owner._mjcf_borrowers.add(mojo)
+            mojo._adopt_mjcf(model_copy, elements)
+
+    def _adopt_mjcf(
+        self,
+        model_mjcf: mjcf.RootElement,
+        elements: dict[int, tuple[mjcf.Element, mjcf.Element]],
+    ):
+        self._element_keys = {
+            id(target): (target, self.element_key(source))
+            for source, target in elements.values()
+        }
+        self.root_element = MujocoModel(self, model_mjcf)
+        self._clone_elements = elements
+        resolve = self._resolve_mjcf
+        texture_store = AssetStore(self._texture_store.capacity)
+        mesh_store = AssetStore(self._mesh_store.capacity)
+        proxy_mesh_store = AssetStore()
+        for store, new_store in (
+            (self._texture_store, texture_store),
+            (self._mesh_store, mesh_store),
+            (self._proxy_mesh_store, proxy_mesh_store),
+        ):
+            for path, asset in store.items():
+                if (asset := resolve(asset)) is not None:
+                    new_store.add(path, asset)
+        self._texture_store, self._mesh_store = texture_store, mesh_store
+        self._proxy_mesh_store = proxy_mesh_store
+        collision_proxies = self._collision_proxies.values()
+        self._collision_proxies = {}
+        for geom_mjcf, proxies in collision_proxies:
+            if (geom_mjcf := resolve(geom_mjcf)) is not None:
+                self.store_collision_proxies(
+                    geom_mjcf, [p for p in map(resolve, proxies) if p is not None]
+                )
+        height_fields = self._height_fields.values()
+        self._height_fields = {}
+        for hfield_mjcf, heights in height_fields:
+            if (hfield_mjcf := resolve(hfield_mjcf)) is not None:
+                self.store_height_field_data(hfield_mjcf, heights.copy())
+        connect_anchors = self._connect_anchors.values()
+        self._connect_anchors = {}
+        for connect_mjcf, anchor in connect_anchors:
+            if (connect_mjcf := resolve(connect_mjcf)) is not None:
+                self.store_connect_anchor(connect_mjcf, anchor)
+        for element_mjcf, name, value in self._deferred_mirrors.values():
+            if (element_mjcf := resolve(element_mjcf)) is not None:
+                setattr(element_mjcf, name, value)
+        self._deferred_mirrors = {}
+        self.collision_layers.remap(resolve)
+        if self._element_ids is not None:
+            self._element_ids = {
+                namespace: {
+                    id(target): (target, element_id)
+                    for element, element_id in ids.values()
+                    if (target := resolve(element)) is not None
+                }
+                for namespace, ids in self._element_ids.items()
+            }
+        rebind_handles(self, resolve)
+        self._id_tables_generation = -1
+        self._structure_version += 1
+
     def mark_dirty(self):
+        if self._mjcf_owner is not None:
+            raise RuntimeError(
+                "This clone shares its MJCF with its source, call "
+                "`prepare_edit` before editing the MJCF of a clone."
+            )
+        self._structure_version += 1
+        if self._async_compile and self._physics is not None:
+            self._schedule_compile()
+            return
         self._passive_dirty = True
         self._dirty = True
 
+    def _schedule_compile(self):
+        if self._compile_future is not None:
+            # Compiled once the running compile has been swapped in
+            self._compile_outdated = True
+            return
+        # Serialize on the caller thread, so the worker never sees a partial edit
+        self._flush_height_fields()
+        xml = self.root_element.mjcf.to_xml_string()
+        assets = self.root_element.mjcf.get_assets()
+        self._compile_names = _element_names(self.root_element.mjcf)
+        if self._compile_executor is None:
+            self._compile_executor = ThreadPoolExecutor(max_workers=1)
+        self._compile_future = self._compile_executor.submit(
+            _compile_physics, xml, assets
+        )
+        self._compile_outdated = False
+
+    def _swap_compiled(self, block: bool):
+        future = self._compile_future
+        if future is None or (not block and not future.done()):
+            return
+        self._compile_future = None
+        physics = future.result()
+        model, data = physics.model.ptr, physics.data.ptr
+        element_ids = _element_ids(model, self._compile_names)
+        _transfer_state(
+            self.model, self.data, self._element_ids, model, data, element_ids
+        )
+        self._apply_compile_writes(model, element_ids)
+        self._set_physics(physics, element_ids)
+        self._passive_dirty = True
+        if self._compile_outdated:
+            self._schedule_compile()
+
+    def _apply_compile_writes(
+        self, model: mujoco.MjModel, element_ids: dict[str, ElementIds]
+    ):
+        # The XML was serialized before these writes reached the MJCF
+        writes, self._compile_writes = self._compile_writes, []
+        for element_mjcf, name, value in writes:
+            namespace = element_mjcf.spec.namespace
+            prefix = _MODEL_PREFIXES.get(namespace)
+            field = getattr(model, f"{prefix}_{name}", None) if prefix else None
+            element, element_id = element_ids.get(namespace, {}).get(
+                id(element_mjcf), (None, -1)
+            )
+            if field is not None and element is element_mjcf and element_id >= 0:
+                field[element_id] = value
+            else:
+                # The write is in the MJCF, so the next compile picks it up
+                self._compile_outdated = True
+
+    def _is_compiled(self, mjcf_elements) -> bool:
+        """Check whether elements are part of the current physics."""
+        if isinstance(mjcf_elements, mjcf.Element):
+            mjcf_elements = [mjcf_elements]
+        for element_mjcf in mjcf_elements:
+            ids = self._element_ids.get(element_mjcf.spec.namespace)
+            if ids is None:
+                continue
+            element, element_id = ids.get(id(element_mjcf), (None, -1))
+            if element is not element_mjcf or element_id < 0:
+                return False
+        return True
+
+    @property
+    def is_compiling(self) -> bool:
+        """Whether an asynchronous compile has not been swapped in yet."""
+        return self._compile_future is not None
+
+    def wait_compiled(self) -> None:
+        """Block until all edits are compiled and swapped in.
+
+        Elements added since the last swap can only be accessed through the
+        physics after this.
+        """
+        while self._compile_future is not None:
+            self._swap_compiled(block=True)
+        if self._dirty:
+            self._create_physics_from_model()
+
     def step(self):
         """Advances the physics state by 1 step."""
         if self._dirty:
             self._create_physics_from_model()
-        self.physics.step()
+        self._swap_compiled(block=False)
+        if self._physics is None:
+            mujoco.mj_step(self._clone_model, self._clone_data)
+        else:
+            self._physics.step()
+        for callback in self._step_callbacks:
+            callback()
+
+    def clone(self, copy_mjcf: bool = False) -> "Mojo":
+        """Create a copy of the simulation that shares the compiled model.
+
+        Only the data is copied, so a clone costs one `mj_copyData`. Use
+        `resolve` to get element handles of the clone and `copy_state_from`
+        to reuse a clone for the next branch. Writes to model fields, e.g.
+        through `set_color`, are seen by all instances sharing the model.
+
+        The MJCF is copied on write: the first scene edit of either the clone or
+        its source gives the clone its own copy of the scene, see
+        `prepare_edit`. Scenes with attached models cannot be copied, so their
+        clones cannot be edited and see the edits of their source.
+
+        :param copy_mjcf: If true, the MJCF is copied right away. The model of
+        the clone is still only replaced by its own on the first recompile.
+        :return: The clone, in the current state of this instance.
+        """
+        model, data = self.model, self.data
+        clone = self.__class__.__new__(self.__class__)
+        clone._prefetch_workers = self._prefetch_workers
+        clone._setup(
+            self.root_element.mjcf,
+            self._texture_store.capacity,
+            self._mesh_store.capacity,
+            self._texture_max_resolution,
+            self._async_compile,
+        )
+        owner = self if self._mjcf_owner is None else self._mjcf_owner
+        clone._mjcf_owner = owner
+        owner._mjcf_borrowers.add(clone)
+        clone._height_fields = self._height_fields
+        clone._connect_anchors = dict(self._connect_anchors)
+        clone._texture_store = self._texture_store
+        clone._mesh_store = self._mesh_store
+        clone._proxy_mesh_store = self._proxy_mesh_store
+        clone._prefetched = self._prefetched
+        clone._collision_proxies = self._collision_proxies
+        clone._deferred_mirrors = dict(self._deferred_mirrors)
+        clone._element_ids = self._element_ids
+        clone._element_keys = self._element_keys
+        clone.collision_layers = self.collision_layers.copy(clone)
+        if copy_mjcf:
+            self._move_to_copy([clone])
+        clone._clone_model = model
+        clone._clone_data = mujoco.MjData(model)
+        mujoco.mj_copyData(clone._clone_data, model, data)
+        clone._dirty = False
+        clone._generation = self._generation
+        return clone
+
+    def copy_state_from(self, other: "Mojo") -> None:
+        """Copy the simulation state of an instance sharing the compiled model.
+
+        :param other: The source or another clone of the same model.
+        """
+        model = self.model
+        if other.model is not model:
+            raise ValueError("Can only copy the state of a shared model.")
+        mujoco.mj_copyData(self.data, model, other.data)
+
+    def resolve(self, element: ElementT) -> ElementT:
+        """Get the handle of an element of the source of this clone.
+
+        :param element: A handle of the source instance.
+        :return: The handle of the same element in this instance.
+        """
+        element_mjcf = self._resolve_mjcf(element.mjcf)
+        if element_mjcf is None:
+            raise ValueError(f"{element.mjcf} is not part of the source scene.")
+        return type(element)(self, element_mjcf)
+
+    def element_key(self, element_mjcf: mjcf.Element) -> int:
+        """Get a key of an MJCF element that is kept when the MJCF is copied."""
+        target, key = self._element_keys.get(id(element_mjcf), (None, None))
+        return key if target is element_mjcf else id(element_mjcf)
+
+    def _resolve_mjcf(self, element_mjcf: mjcf.Element) -> Optional[mjcf.Element]:
+        if not self._clone_elements:
+            return element_mjcf
+        source, target = self._clone_elements.get(id(element_mjcf), (None, None))
+        return target if source is element_mjcf else None
+
+    def forward_kinematics(self, collision: bool = False) -> None:
+        """Recompute poses without simulating dynamics.
+
+        Applies all pose writes made since the last update in a single pass, so
+        that body, geom, site, camera and light poses are consistent. Much
+        cheaper than `step()` when objects are only teleported.
+
+        :param collision: If true, also recompute the contacts.
+        """
+        model, data = self.model, self.data
+        mujoco.mj_kinematics(model, data)
+        # Camera and light targets depend on the subtree centers of mass
+        mujoco.mj_comPos(model, data)
+        mujoco.mj_camlight(model, data)
+        if collision:
+            mujoco.mj_collision(model, data)
+
+    def distances(
+        self,
+        group_a: Sequence[Union[Geom, Body]],
+        group_b: Sequence[Union[Geom, Body]],
+        max_dist: float = 1.0,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Compute clearance distances between two sets of geoms or bodies.
+
+        Pairs are first pruned by their world bounding boxes. The distance
+        between bodies is the smallest distance between their geoms.
+
+        :param group_a: Geoms or bodies.
+        :param group_b: Geoms or bodies.
+        :param max_dist: Distances are only computed up to this value. Further
+        pairs are reported at `max_dist`.
+        :return: The (A, B) signed distance matrix and the (A, B, 6) closest point
+        segments from A to B, which are NaN for pairs at `max_dist`.
+        """
+        return spatial.distances(self, group_a, group_b, max_dist)
+
+    def _updated_spatial_index(self) -> spatial.SpatialIndex:
+        if self._spatial_index is None:
+            self._spatial_index = spatial.SpatialIndex(self, update_on_step=False)
+        self._spatial_index.update()
+        return self._spatial_index
+
+    def query_box(
+        self, lower: np.ndarray, upper: np.ndarray, per_body: bool = False
+    ) -> list[Union[Geom, Body]]:
+        """Find the geoms or bodies overlapping an axis aligned box.
+
+        Uses the current geom poses. For repeated queries in large scenes use a
+        `SpatialIndex` with a grid.
+
+        :param lower: Lower corner of the box.
+        :param upper: Upper corner of the box.
+        :param per_body: If true, return the bodies owning the found geoms.
+        """
+        return self._updated_spatial_index().query_box(lower, upper, per_body)
+
+    def query_sphere(
+        self, center: np.ndarray, radius: float, per_body: bool = False
+    ) -> list[Union[Geom, Body]]:
+        """Find the geoms or bodies overlapping a sphere.
+
+        :param center: Center of the sphere.
+        :param radius: Radius of the sphere.
+        :param per_body: If true, return the bodies owning the found geoms.
+        """
+        return self._updated_spatial_index().query_sphere(center, radius, per_body)
+
+    def query_frustum(
+        self,
+        camera: Camera,
+        near: Optional[float] = None,
+        far: Optional[float] = None,
+        per_body: bool = False,
+    ) -> list[Union[Geom, Body]]:
+        """Find the geoms or bodies inside the view frustum of a camera.
+
+        :param camera: The camera defining the frustum.
+        :param near: Near clipping distance. Defaults to the model's visual znear.
+        :param far: Far clipping distance. Defaults to the model's visual zfar.
+        :param per_body: If true, return the bodies owning the found geoms.
+        """
+        return self._updated_spatial_index().query_frustum(
+            camera, near, far, per_body=per_body
+        )
+
+    def replay(
+        self,
+        trajectory: Union["RecordingReader", dict[str, np.ndarray]],
+        frame_skip: int = 1,
+        callback: Optional[Callable[[int], None]] = None,
+        kinematics_only: bool = True,
+    ) -> None:
+        """Replay a recorded trajectory without simulating dynamics.
+
+        For every replayed frame, qpos (and mocap state and time, if recorded) is
+        written to the data and only the kinematics are recomputed.
+
+        :param trajectory: A recording reader or a dict of per-frame arrays.
+        Must contain 'qpos'.
+        :param frame_skip: Replay every n-th frame.
+        :param callback: Optional callback executed after each replayed frame with
+        the frame index. Use it to render or sync a viewer.
+        :param kinematics_only: If true only recomputes poses, like
+        `forward_kinematics`, otherwise runs `mj_forward` so that velocity and
+        force dependent quantities are also recomputed.
+        """
+        model, data = self.model, self.data
+        fields = [f for f in _REPLAY_FIELDS if f in trajectory]
+        has_time = "time" in trajectory
+        num_frames = len(trajectory["qpos"])
+        # Read in blocks so that recordings on disk are never fully loaded.
+        block_size = max(frame_skip, _REPLAY_BLOCK_SIZE // frame_skip * frame_skip)
+        for start in range(0, num_frames, block_size):
+            stop = min(start + block_size, num_frames)
+            block = {f: trajectory[f][start:stop:frame_skip] for f in fields}
+            times = trajectory["time"][start:stop:frame_skip] if has_time else None
+            for i, frame in enumerate(range(start, stop, frame_skip)):
+                for field in fields:
+                    getattr(data, field)[:] = block[field][i]
+                if has_time:
+                    data.time = times[i]
+                if kinematics_only:
+                    mujoco.mj_kinematics(model, data)
+                    mujoco.mj_comPos(model, data)
+                    mujoco.mj_camlight(model, data)
+                else:
+                    mujoco.mj_forward(model, data)
+                if callback is not None:
+                    callback(frame)
+
+    def add_step_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback to be executed after every step."""
+        self._step_callbacks.append(callback)
+
+    def remove_step_callback(self, callback: Callable[[], None]) -> None:
+        self._step_callbacks.remove(callback)
 
     def get_material(self, path: str) -> Optional[mjcf.Element]:
         return self._texture_store.get(path)
@@ -97,12 +878,151 @@ class Mojo:
     def store_material(self, path: str, material_mjcf: mjcf.Element) -> None:
         self._texture_store.add(path, material_mjcf)
 
+    def get_texture_max_resolution(self, mapping: TextureMapping) -> Optional[int]:
+        if isinstance(self._texture_max_resolution, dict):
+            return self._texture_max_resolution.get(mapping, None)
+        return self._texture_max_resolution
+
+    def prefetch(
+        self, paths: list[str], mapping: Optional[TextureMapping] = None
+    ) -> None:
+        """Read texture or mesh files concurrently ahead of loading them.
+
+        Subsequent `set_texture` and `set_mesh` calls with the same paths read the
+        contents from memory. At most the last 256 prefetched files are kept.
+
+        :param paths: Paths of texture or mesh files.
+        :param mapping: If the paths are textures, the mapping they will be loaded
+        with. Textures are then also preprocessed concurrently if their resolution
+        is capped.
+        """
+        max_resolution = None
+        if mapping is not None:
+            max_resolution = self.get_texture_max_resolution(mapping)
+        read_paths = paths
+        if max_resolution is not None:
+            with ThreadPoolExecutor(self._prefetch_workers) as executor:
+                read_paths = list(
+                    executor.map(lambda p: preprocess_texture(p, max_resolution), paths)
+                )
+        contents = read_files(dict(zip(paths, read_paths)), self._prefetch_workers)
+        for path, read_path in zip(paths, read_paths):
+            if path not in contents:
+                continue
+            key = (path, max_resolution)
+            self._prefetched.pop(key, None)
+            # Named after the file that was read, so the format is detected
+            self._prefetched[key] = mjcf.Asset(
+                contents[path], Path(read_path).suffix, Path(read_path).stem
+            )
+            if len(self._prefetched) > _PREFETCH_CAPACITY:
+                warnings.warn(
+                    f"More than {_PREFETCH_CAPACITY} files have been prefetched. "
+                    f"Dropping the oldest file.",
+                    UserWarning,
+                )
+                self._prefetched.popitem(last=False)
+
+    def get_prefetched(
+        self, path: str, max_resolution: Optional[int] = None
+    ) -> Optional[mjcf.Asset]:
+        """Get the prefetched contents of a file.
+
+        :param path: Path of the file.
+        :param max_resolution: The resolution cap the texture was prefetched with.
+        :return: The contents, or None if the file has not been prefetched.
+        """
+        asset = self._prefetched.get((path, max_resolution), None)
+        if asset is not None:
+            self._prefetched.move_to_end((path, max_resolution))
+        return asset
+
+    def get_height_field_data(self, hfield_mjcf: mjcf.Element) -> Optional[np.ndarray]:
+        source, heights = self._height_fields.get(id(hfield_mjcf), (None, None))
+        return heights if source is hfield_mjcf else None
+
+    def store_height_field_data(
+        self, hfield_mjcf: mjcf.Element, heights: np.ndarray
+    ) -> None:
+        """Keep the heights of a height field across recompiles.
+
+        The compiler rescales elevation data to span [0, 1], so stored heights
+        are written back to the compiled model instead.
+        """
+        self._height_fields[id(hfield_mjcf)] = (hfield_mjcf, heights)
+
+    def _flush_height_fields(self):
+        # Keep the MJCF close to the simulated terrain before it is serialized
+        for hfield_mjcf, heights in self._height_fields.values():
+            elevation = np.flipud(heights / hfield_mjcf.size[2])
+            # Fields loaded from image files are replaced by their heights
+            hfield_mjcf.file = None
+            hfield_mjcf.nrow, hfield_mjcf.ncol = heights.shape
+            hfield_mjcf.elevation = elevation.ravel()
+
+    def _restore_height_fields(self, physics: mjcf.Physics):
+        model = physics.model.ptr
+        for hfield_mjcf, heights in self._height_fields.values():
+            adr = int(physics.bind(hfield_mjcf).adr)
+            data = model.hfield_data[adr : adr + heights.size]
+            data[:] = heights.ravel() / hfield_mjcf.size[2]
+
+    def store_connect_anchor(
+        self, connect_mjcf: mjcf.Element, anchor: np.ndarray
+    ) -> None:
+        """Keep the anchor of a connect constraint on body2 across recompiles.
+
+        MJCF has no attribute for it, the compiler derives it from the reference
+        pose of the model, so stored anchors are written back to the compiled
+        model instead.
+        """
+        self._connect_anchors[id(connect_mjcf)] = (connect_mjcf, np.array(anchor))
+
+    def _restore_connect_anchors(self, physics: mjcf.Physics):
+        model = physics.model.ptr
+        for connect_mjcf, anchor in self._connect_anchors.values():
+            model.eq_data[int(physics.bind(connect_mjcf).element_id), 3:6] = anchor
+
+    def upload_height_field(self, hfield_id: int) -> None:
+        """Upload an edited height field to the viewer and rendering contexts."""
+        if self._passive_viewer_handle is not None:
+            self._passive_viewer_handle.update_hfield(hfield_id)
+        # Only existing contexts are updated, creating them requires a display
+        contexts = getattr(self._physics, "_contexts", None)
+        if contexts is not None:
+            with contexts.gl.make_current() as ctx:
+                ctx.call(
+                    mujoco.mjr_uploadHField,
+                    self.model,
+                    contexts.mujoco.ptr,
+                    hfield_id,
+                )
+
     def get_mesh(self, path: str) -> Optional[mjcf.Element]:
         return self._mesh_store.get(path)
 
     def store_mesh(self, path: str, mesh_mjcf: mjcf.Element) -> None:
         self._mesh_store.add(path, mesh_mjcf)
 
+    def get_proxy_mesh(self, key: str) -> Optional[mjcf.Element]:
+        return self._proxy_mesh_store.get(key)
+
+    def store_proxy_mesh(self, key: str, mesh_mjcf: mjcf.Element) -> None:
+        self._proxy_mesh_store.add(key, mesh_mjcf)
+
+    def pop_collision_proxies(self, geom_mjcf: mjcf.Element) -> list[mjcf.Element]:
+        """Forget the collision proxies of a geom.
+
+        :return: The proxy geoms that were added for the geom.
+        """
+        source, proxies = self._collision_proxies.pop(id(geom_mjcf), (None, []))
+        return proxies if source is geom_mjcf else []
+
+    def store_collision_proxies(
+        self, geom_mjcf: mjcf.Element, proxies: list[mjcf.Element]
+    ) -> None:
+        self._collision_proxies[id(geom_mjcf)] = (geom_mjcf, proxies)
+
     def load_model(
         self,
         path: str,
@@ -122,9 +1042,10 @@ class Mojo:
         :return: A Body element representing the attached model.
         """
 
-        model_mjcf = mjcf.from_path(path)
+        model_mjcf = load_mjcf(path, self._prefetch_workers)
         if on_loaded is not None:
             on_loaded(model_mjcf)
+        self.prepare_edit()
         attach_site = self.root_element.mjcf if parent is None else parent.mjcf
         attached_model_mjcf = attach_site.attach(model_mjcf)
         if handle_freejoints:
@@ -145,11 +1066,96 @@ class Mojo:
         ambient = np.array([0.1, 0.1, 0.1]) if ambient is None else ambient
         diffuse = np.array([0.4, 0.4, 0.4]) if diffuse is None else diffuse
         specular = np.array([0.5, 0.5, 0.5]) if specular is None else specular
+        self.prepare_edit()
         self.root_element.mjcf.visual.headlight.ambient = ambient
         self.root_element.mjcf.visual.headlight.diffuse = diffuse
         self.root_element.mjcf.visual.headlight.specular = specular
         self.root_element.mjcf.visual.headlight.active = active
         self.mark_dirty()
 
+    def save_bundle(self, path: str) -> None:
+        """Save the scene into a single file that restores without compiling.
+
+        The bundle holds the compiled model, the MJCF with its asset bytes for
+        further editing and the current simulation state.
+
+        :param path: Output file path.
+        """
+        self._flush_height_fields()
+        bundle.save_scene(path, self.root_element.mjcf, self.model, self.data)
+
+    def serialize(self) -> SerializedScene:
+        """Serialize the scene, including edits made since the last compile."""
+        self._flush_height_fields()
+        model_mjcf = self.root_element.mjcf
+        return SerializedScene(
+            model_mjcf.to_xml_string(),
+            model_mjcf.get_assets(),
+            self._texture_store.capacity,
+            self._mesh_store.capacity,
+            self._texture_max_resolution,
+        )
+
+    @classmethod
+    def from_serialized(
+        cls,
+        scene: SerializedScene,
+        prefetch_workers: Optional[int] = None,
+        async_compile: bool = False,
+    ) -> "Mojo":
+        """Create a Mojo instance from a scene returned by `serialize`.
+
+        See `__init__` for the other parameters.
+
+        :param scene: The serialized scene.
+        :return: A new Mojo instance.
+        """
+        mojo = cls.__new__(cls)
+        mojo._prefetch_workers = prefetch_workers
+        mojo._setup(
+            mjcf.from_xml_string(
+                scene.xml, escape_separators=True, assets=scene.assets
+            ),
+            scene.texture_store_capacity,
+            scene.mesh_store_capacity,
+            scene.texture_max_resolution,
+            async_compile,
+        )
+        return mojo
+
+    @classmethod
+    def load_bundle(
+        cls,
+        path: str,
+        texture_store_capacity: int = AssetStore.DEFAULT_CAPACITY,
+        mesh_store_capacity: int = AssetStore.DEFAULT_CAPACITY,
+        texture_max_resolution: Union[int, dict[TextureMapping, int], None] = None,
+        prefetch_workers: Optional[int] = None,
+        async_compile: bool = False,
+    ) -> "Mojo":
+        """Restore a scene saved with `save_bundle`.
+
+        The physics is loaded from the compiled model, so nothing is compiled
+        until the scene is edited. See `__init__` for the other parameters.
+
+        :param path: Path to the bundle.
+        :return: A new Mojo instance in the saved state.
+        """
+        model_mjcf, physics, state = bundle.load_scene(path)
+        physics = _Physics(physics.data)
+        mojo = cls.__new__(cls)
+        mojo._prefetch_workers = prefetch_workers
+        mojo._setup(
+            model_mjcf,
+            texture_store_capacity,
+            mesh_store_capacity,
+            texture_max_resolution,
+            async_compile,
+        )
+        mojo._set_physics(physics)
+        bundle.set_state(mojo.model, mojo.data, state)
+        mujoco.mj_forward(mojo.model, mojo.data)
+        return mojo
+
     def __str__(self):
         return self.root_element.mjcf.to_xml_string()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Optional
+
+import mujoco
+import numpy as np
+
+from mojo.elements.element import MujocoElement, _find_freejoint
+from mojo.elements.sensor import Sensor
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+# Flat views of the arrays an observation can gather from.
+_SOURCES: dict[str, Callable[[mujoco.MjModel, mujoco.MjData], np.ndarray]] = {
+    "qpos": lambda model, data: data.qpos,
+    "qvel": lambda model, data: data.qvel,
+    "xpos": lambda model, data: data.xpos.ravel(),
+    "xquat": lambda model, data: data.xquat.ravel(),
+    "geom_xpos": lambda model, data: data.geom_xpos.ravel(),
+    "site_xpos": lambda model, data: data.site_xpos.ravel(),
+    "cam_xpos": lambda model, data: data.cam_xpos.ravel(),
+    "light_xpos": lambda model, data: data.light_xpos.ravel(),
+    "geom_xmat": lambda model, data: data.geom_xmat.ravel(),
+    "site_xmat": lambda model, data: data.site_xmat.ravel(),
+    "cam_xmat": lambda model, data: data.cam_xmat.ravel(),
+    "geom_rgba": lambda model, data: model.geom_rgba.ravel(),
+    "site_rgba": lambda model, data: model.site_rgba.ravel(),
+    "sensordata": lambda model, data: data.sensordata,
+}
+_POSITION_SOURCES = {
+    "body": "xpos",
+    "geom": "geom_xpos",
+    "site": "site_xpos",
+    "camera": "cam_xpos",
+    "light": "light_xpos",
+}
+# Orientations of elements without xquat are gathered as rotation matrices
+_ROTATION_SOURCES = {"geom": "geom_xmat", "site": "site_xmat", "camera": "cam_xmat"}
+_COLOR_SOURCES = {"geom": "geom_rgba", "site": "site_rgba"}
+# Largest quaternion component, the signs of the matrix diagonal it is solved
+# from and the (component, i, j, sign) terms m[i] + sign * m[j] of the others
+_MAT2QUAT_BRANCHES = (
+    (0, (1, 1, 1), ((1, 7, 5, -1), (2, 2, 6, -1), (3, 3, 1, -1))),
+    (1, (1, -1, -1), ((0, 7, 5, -1), (2, 1, 3, 1), (3, 2, 6, 1))),
+    (2, (-1, 1, -1), ((0, 2, 6, -1), (1, 1, 3, 1), (3, 5, 7, 1))),
+    (3, (-1, -1, 1), ((0, 3, 1, -1), (1, 2, 6, 1), (2, 5, 7, 1))),
+)
+_JOINT_QPOS_SIZE = {
+    mujoco.mjtJoint.mjJNT_FREE: 7,
+    mujoco.mjtJoint.mjJNT_BALL: 4,
+    mujoco.mjtJoint.mjJNT_SLIDE: 1,
+    mujoco.mjtJoint.mjJNT_HINGE: 1,
+}
+_JOINT_QVEL_SIZE = {
+    mujoco.mjtJoint.mjJNT_FREE: 6,
+    mujoco.mjtJoint.mjJNT_BALL: 3,
+    mujoco.mjtJoint.mjJNT_SLIDE: 1,
+    mujoco.mjtJoint.mjJNT_HINGE: 1,
+}
+
+
+class Quantity(Enum):
+    POSITION = "position"
+    QUATERNION = "quaternion"
+    JOINT_POSITION = "joint_position"
+    JOINT_VELOCITY = "joint_velocity"
+    COLOR = "color"
+    SENSOR = "sensor"
+
+
+def _rows(element_id: int, width: int) -> np.ndarray:
+    return np.arange(element_id * width, (element_id + 1) * width)
+
+
+def _matrices_to_quaternions(values: np.ndarray) -> np.ndarray:
+    """Convert flat rotation matrices to flat quaternions like `mju_mat2Quat`."""
+    m = values.reshape(-1, 9)
+    diagonal = m[:, [0, 4, 8]]
+    is_w = diagonal.sum(axis=-1) > 0
+    is_x = ~is_w & (m[:, 0] > m[:, 4]) & (m[:, 0] > m[:, 8])
+    is_y = ~is_w & ~is_x & (m[:, 4] > m[:, 8])
+    is_z = ~(is_w | is_x | is_y)
+    quaternions = np.empty((len(m), 4))
+    # Solve for the largest component, then the others from off-diagonal terms
+    for rows, (component, signs, others) in zip(
+        (is_w, is_x, is_y, is_z), _MAT2QUAT_BRANCHES
+    ):
+        rows_m = m[rows]
+        largest = 0.5 * np.sqrt(1 + diagonal[rows] @ signs)
+        quaternions[rows, component] = largest
+        for other, i, j, sign in others:
+            quaternions[rows, other] = 0.25 * (rows_m[:, i] + sign * rows_m[:, j])
+            quaternions[rows, other] /= largest
+    quaternions /= np.linalg.norm(quaternions, axis=-1, keepdims=True)
+    return quaternions.ravel()
+
+
+class ObservationSpec:
+    """Declarative list of (element, quantity) pairs gathered into one array.
+
+    The spec is compiled once per model generation into flat index arrays over
+    the simulation arrays, so filling an observation costs one `np.take` per
+    source array rather than one call per element.
+    """
+
+    def __init__(self, mojo: Mojo, dtype: np.dtype = np.float64):
+        self._mojo = mojo
+        self._dtype = np.dtype(dtype)
+        self._entries: list[tuple[str, MujocoElement, Quantity]] = []
+        self._generation = -1
+        self._plan: list[tuple[str, np.ndarray, np.ndarray, np.ndarray]] = []
+        self._slices: dict[str, slice] = {}
+        self._buffer: Optional[np.ndarray] = None
+
+    def add(
+        self, element: MujocoElement, quantity: Quantity, name: str = None
+    ) -> ObservationSpec:
+        """Add an observed quantity.
+
+        :param element: The element to observe.
+        :param quantity: The quantity of the element to observe.
+        :param name: Optional key for `slices`.
+        Defaults to '<full identifier>/<quantity>'.
+        :return: The spec, to allow chaining.
+        """
+        name = f"{element.mjcf.full_identifier}/{quantity.value}" if not name else name
+        if any(name == entry[0] for entry in self._entries):
+            raise ValueError(f"Observation '{name}' has already been added.")
+        self._entries.append((name, element, quantity))
+        self._generation = -1
+        return self
+
+    @property
+    def size(self) -> int:
+        self._compile()
+        return len(self._buffer)
+
+    @property
+    def slices(self) -> dict[str, slice]:
+        """Slice of every observed quantity within the observation array."""
+        self._compile()
+        return dict(self._slices)
+
+    def _resolve(self, element: MujocoElement, quantity: Quantity):
+        physics = self._mojo.physics
+        mjcf_elem = element.mjcf
+        tag = mjcf_elem.tag
+        if quantity == Quantity.POSITION:
+            if freejoint := _find_freejoint(mjcf_elem):
+                adr = int(physics.bind(freejoint).qposadr)
+                return "qpos", np.arange(adr, adr + 3)
+            if tag in _POSITION_SOURCES:
+                element_id = int(physics.bind(mjcf_elem).element_id)
+                return _POSITION_SOURCES[tag], _rows(element_id, 3)
+        elif quantity == Quantity.QUATERNION:
+            if tag == "body":
+                element_id = int(physics.bind(mjcf_elem).element_id)
+                return "xquat", _rows(element_id, 4)
+            if tag in _ROTATION_SOURCES:
+                element_id = int(physics.bind(mjcf_elem).element_id)
+                return _ROTATION_SOURCES[tag], _rows(element_id, 9)
+        elif quantity in (Quantity.JOINT_POSITION, Quantity.JOINT_VELOCITY):
+            if tag in ("joint", "freejoint"):
+                binded = physics.bind(mjcf_elem)
+                joint_type = mujoco.mjtJoint(
+                    self._mojo.model.jnt_type[int(binded.element_id)]
+                )
+                if quantity == Quantity.JOINT_POSITION:
+                    adr = int(binded.qposadr)
+                    return "qpos", np.arange(adr, adr + _JOINT_QPOS_SIZE[joint_type])
+                adr = int(binded.dofadr)
+                return "qvel", np.arange(adr, adr + _JOINT_QVEL_SIZE[joint_type])
+        elif quantity == Quantity.COLOR:
+            if tag in _COLOR_SOURCES:
+                element_id = int(physics.bind(mjcf_elem).element_id)
+                return _COLOR_SOURCES[tag], _rows(element_id, 4)
+        elif quantity == Quantity.SENSOR:
+            if isinstance(element, Sensor):
+                binded = physics.bind(mjcf_elem)
+                adr = int(binded.adr)
+                return "sensordata", np.arange(adr, adr + int(binded.dim))
+        raise ValueError(
+            f"Quantity {quantity.value} is not supported for element of type {tag}."
+        )
+
+    def _compile(self):
+        _ = self._mojo.physics
+        if self._generation == self._mojo.generation:
+            return
+        sources: dict[str, tuple[list[np.ndarray], list[np.ndarray]]] = {}
+        self._slices = {}
+        offset = 0
+        for name, element, quantity in self._entries:
+            source, indices = self._resolve(element, quantity)
+            src_indices, dst_indices = sources.setdefault(source, ([], []))
+            src_indices.append(indices)
+            # Rotation matrices are observed as quaternions
+            size = 4 if source in _ROTATION_SOURCES.values() else len(indices)
+            dst_indices.append(np.arange(offset, offset + size))
+            self._slices[name] = slice(offset, offset + size)
+            offset += size
+        model, data = self._mojo.model, self._mojo.data
+        self._plan = []
+        for source, (src_indices, dst_indices) in sources.items():
+            src = np.concatenate(src_indices)
+            scratch = np.zeros(len(src), dtype=_SOURCES[source](model, data).dtype)
+            self._plan.append((source, src, np.concatenate(dst_indices), scratch))
+        self._buffer = np.zeros(offset, dtype=self._dtype)
+        self._generation = self._mojo.generation
+
+    def observe(self, out: np.ndarray = None) -> np.ndarray:
+        """Fill the observation array.
+
+        :param out: Optional array to write into. If None, an internal buffer is
+        reused between calls, so copy the result if it must outlive the step.
+        :return: The observation array.
+        """
+        self._compile()
+        out = self._buffer if out is None else out
+        model, data = self._mojo.model, self._mojo.data
+        for source, src, dst, scratch in self._plan:
+            np.take(_SOURCES[source](model, data), src, out=scratch)
+            if source in _ROTATION_SOURCES.values():
+                out[dst] = _matrices_to_quaternions(scratch)
+            else:
+                out[dst] = scratch
+        return out
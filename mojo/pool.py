@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from mojo.elements.body import Body
+from mojo.elements.consts import GeomType
+from mojo.elements.geom import Geom
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+_DEFAULT_PARKING_POSITION = np.array([0, 0, -100])
+_HIDDEN_COLOR = np.array([1, 1, 1, 0])
+
+
+class BodyPool:
+    """Preallocated free bodies that can be spawned without recompiling.
+
+    All bodies are added to the MJCF once, parked out of view with collisions
+    disabled and gravity compensated. Spawning and despawning only write to the
+    compiled model and data arrays (mirrored to the MJCF so that the state
+    survives a recompile).
+    """
+
+    def __init__(
+        self,
+        mojo: Mojo,
+        capacity: int,
+        geom_type: GeomType = GeomType.BOX,
+        size: np.ndarray = None,
+        density: float = 1000,
+        parking_position: np.ndarray = None,
+    ):
+        """Preallocate pooled bodies.
+
+        :param mojo: The Mojo instance to allocate bodies in.
+        :param capacity: Number of bodies to preallocate.
+        :param geom_type: The shape of every pooled body.
+        :param size: The geom size of every pooled body.
+        :param density: The geom density of every pooled body.
+        :param parking_position: Where despawned bodies are kept.
+        """
+        self._mojo = mojo
+        self._parking_position = (
+            _DEFAULT_PARKING_POSITION
+            if parking_position is None
+            else np.array(parking_position)
+        )
+        self._bodies: list[Body] = []
+        self._geoms: list[Geom] = []
+        mojo.prepare_edit()
+        for _ in range(capacity):
+            body = Body.create(mojo, position=self._parking_position)
+            body.mjcf.add("freejoint")
+            body.mjcf.gravcomp = 1
+            geom = Geom.create(
+                mojo,
+                parent=body,
+                size=size,
+                color=_HIDDEN_COLOR,
+                geom_type=geom_type,
+                density=density,
+            )
+            geom.mjcf.contype = 0
+            geom.mjcf.conaffinity = 0
+            self._bodies.append(body)
+            self._geoms.append(geom)
+        self._slots = {id(body): i for i, body in enumerate(self._bodies)}
+        # Spawn the lowest index first
+        self._free = list(reversed(range(capacity)))
+        self._generation = -1
+        self._body_ids = None
+        self._geom_ids = None
+        self._qpos_adr = None
+        self._dof_adr = None
+
+    @property
+    def capacity(self) -> int:
+        return len(self._bodies)
+
+    @property
+    def num_available(self) -> int:
+        return len(self._free)
+
+    @property
+    def active(self) -> list[Body]:
+        free = set(self._free)
+        return [b for i, b in enumerate(self._bodies) if i not in free]
+
+    def _update_indices(self):
+        physics = self._mojo.physics
+        if self._generation == self._mojo.generation:
+            return
+        freejoints = [b.mjcf.freejoint for b in self._bodies]
+        self._body_ids = physics.bind([b.mjcf for b in self._bodies]).element_id
+        self._geom_ids = physics.bind([g.mjcf for g in self._geoms]).element_id
+        self._qpos_adr = physics.bind(freejoints).qposadr
+        self._dof_adr = physics.bind(freejoints).dofadr
+        self._generation = self._mojo.generation
+
+    def _write_pose(self, slot: int, position: np.ndarray, quaternion: np.ndarray):
+        data = self._mojo.data
+        qpos_adr = self._qpos_adr[slot]
+        dof_adr = self._dof_adr[slot]
+        data.qpos[qpos_adr : qpos_adr + 3] = position
+        data.qpos[qpos_adr + 3 : qpos_adr + 7] = quaternion
+        data.qvel[dof_adr : dof_adr + 6] = 0
+        self._mojo.mirror_to_mjcf(
+            self._bodies[slot].mjcf, pos=position, quat=quaternion
+        )
+
+    def spawn(
+        self,
+        position: np.ndarray,
+        quaternion: np.ndarray = None,
+        color: np.ndarray = None,
+        contype: int = 1,
+        conaffinity: int = 1,
+        mass: float = None,
+    ) -> Body:
+        """Activate a pooled body in place.
+
+        :param position: World position of the spawned body.
+        :param quaternion: World orientation (wxyz) of the spawned body.
+        :param color: RGBA color of the spawned body.
+        :param contype: Collision type bitmask of the spawned body.
+        :param conaffinity: Collision affinity bitmask of the spawned body.
+        :param mass: Optional mass override; the inertia is rescaled to match.
+        :return: The spawned body.
+        """
+        if len(self._free) == 0:
+            raise RuntimeError(f"All {self.capacity} pooled bodies are in use.")
+        position = np.array(position)
+        quaternion = np.array([1, 0, 0, 0]) if quaternion is None else quaternion
+        color = np.array([1, 1, 1, 1]) if color is None else np.array(color)
+        if len(color) == 3:
+            color = np.concatenate([color, [1]])  # add alpha
+        self._update_indices()
+        slot = self._free.pop()
+        model = self._mojo.model
+        body_id = self._body_ids[slot]
+        geom_id = self._geom_ids[slot]
+        model.body_gravcomp[body_id] = 0
+        model.geom_contype[geom_id] = contype
+        model.geom_conaffinity[geom_id] = conaffinity
+        model.geom_rgba[geom_id] = color
+        if mass is not None:
+            model.body_inertia[body_id] *= mass / model.body_mass[body_id]
+            model.body_mass[body_id] = mass
+            self._mojo.mirror_to_mjcf(self._geoms[slot].mjcf, mass=mass)
+        self._write_pose(slot, position, np.array(quaternion))
+        self._mojo.mirror_to_mjcf(self._bodies[slot].mjcf, gravcomp=0)
+        self._mojo.mirror_to_mjcf(
+            self._geoms[slot].mjcf,
+            contype=contype,
+            conaffinity=conaffinity,
+            rgba=color,
+        )
+        return self._bodies[slot]
+
+    def despawn(self, body: Body):
+        """Park a spawned body again.
+
+        :param body: A body previously returned by `spawn`.
+        """
+        slot: Optional[int] = self._slots.get(id(body))
+        if slot is None:
+            raise ValueError("Body does not belong to this pool.")
+        if slot in self._free:
+            raise ValueError("Body has already been despawned.")
+        self._update_indices()
+        model = self._mojo.model
+        body_id = self._body_ids[slot]
+        geom_id = self._geom_ids[slot]
+        model.body_gravcomp[body_id] = 1
+        model.geom_contype[geom_id] = 0
+        model.geom_conaffinity[geom_id] = 0
+        model.geom_rgba[geom_id] = _HIDDEN_COLOR
+        self._write_pose(slot, self._parking_position, np.array([1, 0, 0, 0]))
+        self._mojo.mirror_to_mjcf(self._bodies[slot].mjcf, gravcomp=1)
+        self._mojo.mirror_to_mjcf(
+            self._geoms[slot].mjcf, contype=0, conaffinity=0, rgba=_HIDDEN_COLOR
+        )
+        self._free.append(slot)
+
+    def despawn_all(self):
+        for body in self.active:
+            self.despawn(body)
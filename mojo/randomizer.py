@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+import mujoco
+import numpy as np
+
+from mojo.elements.body import Body
+from mojo.elements.camera import Camera
+from mojo.elements.element import MujocoElement
+from mojo.elements.geom import Geom
+from mojo.elements.joint import Joint
+from mojo.elements.light import Light
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+
+class RandomizedField(Enum):
+    COLOR = "geom_rgba"
+    FRICTION = "geom_friction"
+    MASS = "body_mass"
+    DAMPING = "dof_damping"
+    LIGHT_AMBIENT = "light_ambient"
+    LIGHT_DIFFUSE = "light_diffuse"
+    LIGHT_SPECULAR = "light_specular"
+    CAMERA_FOVY = "cam_fovy"
+
+
+class Distribution(ABC):
+    @abstractmethod
+    def sample(self, rng: np.random.Generator, shape: tuple[int, ...]) -> np.ndarray:
+        pass
+
+
+class Uniform(Distribution):
+    def __init__(self, low: Union[float, np.ndarray], high: Union[float, np.ndarray]):
+        self.low = np.asarray(low)
+        self.high = np.asarray(high)
+
+    def sample(self, rng: np.random.Generator, shape: tuple[int, ...]) -> np.ndarray:
+        return rng.uniform(self.low, self.high, shape)
+
+
+class Normal(Distribution):
+    def __init__(self, mean: Union[float, np.ndarray], std: Union[float, np.ndarray]):
+        self.mean = np.asarray(mean)
+        self.std = np.asarray(std)
+
+    def sample(self, rng: np.random.Generator, shape: tuple[int, ...]) -> np.ndarray:
+        return rng.normal(self.mean, self.std, shape)
+
+
+@dataclass
+class _Term:
+    elements: list[MujocoElement]
+    field: RandomizedField
+    distribution: Distribution
+    relative: bool
+    rows: Optional[np.ndarray] = None
+    defaults: Optional[np.ndarray] = None
+    default_inertia: Optional[np.ndarray] = None
+
+
+def _geom_elements(element: MujocoElement) -> list[MujocoElement]:
+    if isinstance(element, Body):
+        return element.geoms
+    if isinstance(element, Geom):
+        return [element]
+    raise ValueError(f"Expected a geom or body, got {type(element).__name__}.")
+
+
+def _body_elements(element: MujocoElement) -> list[MujocoElement]:
+    if isinstance(element, Body):
+        return [element]
+    if isinstance(element, Geom):
+        return [element.parent]
+    raise ValueError(f"Expected a geom or body, got {type(element).__name__}.")
+
+
+def _typed_elements(element: MujocoElement, element_type: type) -> list:
+    if not isinstance(element, element_type):
+        raise ValueError(
+            f"Expected a {element_type.__name__}, got {type(element).__name__}."
+        )
+    return [element]
+
+
+class Randomizer:
+    """Vectorized domain randomization on compiled model arrays.
+
+    Element sets are resolved once per model generation to index arrays into
+    the model fields, so applying a sampled batch costs one indexed write per
+    randomized term.
+    """
+
+    def __init__(self, mojo: Mojo, seed: Optional[int] = None):
+        self._mojo = mojo
+        self._rng = np.random.default_rng(seed)
+        self._terms: list[_Term] = []
+        self._generation = -1
+
+    def add(
+        self,
+        elements: Sequence[MujocoElement],
+        field: RandomizedField,
+        distribution: Distribution,
+        relative: bool = False,
+    ) -> Randomizer:
+        """Randomize a field of a set of elements.
+
+        :param elements: The elements to randomize. Bodies expand to their geoms
+        for geom fields and to their joints for damping.
+        :param field: The model field to randomize.
+        :param distribution: The distribution values are drawn from.
+        :param relative: If true, samples scale the default values instead of
+        replacing them.
+        :return: The randomizer, to allow chaining.
+        """
+        self._terms.append(_Term(list(elements), field, distribution, relative))
+        return self
+
+    def _rows(self, term: _Term) -> np.ndarray:
+        physics = self._mojo.physics
+        model = self._mojo.model
+        if term.field in (RandomizedField.COLOR, RandomizedField.FRICTION):
+            elements = [g for e in term.elements for g in _geom_elements(e)]
+        elif term.field == RandomizedField.MASS:
+            elements = [b for e in term.elements for b in _body_elements(e)]
+        elif term.field == RandomizedField.DAMPING:
+            joints = [
+                j
+                for e in term.elements
+                for j in (
+                    e.joints if isinstance(e, Body) else _typed_elements(e, Joint)
+                )
+            ]
+            rows = []
+            for joint in joints:
+                binded = physics.bind(joint.mjcf)
+                rows.extend(
+                    np.flatnonzero(model.dof_jntid == int(binded.element_id)).tolist()
+                )
+            return np.array(rows, dtype=np.int64)
+        elif term.field == RandomizedField.CAMERA_FOVY:
+            elements = [c for e in term.elements for c in _typed_elements(e, Camera)]
+        else:
+            elements = [li for e in term.elements for li in _typed_elements(e, Light)]
+        if len(elements) == 0:
+            return np.zeros(0, dtype=np.int64)
+        ids = physics.bind([e.mjcf for e in elements]).element_id
+        return np.atleast_1d(ids).astype(np.int64)
+
+    def _resolve(self):
+        _ = self._mojo.physics
+        if self._generation != self._mojo.generation:
+            # A fresh compile holds the defaults of every term again
+            for term in self._terms:
+                term.defaults = None
+            self._generation = self._mojo.generation
+        for term in self._terms:
+            if term.defaults is None:
+                self._capture_defaults(term)
+
+    def _capture_defaults(self, term: _Term):
+        model = self._mojo.model
+        term.rows = self._rows(term)
+        term.defaults = getattr(model, term.field.value)[term.rows].copy()
+        if term.field == RandomizedField.MASS:
+            term.default_inertia = model.body_inertia[term.rows].copy()
+        # Rows may already be randomized by earlier terms of the same field
+        for other in self._terms:
+            if other is term or other.defaults is None or other.field != term.field:
+                continue
+            _, rows, other_rows = np.intersect1d(
+                term.rows, other.rows, return_indices=True
+            )
+            term.defaults[rows] = other.defaults[other_rows]
+            if term.field == RandomizedField.MASS:
+                term.default_inertia[rows] = other.default_inertia[other_rows]
+
+    def sample(self, num_worlds: Optional[int] = None) -> list[np.ndarray]:
+        """Draw values for every randomized term.
+
+        :param num_worlds: If set, draw an independent batch for every world.
+        :return: One array per term, shaped like the randomized model rows, with
+        a leading world dimension if `num_worlds` is set.
+        """
+        self._resolve()
+        batch = () if num_worlds is None else (num_worlds,)
+        return [
+            term.distribution.sample(self._rng, batch + term.defaults.shape)
+            for term in self._terms
+        ]
+
+    def _write(self, model: mujoco.MjModel, values: list[np.ndarray]):
+        for term, value in zip(self._terms, values):
+            if term.relative:
+                value = term.defaults * value
+            getattr(model, term.field.value)[term.rows] = value
+            if term.field == RandomizedField.MASS:
+                # Keep the inertia consistent with the new mass
+                ratio = np.asarray(value) / np.maximum(term.defaults, mujoco.mjMINVAL)
+                model.body_inertia[term.rows] = term.default_inertia * ratio[:, None]
+
+    def apply(
+        self,
+        values: Optional[list[np.ndarray]] = None,
+        model: Optional[mujoco.MjModel] = None,
+    ) -> list[np.ndarray]:
+        """Apply randomized values.
+
+        :param values: Values as returned by `sample()`. Sampled if None.
+        :param model: The model to write to. Defaults to the Mojo model.
+        :return: The applied values.
+        """
+        self._resolve()
+        values = self.sample() if values is None else values
+        self._write(self._mojo.model if model is None else model, values)
+        return values
+
+    def apply_batch(
+        self,
+        models: Sequence[mujoco.MjModel],
+        values: Optional[list[np.ndarray]] = None,
+    ) -> list[np.ndarray]:
+        """Apply independently randomized values to the model of every world.
+
+        All models must be compiled from the same scene as the Mojo model.
+
+        :param models: One model per world.
+        :param values: Values as returned by `sample(len(models))`. Sampled if None.
+        :return: The applied values.
+        """
+        self._resolve()
+        values = self.sample(len(models)) if values is None else values
+        for i, model in enumerate(models):
+            self._write(model, [v[i] for v in values])
+        return values
+
+    def restore(self, model: Optional[mujoco.MjModel] = None):
+        """Restore the default values of every randomized field."""
+        self._resolve()
+        model = self._mojo.model if model is None else model
+        for term in self._terms:
+            getattr(model, term.field.value)[term.rows] = term.defaults
+            if term.field == RandomizedField.MASS:
+                model.body_inertia[term.rows] = term.default_inertia
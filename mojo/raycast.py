@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import mujoco
+import numpy as np
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+    from mojo.elements.body import Body
+    from mojo.elements.geom import Geom
+
+_NO_HIT = -1
+
+
+class RaycastResult:
+    """Distances and hit geom ids of a batch of rays.
+
+    Misses have a distance and geom id of -1. Geom and body handles are only
+    looked up when requested.
+    """
+
+    def __init__(self, mojo: Mojo, distances: np.ndarray, geom_ids: np.ndarray):
+        self._mojo = mojo
+        self.distances = distances
+        self.geom_ids = geom_ids
+
+    @property
+    def hit(self) -> np.ndarray:
+        return self.geom_ids != _NO_HIT
+
+    @property
+    def body_ids(self) -> np.ndarray:
+        """Ids of the hit bodies, -1 for misses."""
+        body_ids = self._mojo.model.geom_bodyid[self.geom_ids]
+        return np.where(self.hit, body_ids, _NO_HIT)
+
+    def get_geoms(self) -> list[Optional[Geom]]:
+        """Get the hit geom of every ray, None for misses."""
+        return [
+            None if i == _NO_HIT else self._mojo.get_geom(int(i))
+            for i in self.geom_ids.ravel()
+        ]
+
+    def get_bodies(self) -> list[Optional[Body]]:
+        """Get the hit body of every ray, None for misses."""
+        return [
+            None if i == _NO_HIT else self._mojo.get_body(int(i))
+            for i in self.body_ids.ravel()
+        ]
+
+
+class RayCaster:
+    """Casts a fixed pattern of rays with `mj_multiRay` into preallocated buffers.
+
+    Ray directions are given once in the frame of the origin, e.g. a site or
+    camera, and rotated into the world on every cast. Results are written into
+    buffers that are reused between casts, so copy them if they must outlive the
+    next cast.
+    """
+
+    def __init__(
+        self,
+        mojo: Mojo,
+        directions: np.ndarray,
+        max_dist: float = np.inf,
+        geomgroup: Sequence[bool] = None,
+        exclude_body: Body = None,
+        include_static: bool = True,
+    ):
+        """Create a ray caster.
+
+        :param mojo: The Mojo instance.
+        :param directions: Ray directions of shape (N, 3) in the origin frame.
+        They are normalized, so distances are in world units.
+        :param max_dist: Hits further than this are treated as misses.
+        :param geomgroup: Six flags selecting the geom groups rays can hit.
+        If None, all groups are included.
+        :param exclude_body: Optional body whose geoms are ignored, e.g. the body
+        the sensor is mounted on.
+        :param include_static: If false, geoms of static bodies are ignored.
+        """
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        self._mojo = mojo
+        self._directions = directions / np.linalg.norm(directions, axis=-1)[:, None]
+        self._max_dist = max_dist
+        self._geomgroup = (
+            None if geomgroup is None else np.asarray(geomgroup, dtype=np.uint8)
+        )
+        self._exclude_body = exclude_body
+        self._include_static = include_static
+        self._world_directions = np.zeros_like(self._directions)
+        self._buffers: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def num_rays(self) -> int:
+        return len(self._directions)
+
+    @property
+    def directions(self) -> np.ndarray:
+        return self._directions.copy()
+
+    def _buffer(self, num_origins: int) -> tuple[np.ndarray, np.ndarray]:
+        if num_origins not in self._buffers:
+            shape = (num_origins, self.num_rays)
+            self._buffers[num_origins] = (
+                np.zeros(shape, dtype=np.float64),
+                np.zeros(shape, dtype=np.int32),
+            )
+        return self._buffers[num_origins]
+
+    def _exclude_body_id(self) -> int:
+        if self._exclude_body is None:
+            return _NO_HIT
+        return int(self._exclude_body.id)
+
+    def cast_batch(
+        self, positions: np.ndarray, matrices: np.ndarray = None
+    ) -> RaycastResult:
+        """Cast the ray pattern from several origins.
+
+        :param positions: World positions of the origins, of shape (K, 3).
+        :param matrices: Rotation matrices of the origins, of shape (K, 3, 3) or
+        (K, 9). If None, the pattern is in world coordinates.
+        :return: Results of shape (K, N).
+        """
+        model, data = self._mojo.model, self._mojo.data
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        distances, geom_ids = self._buffer(len(positions))
+        cutoff = mujoco.mjMAXVAL if np.isinf(self._max_dist) else self._max_dist
+        bodyexclude = self._exclude_body_id()
+        for i, position in enumerate(positions):
+            if matrices is None:
+                self._world_directions[:] = self._directions
+            else:
+                matrix = np.reshape(matrices[i], (3, 3))
+                np.matmul(self._directions, matrix.T, out=self._world_directions)
+            mujoco.mj_multiRay(
+                model,
+                data,
+                position,
+                self._world_directions.ravel(),
+                self._geomgroup,
+                self._include_static,
+                bodyexclude,
+                geom_ids[i],
+                distances[i],
+                None,
+                self.num_rays,
+                cutoff,
+            )
+        # Geoms are culled by their bounding spheres, so clip exact distances too
+        missed = (geom_ids == _NO_HIT) | (distances > self._max_dist)
+        distances[missed] = _NO_HIT
+        geom_ids[missed] = _NO_HIT
+        return RaycastResult(self._mojo, distances, geom_ids)
+
+    def cast(self, position: np.ndarray, matrix: np.ndarray = None) -> RaycastResult:
+        """Cast the ray pattern from a single origin.
+
+        :param position: World position of the origin.
+        :param matrix: Rotation matrix of the origin. If None, the pattern is in
+        world coordinates.
+        :return: Results of shape (N,).
+        """
+        matrices = None if matrix is None else np.reshape(matrix, (1, 3, 3))
+        result = self.cast_batch(np.reshape(position, (1, 3)), matrices)
+        return RaycastResult(self._mojo, result.distances[0], result.geom_ids[0])
+
+    def cast_from(self, elements: Sequence) -> RaycastResult:
+        """Cast the ray pattern from the frames of sites or cameras.
+
+        :param elements: Sites or cameras, all of the same type. Camera frames look
+        along their -z axis.
+        :return: Results of shape (K, N).
+        """
+        physics = self._mojo.physics
+        binded = physics.bind([e.mjcf for e in elements])
+        positions = np.reshape(binded.xpos, (-1, 3))
+        matrices = np.reshape(binded.xmat, (-1, 3, 3))
+        return self.cast_batch(positions, matrices)
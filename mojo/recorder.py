@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+import numpy as np
+
+from mojo.elements.body import Body
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+_METADATA_FILE = "metadata.json"
+_BODY_POSITION_FIELD = "body_pos"
+_BODY_QUATERNION_FIELD = "body_quat"
+_COMPRESSED_KEY = "data"
+
+
+def _chunk_path(directory: Path, field: str, chunk: int, compressed: bool) -> Path:
+    return directory / f"{field}_{chunk:06d}.{'npz' if compressed else 'npy'}"
+
+
+class Recorder:
+    """Streams per-step simulation state into chunked, memory-mapped files.
+
+    Every field is written into a preallocated `.npy` chunk that is memory
+    mapped, so only the pages of the chunk being written are held in memory.
+    Finished chunks are optionally compressed.
+    """
+
+    DEFAULT_FIELDS = ("qpos", "qvel", "ctrl")
+    DEFAULT_CHUNK_SIZE = 1000
+
+    def __init__(
+        self,
+        mojo: Mojo,
+        directory: Union[str, Path],
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        bodies: Sequence[Body] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        compress: bool = False,
+        record_on_step: bool = True,
+    ):
+        """Create a recorder.
+
+        :param mojo: The Mojo instance to record.
+        :param directory: Output directory. Created if it does not exist.
+        :param fields: Names of MjData fields to record, e.g. 'qpos' or 'time'.
+        :param bodies: Bodies whose world poses are recorded as 'body_pos'
+        and 'body_quat'.
+        :param chunk_size: Number of steps per chunk file.
+        :param compress: If true, finished chunks are compressed.
+        :param record_on_step: If true, a frame is recorded after every step.
+        """
+        self._mojo = mojo
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._data_fields = list(fields)
+        self._bodies = list(bodies or [])
+        self._chunk_size = chunk_size
+        self._compress = compress
+        self._fields: dict[str, dict] = {}
+        self._chunks: list[dict] = []
+        self._memmaps: dict[str, np.memmap] = {}
+        self._row = 0
+        self._num_steps = 0
+        self._generation = -1
+        self._body_ids: Optional[np.ndarray] = None
+        self._record_on_step = record_on_step
+        if record_on_step:
+            mojo.add_step_callback(self.record)
+
+    @property
+    def num_steps(self) -> int:
+        return self._num_steps
+
+    def _sample(self) -> dict[str, np.ndarray]:
+        data = self._mojo.data
+        sample = {f: np.asarray(getattr(data, f)) for f in self._data_fields}
+        if self._bodies:
+            if self._generation != self._mojo.generation:
+                physics = self._mojo.physics
+                mjcf = [b.mjcf for b in self._bodies]
+                self._body_ids = np.atleast_1d(physics.bind(mjcf).element_id)
+                self._generation = self._mojo.generation
+            sample[_BODY_POSITION_FIELD] = data.xpos[self._body_ids]
+            sample[_BODY_QUATERNION_FIELD] = data.xquat[self._body_ids]
+        return sample
+
+    def record(self):
+        """Append the current state as a new frame."""
+        sample = self._sample()
+        if not self._fields:
+            self._fields = {
+                f: {"dtype": v.dtype.str, "shape": list(v.shape)}
+                for f, v in sample.items()
+            }
+        if self._row == 0:
+            self._open_chunk()
+        for field, value in sample.items():
+            if list(value.shape) != self._fields[field]["shape"]:
+                raise ValueError(
+                    f"Shape of field '{field}' changed from "
+                    f"{self._fields[field]['shape']} to {list(value.shape)}."
+                )
+            self._memmaps[field][self._row] = value
+        self._row += 1
+        self._num_steps += 1
+        if self._row == self._chunk_size:
+            self._close_chunk()
+
+    def _open_chunk(self):
+        chunk = len(self._chunks)
+        for field, spec in self._fields.items():
+            self._memmaps[field] = np.lib.format.open_memmap(
+                _chunk_path(self._directory, field, chunk, False),
+                mode="w+",
+                dtype=np.dtype(spec["dtype"]),
+                shape=(self._chunk_size, *spec["shape"]),
+            )
+
+    def _close_chunk(self):
+        chunk = len(self._chunks)
+        for field, memmap in self._memmaps.items():
+            memmap.flush()
+            if self._compress:
+                np.savez_compressed(
+                    _chunk_path(self._directory, field, chunk, True),
+                    **{_COMPRESSED_KEY: memmap[: self._row]},
+                )
+        self._memmaps = {}
+        if self._compress:
+            for field in self._fields:
+                os.remove(_chunk_path(self._directory, field, chunk, False))
+        self._chunks.append({"length": self._row, "compressed": self._compress})
+        self._row = 0
+        self._write_metadata()
+
+    def _write_metadata(self):
+        metadata = {
+            "fields": self._fields,
+            "chunk_size": self._chunk_size,
+            "chunks": self._chunks,
+            "num_steps": self._num_steps,
+        }
+        with open(self._directory / _METADATA_FILE, "w") as f:
+            json.dump(metadata, f)
+
+    def close(self):
+        """Finalize the last chunk and stop recording."""
+        if self._row > 0:
+            self._close_chunk()
+        else:
+            self._write_metadata()
+        if self._record_on_step:
+            self._mojo.remove_step_callback(self.record)
+            self._record_on_step = False
+
+    def __enter__(self) -> Recorder:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RecordedField:
+    """Lazily sliceable view of one recorded field across all chunks."""
+
+    def __init__(self, directory: Path, field: str, metadata: dict):
+        self._directory = directory
+        self._field = field
+        self._chunk_size = metadata["chunk_size"]
+        self._chunks = metadata["chunks"]
+        self._length = sum(c["length"] for c in self._chunks)
+        spec = metadata["fields"][field]
+        self._dtype = np.dtype(spec["dtype"])
+        self._shape = tuple(spec["shape"])
+        # Decompressed chunks are not memory mappable, so keep the last one.
+        self._cached_chunk: Optional[tuple[int, np.ndarray]] = None
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return (self._length, *self._shape)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _load_chunk(self, chunk: int) -> np.ndarray:
+        if self._chunks[chunk]["compressed"]:
+            if self._cached_chunk is None or self._cached_chunk[0] != chunk:
+                path = _chunk_path(self._directory, self._field, chunk, True)
+                with np.load(path) as npz:
+                    self._cached_chunk = (chunk, npz[_COMPRESSED_KEY])
+            return self._cached_chunk[1]
+        path = _chunk_path(self._directory, self._field, chunk, False)
+        return np.load(path, mmap_mode="r")
+
+    def __getitem__(self, index) -> np.ndarray:
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError(f"Index {index} out of range.")
+            chunk, row = divmod(int(index), self._chunk_size)
+            return np.array(self._load_chunk(chunk)[row])
+        indices = np.arange(self._length)[index]
+        out = np.empty((len(indices), *self._shape), dtype=self._dtype)
+        chunk_ids = indices // self._chunk_size
+        for chunk in np.unique(chunk_ids):
+            mask = chunk_ids == chunk
+            out[mask] = self._load_chunk(chunk)[indices[mask] % self._chunk_size]
+        return out
+
+
+class RecordingReader:
+    """Reads recordings written by `Recorder` without loading whole files."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self._directory = Path(directory)
+        with open(self._directory / _METADATA_FILE) as f:
+            self._metadata = json.load(f)
+        self._fields = {
+            field: RecordedField(self._directory, field, self._metadata)
+            for field in self._metadata["fields"]
+        }
+
+    @property
+    def fields(self) -> list[str]:
+        return list(self._fields.keys())
+
+    @property
+    def chunk_size(self) -> int:
+        return self._metadata["chunk_size"]
+
+    def __len__(self) -> int:
+        return self._metadata["num_steps"]
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._fields
+
+    def __getitem__(self, field: str) -> RecordedField:
+        return self._fields[field]
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import mujoco
+import numpy as np
+
+from mojo.mojo import Mojo
+
+# Header length and payload length of every frame
+_FRAME = struct.Struct("<IQ")
+_OBSERVED_FIELDS = ("qpos", "qvel", "ctrl", "sensordata")
+
+SceneFactory = Callable[..., Mojo]
+
+
+def encode_frame(header: dict, arrays: Optional[dict[str, np.ndarray]] = None) -> bytes:
+    """Encode a JSON header and raw array buffers into one length-prefixed frame."""
+    layout, buffers, offset = {}, [], 0
+    for name, array in (arrays or {}).items():
+        array = np.ascontiguousarray(array)
+        layout[name] = {
+            "dtype": array.dtype.str,
+            "shape": array.shape,
+            "offset": offset,
+        }
+        buffers.append(array.data)
+        offset += array.nbytes
+    header = json.dumps({**header, "arrays": layout}).encode()
+    return b"".join([_FRAME.pack(len(header), offset), header, *buffers])
+
+
+async def read_frame(
+    reader: asyncio.StreamReader,
+) -> tuple[dict, dict[str, np.ndarray]]:
+    """Read one frame written by `encode_frame`.
+
+    Arrays are read-only views of the received payload.
+    """
+    header_size, payload_size = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    header = json.loads(await reader.readexactly(header_size))
+    payload = await reader.readexactly(payload_size)
+    arrays = {}
+    for name, spec in header.pop("arrays").items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        array = np.frombuffer(payload, dtype, count, spec["offset"])
+        arrays[name] = array.reshape(spec["shape"])
+    return header, arrays
+
+
+class _Session:
+    def __init__(self, mojo: Mojo):
+        self.mojo = mojo
+        # Serializes batches of the same session across worker threads
+        self.lock = asyncio.Lock()
+
+    def observe(self) -> tuple[dict, dict[str, np.ndarray]]:
+        data = self.mojo.data
+        arrays = {field: getattr(data, field).copy() for field in _OBSERVED_FIELDS}
+        return {"time": data.time}, arrays
+
+    def step(self, arrays: dict[str, np.ndarray], num_steps: int):
+        if "ctrl" in arrays:
+            self.mojo.data.ctrl[:] = arrays["ctrl"]
+        for _ in range(num_steps):
+            self.mojo.step()
+        return self.observe()
+
+    def reset(self):
+        model, data = self.mojo.model, self.mojo.data
+        mujoco.mj_resetData(model, data)
+        mujoco.mj_forward(model, data)
+        return self.observe()
+
+
+class SimulationServer:
+    """Hosts many independent Mojo sessions in one process over asyncio.
+
+    Clients send length-prefixed frames holding a JSON header and raw NumPy
+    buffers, see `SimulationClient`. Requests that arrive in the same event loop
+    iteration are batched: the requests of every session run in order as one
+    job of a bounded thread pool, and different sessions run concurrently.
+    """
+
+    def __init__(
+        self,
+        scene_factory: SceneFactory,
+        max_workers: Optional[int] = None,
+        max_sessions: Optional[int] = None,
+    ):
+        """Create a server.
+
+        :param scene_factory: Builds the Mojo instance of a new session from the
+        options the client passes to `create`.
+        :param max_workers: Number of threads simulating sessions. Defaults to
+        the thread pool default.
+        :param max_sessions: Optional limit on the number of open sessions.
+        """
+        self._scene_factory = scene_factory
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._max_sessions = max_sessions
+        self._sessions: dict[int, _Session] = {}
+        self._session_ids = itertools.count()
+        self._num_creating = 0
+        self._pending: list[tuple[dict, dict, asyncio.Future]] = []
+        # The event loop only keeps weak references to running tasks
+        self._tasks: set[asyncio.Task] = set()
+        # Connection handlers and their writers, closed with the server
+        self._clients: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def num_sessions(self) -> int:
+        return len(self._sessions)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> tuple[str, int]:
+        """Start listening for clients.
+
+        :return: The host and port the server is listening on.
+        """
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """Stop listening, disconnect all clients and release all sessions."""
+        if self._server is not None:
+            self._server.close()
+        clients = list(self._clients)
+        for task, writer in self._clients.items():
+            writer.close()
+            task.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        self._sessions.clear()
+        self._executor.shutdown(wait=True)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        self._clients[asyncio.current_task()] = writer
+        responses = set()
+        # Sessions created by this client, closed when it disconnects
+        sessions: set[int] = set()
+        try:
+            while True:
+                header, arrays = await read_frame(reader)
+                # Requests are answered as they complete, so clients can pipeline
+                task = asyncio.create_task(
+                    self._respond(header, arrays, writer, sessions)
+                )
+                responses.add(task)
+                task.add_done_callback(responses.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            try:
+                await asyncio.gather(*responses, return_exceptions=True)
+            finally:
+                for session_id in sessions:
+                    self._sessions.pop(session_id, None)
+                writer.close()
+                self._clients.pop(asyncio.current_task(), None)
+
+    async def _respond(
+        self,
+        header: dict,
+        arrays: dict,
+        writer: asyncio.StreamWriter,
+        sessions: set[int],
+    ):
+        response = {"id": header.get("id")}
+        response_arrays = None
+        try:
+            op, session_id = header.get("op"), header.get("session")
+            # Clients may only use the sessions they created
+            if op != "create" and session_id not in sessions:
+                raise ValueError(f"Unknown session {session_id}.")
+            result, response_arrays = await self._submit(header, arrays)
+            response.update(result)
+            if op == "create":
+                sessions.add(result["session"])
+            elif op == "close":
+                sessions.discard(session_id)
+        except Exception as e:
+            response["error"] = f"{type(e).__name__}: {e}"
+        writer.write(encode_frame(response, response_arrays))
+        await writer.drain()
+
+    def _submit(self, header: dict, arrays: dict) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        if not self._pending:
+            asyncio.get_running_loop().call_soon(self._flush)
+        self._pending.append((header, arrays, future))
+        return future
+
+    def _flush(self):
+        pending, self._pending = self._pending, []
+        batches: dict[Optional[int], list] = {}
+        for request in pending:
+            header, _, future = request
+            if header.get("op") == "create":
+                self._start_task(self._create(header, future))
+                continue
+            batches.setdefault(header.get("session"), []).append(request)
+        for session_id, requests in batches.items():
+            self._start_task(self._run_batch(session_id, requests))
+
+    def _start_task(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _create(self, header: dict, future: asyncio.Future):
+        num_sessions = len(self._sessions) + self._num_creating
+        if self._max_sessions is not None and num_sessions >= self._max_sessions:
+            future.set_exception(RuntimeError("The session limit has been reached."))
+            return
+        # Sessions being built count towards the limit
+        self._num_creating += 1
+        try:
+            loop = asyncio.get_running_loop()
+            options = header.get("options", {})
+            mojo = await loop.run_in_executor(
+                self._executor, lambda: self._scene_factory(**options)
+            )
+            session_id = next(self._session_ids)
+            self._sessions[session_id] = _Session(mojo)
+            future.set_result(({"session": session_id}, None))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            self._num_creating -= 1
+
+    @staticmethod
+    def _reject(session_id: Optional[int], requests: list):
+        error = ValueError(f"Unknown session {session_id}.")
+        for _, _, future in requests:
+            future.set_exception(error)
+
+    async def _run_batch(self, session_id: Optional[int], requests: list):
+        session = self._sessions.get(session_id)
+        if session is None:
+            self._reject(session_id, requests)
+            return
+        async with session.lock:
+            # The session may have been closed while waiting for the lock
+            if self._sessions.get(session_id) is not session:
+                self._reject(session_id, requests)
+                return
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                self._executor, self._execute, session, requests
+            )
+            if any(header.get("op") == "close" for header, _, _ in requests):
+                self._sessions.pop(session_id, None)
+        for (_, _, future), result in zip(requests, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _execute(session: _Session, requests: list) -> list[Any]:
+        results = []
+        for header, arrays, _ in requests:
+            try:
+                results.append(SimulationServer._execute_one(session, header, arrays))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    @staticmethod
+    def _execute_one(session: _Session, header: dict, arrays: dict):
+        op = header.get("op")
+        if op == "step":
+            return session.step(arrays, int(header.get("num_steps", 1)))
+        if op == "reset":
+            return session.reset()
+        if op == "observe":
+            return session.observe()
+        if op == "close":
+            return {}, None
+        raise ValueError(f"Unknown operation '{op}'.")
+
+
+class SimulationClient:
+    """Talks to a `SimulationServer`. Requests may be issued concurrently."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._request_ids = itertools.count()
+        self._requests: dict[int, asyncio.Future] = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> SimulationClient:
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        try:
+            while True:
+                header, arrays = await read_frame(self._reader)
+                future = self._requests.pop(header.pop("id"))
+                if "error" in header:
+                    future.set_exception(RuntimeError(header["error"]))
+                else:
+                    future.set_result((header, arrays))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            for future in self._requests.values():
+                future.set_exception(ConnectionError(f"Connection lost: {e}"))
+            self._requests.clear()
+
+    async def _request(
+        self, op: str, arrays: dict[str, np.ndarray] = None, **kwargs
+    ) -> tuple[dict, dict[str, np.ndarray]]:
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._requests[request_id] = future
+        self._writer.write(encode_frame({"id": request_id, "op": op, **kwargs}, arrays))
+        await self._writer.drain()
+        return await future
+
+    async def create(self, **options) -> int:
+        """Create a session.
+
+        :param options: JSON serializable options passed to the scene factory.
+        :return: The id of the session.
+        """
+        header, _ = await self._request("create", options=options)
+        return header["session"]
+
+    async def step(
+        self, session: int, ctrl: np.ndarray = None, num_steps: int = 1
+    ) -> dict[str, Any]:
+        """Optionally set the controls, then step a session.
+
+        :return: The observation after stepping.
+        """
+        arrays = None if ctrl is None else {"ctrl": np.asarray(ctrl, np.float64)}
+        header, arrays = await self._request(
+            "step", arrays, session=session, num_steps=num_steps
+        )
+        return {"time": header["time"], **arrays}
+
+    async def reset(self, session: int) -> dict[str, Any]:
+        header, arrays = await self._request("reset", session=session)
+        return {"time": header["time"], **arrays}
+
+    async def observe(self, session: int) -> dict[str, Any]:
+        """Get the time, positions, velocities, controls and sensor data."""
+        header, arrays = await self._request("observe", session=session)
+        return {"time": header["time"], **arrays}
+
+    async def close_session(self, session: int):
+        await self._request("close", session=session)
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
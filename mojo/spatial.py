@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+import mujoco
+import numpy as np
+
+from mojo.elements.body import Body
+from mojo.elements.camera import Camera
+from mojo.elements.geom import Geom
+
+if TYPE_CHECKING:
+    from mojo import Mojo
+
+
+def world_aabbs(
+    model: mujoco.MjModel, data: mujoco.MjData, geom_ids: np.ndarray = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute world-aligned bounding boxes of geoms in one vectorized pass.
+
+    :param model: The compiled model.
+    :param data: The data holding the current geom poses.
+    :param geom_ids: Geoms to compute boxes for. Defaults to all geoms.
+    :return: Lower and upper corners, each of shape (N, 3).
+    """
+    geom_ids = np.arange(model.ngeom) if geom_ids is None else geom_ids
+    aabb = model.geom_aabb[geom_ids]
+    rotations = data.geom_xmat[geom_ids].reshape(-1, 3, 3)
+    centers = data.geom_xpos[geom_ids] + np.einsum("nij,nj->ni", rotations, aabb[:, :3])
+    half_sizes = np.einsum("nij,nj->ni", np.abs(rotations), aabb[:, 3:])
+    return centers - half_sizes, centers + half_sizes
+
+
+def subtree_body_ids(model: mujoco.MjModel, body_id: int) -> np.ndarray:
+    """Get the ids of a body and all of its descendants."""
+    # Bodies are numbered depth first, so a subtree is a contiguous id range
+    outside = np.flatnonzero(model.body_parentid[body_id + 1 :] < body_id)
+    end = body_id + 1 + outside[0] if len(outside) > 0 else model.nbody
+    return np.arange(body_id, end)
+
+
+def subtree_geom_ids(model: mujoco.MjModel, body_id: int) -> np.ndarray:
+    """Get the ids of the geoms of a body and all of its descendants."""
+    body_ids = subtree_body_ids(model, body_id)
+    return np.flatnonzero(
+        (model.geom_bodyid >= body_ids[0]) & (model.geom_bodyid <= body_ids[-1])
+    )
+
+
+def element_geom_ids(
+    mojo: Mojo, elements: Sequence[Union[Geom, Body]]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Expand geoms and bodies into geom ids.
+
+    Bodies expand to the geoms of their subtree.
+
+    :return: The geom ids and, for every geom id, the index of its element.
+    """
+    model = mojo.model
+    geom_ids, owners = [], []
+    for index, element in enumerate(elements):
+        element_id = int(element.id)
+        if isinstance(element, Body):
+            ids = subtree_geom_ids(model, element_id)
+        elif isinstance(element, Geom):
+            ids = np.array([element_id])
+        else:
+            raise ValueError(f"Expected a geom or body, got {type(element).__name__}.")
+        geom_ids.append(ids)
+        owners.append(np.full(len(ids), index))
+    if not geom_ids:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return (
+        np.concatenate(geom_ids).astype(np.int64),
+        np.concatenate(owners).astype(np.int64),
+    )
+
+
+def distances(
+    mojo: Mojo,
+    group_a: Sequence[Union[Geom, Body]],
+    group_b: Sequence[Union[Geom, Body]],
+    max_dist: float = 1.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute signed distances between two sets of geoms or bodies.
+
+    Geom pairs whose bounding boxes are further apart than `max_dist` are pruned
+    with a vectorized test, so only the remaining pairs run `mj_geomDistance`.
+    The distance between bodies is the smallest distance between their geoms.
+
+    :param mojo: The Mojo instance.
+    :param group_a: Geoms or bodies.
+    :param group_b: Geoms or bodies.
+    :param max_dist: Distances are only computed up to this value. Further
+    pairs are reported at `max_dist`.
+    :return: The (A, B) distance matrix and the (A, B, 6) closest point
+    segments from A to B, which are NaN for pairs at `max_dist`.
+    """
+    model, data = mojo.model, mojo.data
+    ids_a, owners_a = element_geom_ids(mojo, group_a)
+    ids_b, owners_b = element_geom_ids(mojo, group_b)
+    result = np.full((len(group_a), len(group_b)), float(max_dist))
+    segments = np.full((len(group_a), len(group_b), 6), np.nan)
+    if len(ids_a) == 0 or len(ids_b) == 0:
+        return result, segments
+    lower_a, upper_a = world_aabbs(model, data, ids_a)
+    lower_b, upper_b = world_aabbs(model, data, ids_b)
+    # Distance between boxes is a lower bound of the distance between geoms
+    gaps = np.maximum(
+        np.maximum(lower_b[None] - upper_a[:, None], lower_a[:, None] - upper_b[None]),
+        0,
+    )
+    candidates = np.linalg.norm(gaps, axis=-1) <= max_dist
+    candidates &= ids_a[:, None] != ids_b[None]
+    fromto = np.zeros(6)
+    for i, j in zip(*np.nonzero(candidates)):
+        distance = mujoco.mj_geomDistance(
+            model, data, int(ids_a[i]), int(ids_b[j]), max_dist, fromto
+        )
+        a, b = owners_a[i], owners_b[j]
+        if distance < result[a, b]:
+            result[a, b] = distance
+            segments[a, b] = fromto
+    return result, segments
+
+
+def _frustum_planes(
+    mojo: Mojo,
+    camera: Camera,
+    near: Optional[float],
+    far: Optional[float],
+    aspect: Optional[float],
+) -> tuple[np.ndarray, np.ndarray]:
+    model = mojo.model
+    binded = mojo.physics.bind(camera.mjcf)
+    camera_id = int(binded.element_id)
+    sensor_size = model.cam_sensorsize[camera_id]
+    if np.all(sensor_size > 0):
+        intrinsic = model.cam_intrinsic[camera_id]
+        tan_x = sensor_size[0] / (2 * intrinsic[0])
+        tan_y = sensor_size[1] / (2 * intrinsic[1])
+    else:
+        resolution = model.cam_resolution[camera_id]
+        aspect = resolution[0] / resolution[1] if aspect is None else aspect
+        tan_y = np.tan(np.deg2rad(model.cam_fovy[camera_id]) / 2)
+        tan_x = tan_y * aspect
+    extent = model.stat.extent
+    near = model.vis.map.znear * extent if near is None else near
+    far = model.vis.map.zfar * extent if far is None else far
+    # Inward facing planes n.p + d >= 0 in the camera frame, which looks along -z
+    normals = np.array(
+        [
+            [0, 0, -1],
+            [0, 0, 1],
+            [-1, 0, -tan_x],
+            [1, 0, -tan_x],
+            [0, -1, -tan_y],
+            [0, 1, -tan_y],
+        ]
+    )
+    offsets = np.array([-near, far, 0, 0, 0, 0])
+    rotation = np.reshape(binded.xmat, (3, 3))
+    world_normals = normals @ rotation.T
+    world_offsets = offsets - world_normals @ binded.xpos
+    return world_normals, world_offsets
+
+
+class SpatialIndex:
+    """Answers region queries over the world bounding boxes of all geoms.
+
+    Bounding boxes are rebuilt in one vectorized pass on `update()`. With a cell
+    size, geoms are also bucketed into a uniform grid, so queries only test the
+    geoms of the cells they overlap. Frustum tests are conservative and may
+    include boxes just outside the frustum corners.
+    """
+
+    MAX_CELLS_PER_GEOM = 64
+
+    def __init__(
+        self,
+        mojo: Mojo,
+        cell_size: Optional[float] = None,
+        update_on_step: bool = True,
+    ):
+        """Create a spatial index.
+
+        :param mojo: The Mojo instance.
+        :param cell_size: Size of the uniform grid cells. If None, queries test
+        every geom, which is fastest for small scenes.
+        :param update_on_step: If true, the index is updated after every step.
+        Call `update()` after teleporting elements otherwise.
+        """
+        self._mojo = mojo
+        self._cell_size = cell_size
+        self._generation = -1
+        self._lower: Optional[np.ndarray] = None
+        self._upper: Optional[np.ndarray] = None
+        # Geom ids sorted by the flat index of every cell they overlap, within
+        # the box of cells spanned by all bucketed geoms
+        self._grid_keys = np.zeros(0, dtype=np.int64)
+        self._grid_geoms = np.zeros(0, dtype=np.int64)
+        self._grid_low = np.zeros(3, dtype=np.int64)
+        self._grid_shape = np.zeros(3, dtype=np.int64)
+        self._oversized = np.zeros(0, dtype=np.int64)
+        self._update_on_step = update_on_step
+        if update_on_step:
+            mojo.add_step_callback(self.update)
+
+    def update(self):
+        """Rebuild the bounding boxes from the current geom poses."""
+        _ = self._mojo.physics
+        self._lower, self._upper = world_aabbs(self._mojo.model, self._mojo.data)
+        self._generation = self._mojo.generation
+        if self._cell_size is not None:
+            self._build_grid()
+
+    def _build_grid(self):
+        lower_cells = np.floor(self._lower / self._cell_size)
+        upper_cells = np.floor(self._upper / self._cell_size)
+        # Count cells in floating point, since planes span about 1e10 units
+        with np.errstate(invalid="ignore", over="ignore"):
+            extents = upper_cells - lower_cells + 1
+            bucketed = np.all(np.isfinite(extents), axis=-1) & np.all(
+                extents <= self.MAX_CELLS_PER_GEOM, axis=-1
+            )
+        bucketed[bucketed] = (
+            np.prod(extents[bucketed], axis=-1) <= self.MAX_CELLS_PER_GEOM
+        )
+        # Planes and other huge geoms are tested on every query instead
+        self._oversized = np.flatnonzero(~bucketed)
+        geom_ids = np.flatnonzero(bucketed)
+        if len(geom_ids) == 0:
+            self._grid_keys = self._grid_geoms = np.zeros(0, dtype=np.int64)
+            self._grid_shape = np.zeros(3, dtype=np.int64)
+            return
+        lower_cells = lower_cells[geom_ids].astype(np.int64)
+        extents = extents[geom_ids].astype(np.int64)
+        num_cells = np.prod(extents, axis=-1)
+        # Enumerate the cells of every geom as offsets within its own extents
+        geoms = np.repeat(geom_ids, num_cells)
+        starts = np.cumsum(num_cells) - num_cells
+        offsets = np.arange(num_cells.sum()) - np.repeat(starts, num_cells)
+        extents = np.repeat(extents, num_cells, axis=0)
+        cells = np.repeat(lower_cells, num_cells, axis=0)
+        cells[:, 2] += offsets % extents[:, 2]
+        cells[:, 1] += offsets // extents[:, 2] % extents[:, 1]
+        cells[:, 0] += offsets // (extents[:, 2] * extents[:, 1])
+        self._grid_low = cells.min(axis=0)
+        self._grid_shape = cells.max(axis=0) - self._grid_low + 1
+        keys = np.ravel_multi_index((cells - self._grid_low).T, self._grid_shape)
+        order = np.argsort(keys, kind="stable")
+        self._grid_keys, self._grid_geoms = keys[order], geoms[order]
+
+    def _candidates(self, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+        if self._generation != self._mojo.generation:
+            self.update()
+        if self._cell_size is None:
+            return np.arange(len(self._lower))
+        low = np.floor(np.asarray(lower) / self._cell_size).astype(np.int64)
+        high = np.floor(np.asarray(upper) / self._cell_size).astype(np.int64)
+        # Only the cells inside the grid can hold geoms
+        low = np.maximum(low - self._grid_low, 0)
+        high = np.minimum(high - self._grid_low, self._grid_shape - 1)
+        if np.any(high < low):
+            return self._oversized
+        if np.prod(high - low + 1) > len(self._grid_keys):
+            cells = np.stack(np.unravel_index(self._grid_keys, self._grid_shape), -1)
+            inside = np.all((low <= cells) & (cells <= high), axis=-1)
+            geoms = self._grid_geoms[inside]
+        else:
+            ranges = [np.arange(lo, hi + 1) for lo, hi in zip(low, high)]
+            cells = np.meshgrid(*ranges, indexing="ij")
+            keys = np.ravel_multi_index(cells, self._grid_shape).ravel()
+            starts = np.searchsorted(self._grid_keys, keys, side="left")
+            counts = np.searchsorted(self._grid_keys, keys, side="right") - starts
+            offsets = np.cumsum(counts) - counts
+            positions = np.arange(counts.sum()) - np.repeat(offsets - starts, counts)
+            geoms = self._grid_geoms[positions]
+        return np.unique(np.concatenate([self._oversized, geoms]))
+
+    def _to_elements(self, geom_ids: np.ndarray, per_body: bool) -> list:
+        if per_body:
+            body_ids = np.unique(self._mojo.model.geom_bodyid[geom_ids])
+            return [self._mojo.get_body(int(i)) for i in body_ids]
+        return [self._mojo.get_geom(int(i)) for i in geom_ids]
+
+    def query_box(
+        self, lower: np.ndarray, upper: np.ndarray, per_body: bool = False
+    ) -> list[Union[Geom, Body]]:
+        """Find the geoms or bodies overlapping an axis aligned box.
+
+        :param lower: Lower corner of the box.
+        :param upper: Upper corner of the box.
+        :param per_body: If true, return the bodies owning the found geoms.
+        """
+        ids = self._candidates(lower, upper)
+        inside = np.all(self._lower[ids] <= upper, axis=-1) & np.all(
+            self._upper[ids] >= lower, axis=-1
+        )
+        return self._to_elements(ids[inside], per_body)
+
+    def query_sphere(
+        self, center: np.ndarray, radius: float, per_body: bool = False
+    ) -> list[Union[Geom, Body]]:
+        """Find the geoms or bodies overlapping a sphere.
+
+        :param center: Center of the sphere.
+        :param radius: Radius of the sphere.
+        :param per_body: If true, return the bodies owning the found geoms.
+        """
+        center = np.asarray(center, dtype=np.float64)
+        ids = self._candidates(center - radius, center + radius)
+        closest = np.clip(center, self._lower[ids], self._upper[ids])
+        inside = np.linalg.norm(closest - center, axis=-1) <= radius
+        return self._to_elements(ids[inside], per_body)
+
+    def query_frustum(
+        self,
+        camera: Camera,
+        near: Optional[float] = None,
+        far: Optional[float] = None,
+        aspect: Optional[float] = None,
+        per_body: bool = False,
+    ) -> list[Union[Geom, Body]]:
+        """Find the geoms or bodies inside the view frustum of a camera.
+
+        :param camera: The camera. Its field of view, or focal length and sensor
+        size, define the frustum.
+        :param near: Near clipping distance. Defaults to the model's visual znear.
+        :param far: Far clipping distance. Defaults to the model's visual zfar.
+        :param aspect: Width over height of the image. Defaults to the camera
+        resolution.
+        :param per_body: If true, return the bodies owning the found geoms.
+        """
+        if self._generation != self._mojo.generation:
+            self.update()
+        normals, offsets = _frustum_planes(self._mojo, camera, near, far, aspect)
+        ids = np.arange(len(self._lower))
+        centers = (self._lower + self._upper) / 2
+        half_sizes = (self._upper - self._lower) / 2
+        # A box is outside if it is fully behind any of the planes
+        reach = half_sizes @ np.abs(normals).T
+        signed = centers @ normals.T + offsets
+        inside = np.all(signed + reach >= 0, axis=-1)
+        return self._to_elements(ids[inside], per_body)
+
+    def close(self):
+        """Stop updating after every step."""
+        if self._update_on_step:
+            self._mojo.remove_step_callback(self.update)
+            self._update_on_step = False
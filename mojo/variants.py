@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Union
+
+import mujoco
+
+from mojo.elements.utils import model_from_mjb, model_to_mjb
+from mojo.mojo import Mojo, SerializedScene
+
+# Forking a process that already holds rendering contexts is unsafe.
+_START_METHOD = "spawn"
+
+
+@dataclass
+class SceneVariant:
+    """Recipe for one scene variant built on top of a shared base model.
+
+    Recipes are sent to worker processes, so `build` must be picklable,
+    i.e. a module level function.
+    """
+
+    models: list[str] = field(default_factory=list)
+    handle_freejoints: bool = False
+    build: Optional[Callable[..., None]] = None
+    parameters: dict[str, Any] = field(default_factory=dict)
+
+
+def _compile_variant(base: Union[str, SerializedScene], variant: SceneVariant) -> bytes:
+    if isinstance(base, SerializedScene):
+        mojo = Mojo.from_serialized(base)
+    else:
+        mojo = Mojo(base)
+    for path in variant.models:
+        mojo.load_model(path, handle_freejoints=variant.handle_freejoints)
+    if variant.build is not None:
+        variant.build(mojo, **variant.parameters)
+    return model_to_mjb(mojo.model)
+
+
+def compile_variants(
+    base: Union[str, Mojo],
+    variants: list[SceneVariant],
+    max_workers: Optional[int] = None,
+    as_models: bool = False,
+) -> Union[list[bytes], list[mujoco.MjModel]]:
+    """Build and compile scene variants in a process pool.
+
+    Each variant starts from the base scene, loads `models`, then calls
+    `build(mojo, **parameters)` to create or modify elements.
+
+    :param base: Path to the base MJCF model, or a Mojo instance whose current
+    scene, including its edits, timestep and texture resolution cap, is used.
+    :param variants: The variant recipes.
+    :param max_workers: Maximum number of worker processes.
+    :param as_models: If true, return loaded models rather than MJB bytes.
+    :return: One MJB bytestring or model per variant, in order.
+    """
+    if isinstance(base, Mojo):
+        base = base.serialize()
+    context = multiprocessing.get_context(_START_METHOD)
+    with ProcessPoolExecutor(max_workers, mp_context=context) as executor:
+        mjbs = list(executor.map(_compile_variant, [base] * len(variants), variants))
+    if as_models:
+        return [model_from_mjb(mjb) for mjb in mjbs]
+    return mjbs
@@ -25,6 +25,7 @@ core_requirements = [
     "dm_control",
     "mujoco_utils",
     "numpy-quaternion",
+    "scipy",
 ]
 
 setuptools.setup(
@@ -36,6 +37,7 @@ setuptools.setup(
     python_requires=">=3.10",
     install_requires=core_requirements,
     extras_require={
-        "dev": ["pre-commit", "pytest"],
+        "dev": ["pre-commit", "pytest", "Pillow"],
+        "textures": ["Pillow"],
     },
 )
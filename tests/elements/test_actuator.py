@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from mojo import Mojo
+from mojo.elements import Actuator, ActuatorGroup, Body, Geom, Joint
+from mojo.elements.consts import ActuatorType, JointType
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+@pytest.fixture()
+def joints(mojo: Mojo) -> list[Joint]:
+    joints = []
+    for i in range(3):
+        body = Body.create(mojo, position=np.array([i, 0, 1]))
+        Geom.create(mojo, parent=body)
+        joints.append(Joint.create(mojo, parent=body, joint_type=JointType.HINGE))
+    return joints
+
+
+@pytest.mark.parametrize("actuator_type", list(ActuatorType))
+def test_create(mojo: Mojo, joints: list[Joint], actuator_type: ActuatorType):
+    actuator = Actuator.create(mojo, joints[0], actuator_type, name="act")
+    assert actuator.get_actuator_type() == actuator_type
+    assert actuator.get_joint() == joints[0]
+    assert Actuator.get(mojo, "act") == actuator
+    assert mojo.model.nu == 1
+
+
+def test_set_control_clips(mojo: Mojo, joints: list[Joint]):
+    actuator = Actuator.create(mojo, joints[0], ctrl_range=np.array([-1, 1]))
+    actuator.set_control(5.0)
+    assert actuator.get_control() == 1.0
+    assert_array_almost_equal(actuator.get_ctrl_range(), [-1, 1])
+
+
+def test_group_set_controls(mojo: Mojo, joints: list[Joint]):
+    actuators = [
+        Actuator.create(mojo, joints[0], ctrl_range=np.array([-1, 1])),
+        Actuator.create(mojo, joints[1]),
+        Actuator.create(mojo, joints[2], ActuatorType.POSITION),
+    ]
+    group = ActuatorGroup(mojo, actuators[::-1])
+    group.set_controls(np.array([3.0, -10.0, -2.0]))
+    assert_array_almost_equal(mojo.data.ctrl, [-1.0, -10.0, 3.0])
+    assert_array_almost_equal(group.get_controls(), [3.0, -10.0, -1.0])
+    assert np.isinf(group.ctrl_range[0]).all()
+
+
+def test_group_rebinds_after_recompile(mojo: Mojo, joints: list[Joint]):
+    group = ActuatorGroup(mojo, [Actuator.create(mojo, joints[1])])
+    group.set_controls(np.array([1.0]))
+    mojo.root_element.mjcf.actuator.insert("motor", 0, joint=joints[0].mjcf)
+    mojo.mark_dirty()
+    group.set_controls(np.array([2.0]))
+    assert_array_almost_equal(mojo.data.ctrl, [0.0, 2.0])
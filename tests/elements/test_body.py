@@ -5,7 +5,7 @@ import pytest
 from numpy.testing import assert_array_equal
 
 from mojo import Mojo
-from mojo.elements import Body, Geom
+from mojo.elements import Body, Geom, MocapGroup
 
 
 @pytest.fixture()
@@ -52,3 +52,75 @@ def test_is_kinematic(mojo: Mojo, body: Body):
     assert body.is_kinematic()
     body.set_kinematic(False)
     assert not body.is_kinematic()
+
+
+def test_handles_are_interned(mojo: Mojo, body: Body):
+    geom = Geom.create(mojo, parent=body)
+    assert body.geoms[0] is geom
+    assert Body(mojo, body.mjcf) is body
+    body.mjcf.name = "interned"
+    assert {body: 1}[Body.get(mojo, "interned")] == 1
+    assert body != Body.create(mojo)
+    with pytest.raises(AttributeError):
+        body.attribute = 1
+
+
+def test_cached_children_invalidated_on_edit(mojo: Mojo, body: Body):
+    Geom.create(mojo, parent=body)
+    geoms = body.geoms
+    geoms.clear()
+    assert len(body.geoms) == 1
+    Geom.create(mojo, parent=body)
+    assert len(body.geoms) == 2
+    _ = mojo.physics
+    child = Body.create(mojo, parent=body)
+    Geom.create(mojo, parent=child)
+    assert len(body.geoms) == 3
+    child.remove()
+    assert len(body.geoms) == 2
+    assert mojo.model.nbody == 2
+
+
+def test_set_mocap(mojo: Mojo, body: Body):
+    Geom.create(mojo, parent=body)
+    body.set_mocap(True)
+    assert body.is_mocap()
+    _ = mojo.physics
+    generation = mojo.generation
+    body.set_position([1, 2, 3])
+    body.set_quaternion([0, 1, 0, 0])
+    assert_array_equal(mojo.data.mocap_pos[0], [1, 2, 3])
+    mojo.step()
+    assert mojo.generation == generation
+    assert_array_equal(body.get_position(), [1, 2, 3])
+    assert_array_equal(mojo.physics.bind(body.mjcf).xpos, [1, 2, 3])
+    assert_array_equal(body.get_quaternion(), [0, 1, 0, 0])
+    with pytest.raises(ValueError):
+        body.set_kinematic(True)
+    with pytest.raises(ValueError):
+        Body.create(mojo, parent=body).set_mocap(True)
+
+
+def test_mocap_group(mojo: Mojo):
+    bodies = [Body.create(mojo) for _ in range(3)]
+    for body in bodies:
+        body.set_mocap(True)
+    group = MocapGroup(mojo, bodies[::-1])
+    positions = np.arange(9).reshape(3, 3)
+    group.set_poses(positions)
+    assert_array_equal(bodies[0].get_position(), positions[2])
+    assert_array_equal(group.get_positions(), positions)
+    assert_array_equal(group.get_quaternions()[:, 0], [1, 1, 1])
+    with pytest.raises(ValueError):
+        MocapGroup(mojo, [Body.create(mojo)]).get_positions()
+
+
+def test_mocap_body_contacts(mojo: Mojo, body: Body):
+    Geom.create(mojo, parent=body)
+    body.set_mocap(True)
+    other = Body.create(mojo)
+    Geom.create(mojo, parent=other)
+    other.set_kinematic(True)
+    mojo.step()
+    assert body.id == 1
+    assert body.has_collided(other)
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+
+from mojo import Mojo
+from mojo.elements import Geom
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+def _create_pair(mojo: Mojo) -> tuple[Geom, Geom]:
+    geom0 = Geom.create(mojo)
+    geom1 = Geom.create(mojo)
+    geom1.set_kinematic(True)
+    return geom0, geom1
+
+
+def test_layers_compile_to_bitmasks(mojo: Mojo):
+    layers = mojo.collision_layers
+    layers.add_layer("shelf", collides_with=["default"])
+    assert layers.get_contype("shelf") == 2
+    assert layers.get_conaffinity("shelf") == 1
+    assert layers.get_conaffinity("default") == 3
+    assert layers.collides("shelf", "default")
+    assert not layers.collides("shelf", "shelf")
+
+
+def test_layer_without_recompile(mojo: Mojo):
+    geom0, geom1 = _create_pair(mojo)
+    mojo.collision_layers.add_layer("shelf", collides_with=[])
+    mojo.step()
+    assert geom0.has_collided(geom1)
+    generation = mojo.generation
+    geom0.set_collision_layer("shelf")
+    geom1.set_collision_layer("shelf")
+    mojo.step()
+    assert not geom0.has_collided(geom1)
+    assert geom0.get_collision_layer() == "shelf"
+    assert geom0.is_collidable()
+    mojo.collision_layers.set_collides("shelf", "shelf")
+    mojo.step()
+    assert geom0.has_collided(geom1)
+    assert mojo.generation == generation
+
+
+def test_layers_survive_recompile(mojo: Mojo):
+    geom0, geom1 = _create_pair(mojo)
+    mojo.collision_layers.add_layer("shelf", collides_with=[])
+    geom0.set_collision_layer("shelf")
+    geom1.set_collision_layer("shelf")
+    mojo.mark_dirty()
+    mojo.step()
+    assert not geom0.has_collided(geom1)
+
+
+def test_layers_keep_authored_masks(mojo: Mojo):
+    geom0, geom1 = _create_pair(mojo)
+    geom0.mjcf.contype = 2
+    geom0.mjcf.conaffinity = 2
+    mojo.mark_dirty()
+    mojo.collision_layers.add_layer("shelf", collides_with=["default"])
+    mojo.collision_layers.add_layer("tool")
+    geom1.set_collision_layer("tool")
+    assert geom0.get_collision_layer() is None
+    assert mojo.physics.bind(geom0.mjcf).conaffinity == 2
+    geom1.set_collidable(False)
+    mojo.collision_layers.set_collides("tool", "shelf", False)
+    assert geom1.get_collision_layer() is None
+    assert not geom1.is_collidable()
+
+
+def test_clone_keeps_layers(mojo: Mojo):
+    geom0, geom1 = _create_pair(mojo)
+    mojo.collision_layers.add_layer("shelf", collides_with=[])
+    geom0.set_collision_layer("shelf")
+    geom1.set_collision_layer("shelf")
+    clone = mojo.clone(copy_mjcf=True)
+    assert clone.resolve(geom0).get_collision_layer() == "shelf"
+    clone.collision_layers.set_collides("shelf", "shelf")
+    clone.step()
+    assert clone.resolve(geom0).has_collided(clone.resolve(geom1))
+    assert geom0.mjcf.conaffinity == 0
+
+
+def test_exclude_collision(mojo: Mojo):
+    geom0, geom1 = _create_pair(mojo)
+    geom0.parent.exclude_collision(geom1.parent)
+    mojo.step()
+    assert not geom0.has_collided(geom1)
+
+
+def test_unknown_layer(mojo: Mojo):
+    with pytest.raises(ValueError):
+        Geom.create(mojo).set_collision_layer("unknown")
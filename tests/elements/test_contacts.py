@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from mojo import Mojo
+from mojo.contacts import ContactTracker
+from mojo.elements import Body, Geom, Site
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+@pytest.fixture()
+def box(mojo: Mojo) -> Body:
+    body = Body.create(mojo, position=np.array([0, 0, 0.3]))
+    body.set_kinematic(True)
+    Geom.create(mojo, parent=body, size=np.array([0.1, 0.1, 0.1]))
+    Geom.create(
+        mojo,
+        parent=body,
+        size=np.array([0.1, 0.1, 0.1]),
+        position=np.array([0.1, 0, 0]),
+    )
+    return body
+
+
+def _drop(mojo: Mojo, tracker: ContactTracker, steps: int = 50) -> list:
+    began = []
+    for _ in range(steps):
+        mojo.step()
+        began.extend(tracker.began.tolist())
+    return began
+
+
+def test_begin_and_end(mojo: Mojo, box: Body):
+    events = []
+    tracker = ContactTracker(
+        mojo,
+        on_begin=lambda a, b: events.append(("begin", a, b)),
+        on_end=lambda a, b: events.append(("end", a, b)),
+    )
+    began = _drop(mojo, tracker)
+    floor = Geom.get(mojo, "floor")
+    assert len(began) == 2
+    assert events[0][0] == "begin"
+    assert floor in events[0][1:]
+    assert tracker.in_contact(box.geoms[0], floor)
+    box.set_position(np.array([0, 0, 2]))
+    mojo.step()
+    assert len(tracker.ended) == 2
+    assert len(tracker.active) == 0
+    assert [e[0] for e in events[-2:]] == ["end", "end"]
+
+
+def test_per_body(mojo: Mojo, box: Body):
+    tracker = ContactTracker(mojo, per_body=True)
+    began = _drop(mojo, tracker)
+    assert began == [[0, mojo.physics.bind(box.mjcf).element_id]]
+
+
+def test_in_contact_converts_elements(mojo: Mojo, box: Body):
+    other = Body.create(mojo, position=np.array([1, 0, 2]))
+    other_geom = Geom.create(mojo, parent=other, size=np.array([0.1, 0.1, 0.1]))
+    floor = Geom.get(mojo, "floor")
+    body_tracker = ContactTracker(mojo, per_body=True)
+    geom_tracker = ContactTracker(mojo)
+    _drop(mojo, body_tracker)
+    assert body_tracker.in_contact(box.geoms[1], floor)
+    assert not body_tracker.in_contact(other_geom, floor)
+    assert geom_tracker.in_contact(box, floor)
+    assert not geom_tracker.in_contact(box, other)
+    with pytest.raises(TypeError):
+        geom_tracker.in_contact(Site.create(mojo, parent=box))
+
+
+def test_filter(mojo: Mojo, box: Body):
+    other = Body.create(mojo, position=np.array([1, 0, 0.3]))
+    other.set_kinematic(True)
+    Geom.create(mojo, parent=other, size=np.array([0.1, 0.1, 0.1]))
+    tracker = ContactTracker(mojo, per_body=True, elements=[other])
+    began = _drop(mojo, tracker)
+    assert began == [[0, mojo.physics.bind(other.mjcf).element_id]]
+
+
+def test_filter_includes_child_bodies(mojo: Mojo):
+    root = Body.create(mojo, position=np.array([1, 0, 0.3]))
+    root.set_kinematic(True)
+    link = Body.create(mojo, parent=root)
+    geom = Geom.create(mojo, parent=link, size=np.array([0.1, 0.1, 0.1]))
+    tracker = ContactTracker(mojo, elements=[root])
+    _drop(mojo, tracker)
+    assert tracker.in_contact(geom, Geom.get(mojo, "floor"))
+    body_tracker = ContactTracker(mojo, per_body=True, elements=[root])
+    body_tracker.update()
+    assert len(body_tracker.active) == 1
+
+
+def test_close(mojo: Mojo, box: Body):
+    tracker = ContactTracker(mojo)
+    tracker.close()
+    _drop(mojo, tracker)
+    assert len(tracker.active) == 0
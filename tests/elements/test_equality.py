@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import mujoco
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from mojo import Mojo
+from mojo.elements import Body, Equality, Geom
+from mojo.elements.consts import EqualityType
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+def create_body(mojo: Mojo, position: list[float]) -> Body:
+    body = Body.create(mojo, position=position)
+    Geom.create(mojo, parent=body, size=[0.05, 0.05, 0.05])
+    body.set_kinematic(True)
+    return body
+
+
+def equality_violation(mojo: Mojo) -> float:
+    mujoco.mj_forward(mojo.model, mojo.data)
+    rows = mojo.data.efc_type == mujoco.mjtConstraint.mjCNSTR_EQUALITY
+    return float(np.abs(mojo.data.efc_pos[rows]).max())
+
+
+@pytest.mark.parametrize("equality_type", [EqualityType.WELD, EqualityType.CONNECT])
+def test_activate_holds_current_pose(mojo: Mojo, equality_type: EqualityType):
+    first = create_body(mojo, [0, 0, 1])
+    second = create_body(mojo, [0.5, 0, 1])
+    equality = Equality.create(
+        mojo, first, second, equality_type=equality_type, anchor=[0.1, 0.2, 0.3]
+    )
+    assert equality.get_equality_type() == equality_type
+    _ = mojo.physics
+    generation = mojo.generation
+    first.set_quaternion([np.cos(0.3), 0, 0, np.sin(0.3)])
+    second.set_position([0.3, 0.4, 1.2])
+    mojo.forward_kinematics()
+    assert not equality.is_active()
+    equality.activate()
+    assert equality.is_active()
+    assert equality_violation(mojo) < 1e-9
+    equality.deactivate()
+    assert not equality.is_active()
+    assert mojo.generation == generation
+
+
+def test_attached_body_follows(mojo: Mojo):
+    gripper = Body.create(mojo, position=[0, 0, 1])
+    Geom.create(mojo, parent=gripper, size=[0.05, 0.05, 0.05])
+    gripper.set_mocap(True)
+    cube = create_body(mojo, [0, 0, 0.9])
+    equality = Equality.create(mojo, gripper, cube, name="grasp")
+    assert Equality.get(mojo, "grasp") is equality
+    mojo.step()
+    equality.activate()
+    gripper.set_position([0.3, 0, 1])
+    for _ in range(500):
+        mojo.step()
+    assert_array_almost_equal(cube.get_position(), [0.3, 0, 0.9], decimal=2)
+    equality.deactivate()
+    for _ in range(500):
+        mojo.step()
+    assert cube.get_position()[2] < 0.5
+
+
+def test_weld_survives_recompile(mojo: Mojo):
+    first = create_body(mojo, [0, 0, 1])
+    second = create_body(mojo, [0.5, 0, 1])
+    equality = Equality.create(mojo, first, second)
+    mojo.step()
+    second.set_position([0.2, 0.3, 1.1])
+    mojo.forward_kinematics()
+    equality.activate()
+    eq_data = mojo.model.eq_data[equality.id].copy()
+    Geom.create(mojo)
+    _ = mojo.physics
+    assert equality.is_active()
+    assert_array_almost_equal(mojo.model.eq_data[equality.id], eq_data)
+
+
+def test_connect_anchor_survives_recompile(mojo: Mojo):
+    first = create_body(mojo, [0, 0, 1])
+    second = create_body(mojo, [0.5, 0, 1])
+    equality = Equality.create(
+        mojo, first, second, equality_type=EqualityType.CONNECT, anchor=[0.1, 0, 0]
+    )
+    mojo.step()
+    second.set_position([0.2, 0.3, 1.1])
+    mojo.forward_kinematics()
+    equality.activate()
+    eq_data = mojo.model.eq_data[equality.id].copy()
+    # The compiler would derive the anchor from this pose
+    second.set_position([0.6, 0, 1])
+    Geom.create(mojo)
+    _ = mojo.physics
+    assert equality.is_active()
+    assert_array_almost_equal(mojo.model.eq_data[equality.id], eq_data)
+    clone = mojo.clone()
+    Geom.create(clone)
+    assert_array_almost_equal(clone.model.eq_data[equality.id], eq_data)
@@ -6,6 +6,7 @@ from numpy.testing import assert_array_equal
 
 from mojo import Mojo
 from mojo.elements import Body, Geom
+from mojo.elements.consts import CollisionProxy
 
 
 @pytest.fixture()
@@ -87,3 +88,40 @@ def test_is_kinematic(mojo: Mojo, geom: Geom):
     assert geom.is_kinematic()
     geom.set_kinematic(False)
     assert not geom.is_kinematic()
+
+
+@pytest.mark.parametrize(
+    "collision_proxy",
+    [CollisionProxy.CONVEX_HULL, CollisionProxy.BOX, CollisionProxy.SPHERE],
+)
+def test_set_mesh_collision_proxy(
+    mojo: Mojo, geom: Geom, collision_proxy: CollisionProxy, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("MOJO_CACHE_DIR", str(tmp_path))
+    mesh_path = str(Path(__file__).parents[1] / "assets" / "models" / "mug.obj")
+    geom.set_mesh(mesh_path, np.array([0.01, 0.01, 0.01]), collision_proxy)
+    proxies = [g for g in geom.parent.geoms if g != geom]
+    assert len(proxies) == 1
+    assert proxies[0].is_collidable()
+    assert not geom.is_collidable()
+    assert len(list(tmp_path.rglob("*.npz"))) == 1
+    # Second proxy is loaded from the cache
+    other = Geom.create(mojo)
+    other.set_mesh(mesh_path, collision_proxy=collision_proxy)
+    assert len(list(tmp_path.rglob("*.npz"))) == 1
+    mojo.step()
+
+
+def test_set_mesh_replaces_collision_proxies(
+    mojo: Mojo, geom: Geom, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("MOJO_CACHE_DIR", str(tmp_path))
+    mesh_path = str(Path(__file__).parents[1] / "assets" / "models" / "mug.obj")
+    geom.set_mesh(mesh_path, collision_proxy=CollisionProxy.CONVEX_HULL)
+    geom.set_mesh(mesh_path, collision_proxy=CollisionProxy.BOX)
+    proxies = [g for g in geom.parent.geoms if g != geom]
+    assert len(proxies) == 1
+    assert proxies[0].mjcf.type == CollisionProxy.BOX.value
+    geom.set_mesh(mesh_path)
+    assert geom.parent.geoms == [geom]
+    mojo.step()
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from mojo import Mojo
+from mojo.elements import Body, Geom, HeightField
+from mojo.elements.consts import GeomType
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+@pytest.fixture()
+def heights() -> np.ndarray:
+    return np.linspace(0.1, 0.4, 12).reshape(3, 4)
+
+
+def test_create(mojo: Mojo, heights: np.ndarray):
+    field = HeightField.create(mojo, heights, size=[2, 1], max_height=0.5)
+    assert field.shape == (3, 4)
+    assert_array_almost_equal(field.cell_size, [4 / 3, 1])
+    assert_array_almost_equal(field.get_heights(), heights)
+    adr = mojo.model.hfield_adr[0]
+    assert_array_almost_equal(
+        mojo.model.hfield_data[adr : adr + 12], heights.ravel() / 0.5
+    )
+    geom_id = mojo.physics.bind(field.geom.mjcf).element_id
+    assert mojo.model.geom_dataid[geom_id] == 0
+
+
+def test_set_heights_without_recompile(mojo: Mojo, heights: np.ndarray):
+    field = HeightField.create(mojo, heights, max_height=0.5)
+    _ = mojo.physics
+    generation = mojo.generation
+    field.set_heights(heights[::-1])
+    assert mojo.generation == generation
+    assert_array_almost_equal(mojo.model.hfield_data.reshape(3, 4), heights[::-1] / 0.5)
+    with pytest.raises(ValueError):
+        field.set_heights(np.zeros((2, 2)))
+    # Heights survive a recompile, although the compiler rescales elevation data
+    Geom.create(mojo)
+    _ = mojo.physics
+    assert mojo.generation > generation
+    assert_array_almost_equal(mojo.model.hfield_data.reshape(3, 4), heights[::-1] / 0.5)
+
+
+def test_update_region(mojo: Mojo, heights: np.ndarray):
+    field = HeightField.create(mojo, heights, max_height=0.5)
+    field.update_region(np.ones((2, 2)), row=1, column=2)
+    expected = heights.copy()
+    expected[1:, 2:] = 0.5
+    assert_array_almost_equal(field.get_heights(), expected)
+    with pytest.raises(ValueError):
+        field.update_region(np.ones((2, 2)), row=2)
+
+
+def test_scroll(mojo: Mojo, heights: np.ndarray):
+    field = HeightField.create(mojo, heights, size=[1.5, 1], max_height=0.5)
+    field.scroll(1, -1, fill=0.2)
+    expected = np.full((3, 4), 0.2)
+    expected[:2, 1:] = heights[1:, :3]
+    assert_array_almost_equal(field.get_heights(), expected)
+    assert_array_almost_equal(mojo.physics.bind(field.geom.mjcf).pos, [-1, 1, 0])
+
+
+def test_ball_rests_on_terrain(mojo: Mojo):
+    HeightField.create(mojo, np.full((8, 8), 0.3), max_height=0.5, base=0.05)
+    ball = Body.create(mojo, position=[0, 0, 1])
+    Geom.create(mojo, parent=ball, size=[0.05], geom_type=GeomType.SPHERE)
+    ball.set_kinematic(True)
+    for _ in range(500):
+        mojo.step()
+    assert ball.get_position()[2] == pytest.approx(0.35, abs=0.01)
+
+
+def test_height_field_from_xml(tmp_path: Path):
+    path = tmp_path / "terrain.xml"
+    path.write_text(
+        """
+<mujoco>
+  <asset>
+    <hfield name="terrain" nrow="2" ncol="3" size="1 1 0.5 0.1"
+            elevation="0 1 2 3 4 5"/>
+  </asset>
+  <worldbody>
+    <geom type="hfield" hfield="terrain"/>
+  </worldbody>
+</mujoco>
+"""
+    )
+    mojo = Mojo(str(path))
+    field = HeightField.get(mojo, "terrain")
+    # The compiler rescales the elevation to span [0, max_height]
+    expected = np.flipud(np.arange(6).reshape(2, 3)) / 5 * 0.5
+    assert_array_almost_equal(field.get_heights(), expected)
+    field.update_region(np.zeros((1, 1)))
+    expected[0, 0] = 0
+    field.scroll(0, 1)
+    expected = np.concatenate([expected[:, 1:], np.zeros((2, 1))], axis=1)
+    assert_array_almost_equal(field.get_heights(), expected)
+    Geom.create(mojo)
+    _ = mojo.physics
+    assert_array_almost_equal(field.get_heights(), expected)
+    assert_array_almost_equal(mojo.model.hfield_data.reshape(2, 3), expected / 0.5)
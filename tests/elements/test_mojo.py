@@ -1,9 +1,11 @@
 from pathlib import Path
 
+import numpy as np
 import pytest
+from numpy.testing import assert_array_almost_equal
 
 from mojo import Mojo
-from mojo.elements import Body
+from mojo.elements import Body, Geom, Light, Site
 
 
 @pytest.fixture()
@@ -34,3 +36,244 @@ def test_load_freejoint_hierarchy(mojo: Mojo):
     for joint in sphere_and_box.joints:
         assert joint.mjcf.tag == "freejoint"
         assert joint.mjcf.parent.parent.tag == "worldbody"
+
+
+def test_replay(mojo: Mojo):
+    load_model(mojo, "sphere.xml", True)
+    trajectory = {"qpos": [], "time": []}
+    for _ in range(10):
+        mojo.step()
+        trajectory["qpos"].append(mojo.data.qpos.copy())
+        trajectory["time"].append(mojo.data.time)
+    trajectory = {k: np.array(v) for k, v in trajectory.items()}
+    mojo.physics.reset()
+    frames, heights, centers = [], [], []
+
+    def on_frame(frame: int):
+        frames.append(frame)
+        heights.append(mojo.data.xpos[-1, 2])
+        centers.append(mojo.data.subtree_com[-1, 2])
+
+    mojo.replay(trajectory, frame_skip=3, callback=on_frame)
+    assert frames == [0, 3, 6, 9]
+    assert_array_almost_equal(heights, trajectory["qpos"][::3, 2])
+    assert_array_almost_equal(centers, heights)
+    assert mojo.data.time == pytest.approx(trajectory["time"][9])
+
+
+def test_forward_kinematics(mojo: Mojo):
+    static = Body.create(mojo)
+    site = Site.create(mojo, parent=static, position=np.array([0, 0, 1]))
+    Geom.create(mojo, parent=static, size=np.array([0.1, 0.1, 0.1]))
+    free = Body.create(mojo)
+    free.set_kinematic(True)
+    free_geom = Geom.create(mojo, parent=free, size=np.array([0.1, 0.1, 0.1]))
+    _ = mojo.physics
+    static.set_position(np.array([5, 0, 1]))
+    static.set_quaternion(np.array([0, 1, 0, 0]))
+    free.set_position(np.array([5, 0, 1.15]))
+    time = mojo.data.time
+    mojo.forward_kinematics(collision=True)
+    assert mojo.data.time == time
+    assert_array_almost_equal(site.get_position(), [5, 0, 0])
+    assert_array_almost_equal(free_geom.get_position(), [5, 0, 1.15])
+    assert mojo.data.ncon > 0
+
+
+def test_get_element_by_id(mojo: Mojo):
+    body = Body.create(mojo)
+    geom = Geom.create(mojo, parent=body)
+    assert mojo.get_body(mojo.physics.bind(body.mjcf).element_id) == body
+    assert mojo.get_geom(mojo.physics.bind(geom.mjcf).element_id) == geom
+    assert mojo.get_body(0).mjcf.tag == "worldbody"
+
+
+def test_async_compile_keeps_stepping():
+    mojo = Mojo(str(Path(__file__).parents[1] / "world.xml"), async_compile=True)
+    body = Body.create(mojo, position=[0, 0, 2])
+    Geom.create(mojo, parent=body)
+    body.set_kinematic(True)
+    _ = mojo.physics
+    ngeom, generation = mojo.model.ngeom, mojo.generation
+    for _ in range(10):
+        mojo.step()
+    position = body.get_position()
+
+    other = Body.create(mojo, position=[1, 0, 2])
+    Geom.create(mojo, parent=other)
+    assert mojo.is_compiling
+    mojo.step()
+    mojo.wait_compiled()
+    assert not mojo.is_compiling
+    assert mojo.generation > generation
+    assert mojo.model.ngeom == ngeom + 1
+    # The falling body continues from where it was in the previous physics
+    assert mojo.data.time > 0
+    assert np.all(body.get_position() <= position)
+    assert body.get_position()[2] < 2
+    assert_array_almost_equal(other.get_position(), [1, 0, 2])
+
+
+def test_async_compile_matches_unnamed_elements():
+    mojo = Mojo(str(Path(__file__).parents[1] / "world.xml"), async_compile=True)
+    static = Body.create(mojo, position=[1, 0, 0.5])
+    Geom.create(mojo, parent=static)
+    falling = Body.create(mojo, position=[0, 0, 2])
+    falling_geom = Geom.create(mojo, parent=falling)
+    falling.set_kinematic(True)
+    _ = mojo.physics
+    for _ in range(20):
+        mojo.step()
+    position = falling.get_position()
+    mojo.data.xfrc_applied[falling.id] = [0, 0, 1, 0, 0, 0]
+    # Renumbers the unnamed joints, the new joint comes first in the tree
+    static.set_kinematic(True)
+    falling_geom.set_color([1, 0, 0, 1])
+    mojo.wait_compiled()
+    assert_array_almost_equal(falling.get_position(), position, decimal=2)
+    assert_array_almost_equal(static.get_position(), [1, 0, 0.5], decimal=2)
+    assert_array_almost_equal(falling_geom.get_color(), [1, 0, 0, 1])
+    assert mojo.data.xfrc_applied[falling.id, 2] == 1
+
+
+def test_async_compile_keeps_unmapped_writes():
+    mojo = Mojo(str(Path(__file__).parents[1] / "world.xml"), async_compile=True)
+    body = Body.create(mojo, position=[0, 0, 2])
+    geom = Geom.create(mojo, parent=body)
+    light = Light.create(mojo)
+    _ = mojo.physics
+    generation = mojo.generation
+    Body.create(mojo)
+    # Geom masses have no model field, so they need another compile
+    mojo.mirror_to_mjcf(geom.mjcf, mass=2.0)
+    light.set_ambient([0.5, 0.5, 0.5])
+    mojo.wait_compiled()
+    assert mojo.model.body_mass[body.id] == pytest.approx(2.0)
+    assert_array_almost_equal(mojo.physics.bind(light.mjcf).ambient, [0.5] * 3)
+    assert mojo.generation == generation + 2
+    # Writes that map to model fields do not recompile
+    Body.create(mojo)
+    light.set_diffuse([0.2, 0.2, 0.2])
+    mojo.wait_compiled()
+    assert_array_almost_equal(light.get_diffuse(), [0.2] * 3)
+    assert mojo.generation == generation + 3
+
+
+def test_async_compile_binds_new_elements():
+    mojo = Mojo(str(Path(__file__).parents[1] / "world.xml"), async_compile=True)
+    _ = mojo.physics
+    body = Body.create(mojo, position=[0, 0, 1])
+    geom = Geom.create(mojo, parent=body)
+    assert mojo.is_compiling
+    geom.set_color([0, 1, 0, 1])
+    assert not mojo.is_compiling
+    assert_array_almost_equal(geom.get_color(), [0, 1, 0, 1])
+    assert_array_almost_equal(body.get_position(), [0, 0, 1])
+
+
+def test_async_compile_error():
+    mojo = Mojo(str(Path(__file__).parents[1] / "world.xml"), async_compile=True)
+    _ = mojo.physics
+    body = Body.create(mojo)
+    Geom.create(mojo, parent=body)
+    body.mjcf.add("joint", type="hinge", range=[1, -1], limited=True)
+    mojo.mark_dirty()
+    with pytest.raises(ValueError, match="range"):
+        mojo.wait_compiled()
+
+
+def test_clone(mojo: Mojo):
+    body = Body.create(mojo, position=[0, 0, 2])
+    Geom.create(mojo, parent=body)
+    body.set_kinematic(True)
+    mojo.step()
+    clone = mojo.clone()
+    assert clone.model is mojo.model
+    assert clone.data is not mojo.data
+    assert clone.data.time == mojo.data.time
+    for _ in range(10):
+        clone.step()
+    clone_body = clone.resolve(body)
+    assert clone_body.get_position()[2] < body.get_position()[2]
+    assert mojo.data.time < clone.data.time
+    clone.copy_state_from(mojo)
+    assert_array_almost_equal(clone_body.get_position(), body.get_position())
+
+
+def test_clone_copies_mjcf_on_write(mojo: Mojo):
+    body = Body.create(mojo, position=[0, 0, 2])
+    Geom.create(mojo, parent=body)
+    body.set_kinematic(True)
+    _ = mojo.physics
+    clone = mojo.clone()
+    clone_body = clone.resolve(body)
+    clone_body.set_position([5, 5, 5])
+    assert clone.root_element.mjcf is mojo.root_element.mjcf
+    assert_array_almost_equal(body.mjcf.pos, [0, 0, 2])
+    clone_body.set_kinematic(False)
+    assert clone.root_element.mjcf is not mojo.root_element.mjcf
+    assert clone_body.mjcf is not body.mjcf
+    assert body.is_kinematic()
+    assert not clone_body.is_kinematic()
+    # The deferred teleport is applied to the copy
+    assert_array_almost_equal(clone_body.mjcf.pos, [5, 5, 5])
+    assert_array_almost_equal(clone_body.get_position(), [5, 5, 5])
+    assert clone.model is not mojo.model
+
+
+def test_clone_handles_keep_hash_on_write(mojo: Mojo):
+    body = Body.create(mojo)
+    geom = Geom.create(mojo, parent=body)
+    _ = mojo.physics
+    clone = mojo.clone()
+    clone_body, clone_geom = clone.resolve(body), clone.resolve(geom)
+    assert clone_body != body
+    handles = {clone_body: "body", clone_geom: "geom"}
+    members = {clone_body}
+    Geom.create(clone, parent=clone_body)
+    assert clone_body.mjcf is not body.mjcf
+    assert clone_body in members
+    assert handles[clone_geom] == "geom"
+    assert handles[clone.resolve(geom)] == "geom"
+    assert body not in members
+
+
+def test_clone_keeps_scene_when_source_is_edited(mojo: Mojo):
+    body = Body.create(mojo)
+    Geom.create(mojo, parent=body)
+    _ = mojo.physics
+    clone = mojo.clone()
+    ngeom = clone.model.ngeom
+    Geom.create(mojo, parent=body)
+    assert clone.root_element.mjcf is not mojo.root_element.mjcf
+    assert len(clone.resolve(body).geoms) == 1
+    clone.mark_dirty()
+    assert clone.model.ngeom == ngeom
+
+
+def test_clone_with_attachments_raises_before_edit(mojo: Mojo):
+    sphere = mojo.load_model(
+        str(Path(__file__).parents[1] / "assets" / "models" / "sphere.xml"),
+        on_loaded=lambda model_mjcf: model_mjcf.worldbody.body[0].freejoint.remove(),
+    )
+    _ = mojo.physics
+    clone = mojo.clone()
+    with pytest.raises(RuntimeError):
+        clone.resolve(sphere).set_kinematic(True)
+    assert not sphere.is_kinematic()
+
+
+def test_clone_copy_mjcf(mojo: Mojo):
+    body = Body.create(mojo, position=[0, 0, 2])
+    geom = Geom.create(mojo, parent=body)
+    _ = mojo.physics
+    clone = mojo.clone(copy_mjcf=True)
+    assert clone.model is mojo.model
+    clone_geom = clone.resolve(geom)
+    assert clone_geom.mjcf is not geom.mjcf
+    assert clone.resolve(mojo.get_body(0)).mjcf is clone.root_element.mjcf.worldbody
+    Geom.create(clone, parent=clone.resolve(body))
+    assert clone.model.ngeom == mojo.model.ngeom + 1
+    assert len(body.geoms) == 1
+    with pytest.raises(ValueError):
+        clone.resolve(Geom.create(mojo))
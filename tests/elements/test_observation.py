@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from mojo import Mojo
+from mojo.elements import Body, Geom, Joint, Sensor, Site
+from mojo.elements.consts import JointType, SensorType
+from mojo.observation import ObservationSpec, Quantity
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+def test_observe(mojo: Mojo):
+    geom = Geom.create(mojo, position=np.array([0, 0, 1]))
+    geom.set_kinematic(True)
+    fixed = Body.create(mojo, position=np.array([1, 2, 3]))
+    site = Site.create(mojo, parent=fixed)
+    joint = Joint.create(
+        mojo, parent=Geom.create(mojo).parent, joint_type=JointType.SLIDE
+    )
+    sensor = Sensor.create(mojo, SensorType.FRAME_POSITION, fixed)
+    spec = (
+        ObservationSpec(mojo)
+        .add(geom.parent, Quantity.POSITION)
+        .add(fixed, Quantity.QUATERNION)
+        .add(geom, Quantity.COLOR, name="color")
+        .add(joint, Quantity.JOINT_POSITION)
+        .add(joint, Quantity.JOINT_VELOCITY)
+        .add(site, Quantity.POSITION, name="site")
+        .add(sensor, Quantity.SENSOR, name="sensor")
+    )
+    mojo.step()
+    obs = spec.observe()
+    assert spec.size == 3 + 4 + 4 + 1 + 1 + 3 + 3
+    assert_array_almost_equal(obs[:3], geom.parent.get_position())
+    assert_array_almost_equal(obs[3:7], [1, 0, 0, 0])
+    assert_array_almost_equal(obs[spec.slices["color"]], geom.get_color())
+    assert_array_almost_equal(obs[spec.slices["site"]], site.get_position())
+    assert_array_almost_equal(obs[spec.slices["sensor"]], sensor.data)
+
+
+def test_quaternions_of_geoms_and_sites(mojo: Mojo):
+    body = Body.create(mojo, position=np.array([0, 0, 1]))
+    body.set_quaternion(np.array([0.5, 0.5, 0.5, 0.5]))
+    geom = Geom.create(mojo, parent=body)
+    site = Site.create(mojo, parent=body, quaternion=np.array([0, 0, 1, 0]))
+    spec = (
+        ObservationSpec(mojo)
+        .add(geom, Quantity.QUATERNION, name="geom")
+        .add(site, Quantity.QUATERNION, name="site")
+    )
+    mojo.step()
+    obs = spec.observe()
+    assert spec.size == 8
+    assert_array_almost_equal(obs[spec.slices["geom"]], geom.get_quaternion())
+    assert_array_almost_equal(obs[spec.slices["site"]], site.get_quaternion())
+
+
+def test_observe_reuses_buffer(mojo: Mojo):
+    geom = Geom.create(mojo, position=np.array([0, 0, 1]))
+    geom.set_kinematic(True)
+    spec = ObservationSpec(mojo, dtype=np.float32).add(geom.parent, Quantity.POSITION)
+    first = spec.observe()
+    mojo.step()
+    second = spec.observe()
+    assert first is second
+    assert second.dtype == np.float32
+    assert_array_almost_equal(second, geom.parent.get_position())
+
+
+def test_recompile_updates_plan(mojo: Mojo):
+    geom = Geom.create(mojo, position=np.array([0, 0, 1]))
+    spec = ObservationSpec(mojo).add(geom, Quantity.POSITION)
+    spec.observe()
+    Geom.create(mojo, position=np.array([1, 1, 1]))
+    geom.set_position(np.array([2, 2, 2]))
+    mojo.step()
+    assert_array_almost_equal(spec.observe(), geom.get_position())
+
+
+def test_unsupported_quantity(mojo: Mojo):
+    geom = Geom.create(mojo)
+    spec = ObservationSpec(mojo).add(geom, Quantity.JOINT_POSITION)
+    with pytest.raises(ValueError):
+        spec.observe()
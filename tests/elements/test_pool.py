@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from mojo import Mojo
+from mojo.pool import BodyPool
+
+POOL_CAPACITY = 3
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+@pytest.fixture()
+def pool(mojo: Mojo) -> BodyPool:
+    return BodyPool(mojo, POOL_CAPACITY)
+
+
+def test_spawn_does_not_recompile(mojo: Mojo, pool: BodyPool):
+    _ = mojo.physics
+    generation = mojo.generation
+    body = pool.spawn(np.array([0, 0, 1]), color=np.array([1, 0, 0]))
+    assert mojo.generation == generation
+    assert_array_equal(body.get_position(), [0, 0, 1])
+    assert body.geoms[0].is_collidable()
+    assert_array_equal(body.geoms[0].get_color(), [1, 0, 0, 1])
+    assert pool.num_available == POOL_CAPACITY - 1
+
+
+def test_parked_bodies_do_not_move(mojo: Mojo, pool: BodyPool):
+    before = [b.get_position() for b in pool._bodies]
+    for _ in range(10):
+        mojo.step()
+    after = [b.get_position() for b in pool._bodies]
+    assert_array_almost_equal(before, after)
+
+
+def test_spawned_body_falls(mojo: Mojo, pool: BodyPool):
+    body = pool.spawn(np.array([0, 0, 1]))
+    mojo.step()
+    assert body.get_position()[2] < 1
+
+
+def test_despawn(mojo: Mojo, pool: BodyPool):
+    body = pool.spawn(np.array([0, 0, 1]))
+    pool.despawn(body)
+    assert not body.geoms[0].is_collidable()
+    assert pool.num_available == POOL_CAPACITY
+    with pytest.raises(ValueError):
+        pool.despawn(body)
+
+
+def test_spawn_exhausted(mojo: Mojo, pool: BodyPool):
+    for _ in range(POOL_CAPACITY):
+        pool.spawn(np.zeros(3))
+    with pytest.raises(RuntimeError):
+        pool.spawn(np.zeros(3))
+
+
+def test_spawn_state_survives_recompile(mojo: Mojo, pool: BodyPool):
+    body = pool.spawn(np.array([1, 1, 1]), mass=2.0)
+    mojo.mark_dirty()
+    assert_array_equal(body.get_position(), [1, 1, 1])
+    assert mojo.physics.bind(body.mjcf).mass == pytest.approx(2.0)
@@ -0,0 +1,101 @@
+import copy
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from mojo import Mojo
+from mojo.elements import Body, Camera, Geom, Joint, Light
+from mojo.elements.consts import JointType
+from mojo.randomizer import Normal, RandomizedField, Randomizer, Uniform
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+@pytest.fixture()
+def geoms(mojo: Mojo) -> list[Geom]:
+    return [Geom.create(mojo, position=np.array([i, 0, 0])) for i in range(3)]
+
+
+def test_apply_and_restore(mojo: Mojo, geoms: list[Geom]):
+    default_colors = [g.get_color() for g in geoms]
+    randomizer = Randomizer(mojo, seed=0).add(
+        geoms, RandomizedField.COLOR, Uniform(0, 0.5)
+    )
+    generation = mojo.generation
+    (colors,) = randomizer.apply()
+    assert colors.shape == (3, 4)
+    assert_array_almost_equal([g.get_color() for g in geoms], colors)
+    assert mojo.generation == generation
+    randomizer.restore()
+    assert_array_equal([g.get_color() for g in geoms], default_colors)
+
+
+def test_add_after_apply_keeps_defaults(mojo: Mojo, geoms: list[Geom]):
+    default_colors = [g.get_color() for g in geoms]
+    randomizer = Randomizer(mojo, seed=0).add(
+        geoms, RandomizedField.COLOR, Uniform(0, 0.5)
+    )
+    randomizer.apply()
+    randomizer.add([geoms[0].parent], RandomizedField.MASS, Uniform(1, 2))
+    randomizer.add(geoms[:1], RandomizedField.COLOR, Uniform(2, 2), relative=True)
+    randomizer.apply()
+    assert_array_almost_equal(geoms[0].get_color(), 2 * default_colors[0])
+    randomizer.restore()
+    assert_array_equal([g.get_color() for g in geoms], default_colors)
+
+
+def test_relative_mass(mojo: Mojo, geoms: list[Geom]):
+    bodies = [g.parent for g in geoms]
+    default_mass = mojo.physics.bind(bodies[0].mjcf).mass.copy()
+    default_inertia = mojo.physics.bind(bodies[0].mjcf).inertia.copy()
+    randomizer = Randomizer(mojo).add(
+        bodies, RandomizedField.MASS, Uniform(2, 2), relative=True
+    )
+    randomizer.apply()
+    assert_array_almost_equal(mojo.physics.bind(bodies[0].mjcf).mass, default_mass * 2)
+    assert_array_almost_equal(
+        mojo.physics.bind(bodies[0].mjcf).inertia, default_inertia * 2
+    )
+
+
+def test_fields(mojo: Mojo, geoms: list[Geom]):
+    joint = Joint.create(mojo, parent=geoms[0].parent, joint_type=JointType.HINGE)
+    light = Light.create(mojo)
+    camera = Camera.create(mojo)
+    randomizer = (
+        Randomizer(mojo)
+        .add([geoms[1].parent], RandomizedField.FRICTION, Normal(1, 0.1))
+        .add([joint], RandomizedField.DAMPING, Uniform(1, 2))
+        .add([light], RandomizedField.LIGHT_DIFFUSE, Uniform(0, 1))
+        .add([camera], RandomizedField.CAMERA_FOVY, Uniform(40, 50))
+    )
+    friction, damping, diffuse, fovy = randomizer.apply()
+    assert_array_almost_equal(mojo.physics.bind(geoms[1].mjcf).friction, friction[0])
+    assert_array_almost_equal(mojo.physics.bind(joint.mjcf).damping, damping)
+    assert_array_almost_equal(mojo.physics.bind(light.mjcf).diffuse, diffuse[0])
+    assert mojo.physics.bind(camera.mjcf).fovy == pytest.approx(fovy[0])
+
+
+def test_apply_batch(mojo: Mojo, geoms: list[Geom]):
+    randomizer = Randomizer(mojo, seed=0).add(
+        geoms, RandomizedField.COLOR, Uniform(0, 1)
+    )
+    models = [copy.copy(mojo.model) for _ in range(2)]
+    (colors,) = randomizer.apply_batch(models)
+    geom_id = geoms[0].id
+    assert colors.shape == (2, 3, 4)
+    assert_array_almost_equal(models[0].geom_rgba[geom_id], colors[0, 0])
+    assert_array_almost_equal(models[1].geom_rgba[geom_id], colors[1, 0])
+
+
+def test_invalid_element(mojo: Mojo):
+    randomizer = Randomizer(mojo).add(
+        [Body.create(mojo)], RandomizedField.CAMERA_FOVY, Uniform(0, 1)
+    )
+    with pytest.raises(ValueError):
+        randomizer.apply()
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from mojo import Mojo
+from mojo.elements import Body, Camera, Geom, Site
+from mojo.raycast import RayCaster
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+@pytest.fixture()
+def box(mojo: Mojo) -> Geom:
+    body = Body.create(mojo, position=np.array([2, 0, 0.5]))
+    return Geom.create(mojo, parent=body, size=np.array([0.5, 0.5, 0.5]))
+
+
+@pytest.fixture()
+def site(mojo: Mojo) -> Site:
+    body = Body.create(mojo, position=np.array([0, 0, 0.5]))
+    Geom.create(mojo, parent=body, size=np.array([0.1, 0.1, 0.1]))
+    return Site.create(mojo, parent=body)
+
+
+def test_site_cast_rays(mojo: Mojo, site: Site, box: Geom):
+    directions = np.array([[1, 0, 0], [0, 0, -1], [0, 0, 1], [-1, 0, 0]])
+    result = site.cast_rays(directions, exclude_body=site.parent)
+    assert_array_almost_equal(result.distances, [1.5, 0.5, -1, -1])
+    assert_array_equal(result.hit, [True, True, False, False])
+    floor = Geom.get(mojo, "floor")
+    assert result.get_geoms() == [box, floor, None, None]
+    assert result.get_bodies()[0] == box.parent
+
+
+def test_pattern_in_site_frame(mojo: Mojo, site: Site, box: Geom):
+    site.set_quaternion(np.array([0.7071068, 0, 0, 0.7071068]))
+    mojo.forward_kinematics()
+    result = site.cast_rays(np.array([[0, -1, 0]]), exclude_body=site.parent)
+    assert result.distances[0] == pytest.approx(1.5)
+
+
+def test_max_dist_and_groups(mojo: Mojo, site: Site, box: Geom):
+    directions = np.array([[1, 0, 0], [0, 0, -1]])
+    result = site.cast_rays(directions, max_dist=1.0, exclude_body=site.parent)
+    assert_array_equal(result.geom_ids[0], -1)
+    groups = [False, True, False, False, False, False]
+    result = site.cast_rays(directions, geomgroup=groups, exclude_body=site.parent)
+    assert_array_equal(result.hit, [True, False])
+
+
+def test_cast_batch_reuses_buffers(mojo: Mojo, box: Geom):
+    caster = RayCaster(mojo, np.array([[1, 0, 0], [0, 0, -1]]))
+    positions = np.array([[0, 0, 0.5], [0, 0, 2], [0, 5, 0.5]])
+    result = caster.cast_batch(positions)
+    assert result.distances.shape == (3, 2)
+    assert_array_almost_equal(result.distances[:, 1], [0.5, 2.0, 0.5])
+    assert_array_almost_equal(result.distances[:, 0], [1.5, -1, -1])
+    again = caster.cast_batch(positions)
+    assert again.distances is result.distances
+
+
+def test_camera_cast_rays(mojo: Mojo, box: Geom):
+    camera = Camera.create(mojo, position=np.array([2, 0, 3]))
+    result = camera.cast_rays(np.array([[0, 0, -1]]))
+    assert result.distances[0] == pytest.approx(2.0)
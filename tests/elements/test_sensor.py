@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from mojo import Mojo
+from mojo.elements import Body, Geom, Joint, Sensor, SensorGroup, Site
+from mojo.elements.consts import JointType, SensorType
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+@pytest.fixture()
+def body(mojo: Mojo) -> Body:
+    body = Body.create(mojo, position=np.array([0, 0, 1]))
+    body.set_kinematic(True)
+    Geom.create(mojo, parent=body)
+    return body
+
+
+def test_frame_position(mojo: Mojo, body: Body):
+    sensor = Sensor.create(mojo, SensorType.FRAME_POSITION, body)
+    mojo.step()
+    assert_array_almost_equal(sensor.data, mojo.physics.bind(body.mjcf).xpos)
+
+
+def test_view_is_live(mojo: Mojo, body: Body):
+    sensor = Sensor.create(mojo, SensorType.FRAME_POSITION, body)
+    view = sensor.data
+    before = view.copy()
+    for _ in range(5):
+        mojo.step()
+    assert sensor.data is view
+    assert view[2] < before[2]
+
+
+def test_view_rebound_after_recompile(mojo: Mojo, body: Body):
+    sensor = Sensor.create(mojo, SensorType.FRAME_POSITION, body)
+    view = sensor.data
+    Site.create(mojo, parent=body)
+    mojo.step()
+    assert sensor.data is not view
+    assert_array_almost_equal(sensor.data, mojo.physics.bind(body.mjcf).xpos)
+
+
+def test_site_sensor(mojo: Mojo, body: Body):
+    site = Site.create(mojo, parent=body)
+    sensor = Sensor.create(mojo, SensorType.ACCELEROMETER, site)
+    mojo.step()
+    assert sensor.data.shape == (3,)
+
+
+def test_invalid_target(mojo: Mojo, body: Body):
+    with pytest.raises(ValueError):
+        Sensor.create(mojo, SensorType.TOUCH, body)
+
+
+def test_get(mojo: Mojo, body: Body):
+    Sensor.create(mojo, SensorType.SUBTREE_COM, body, name="com")
+    sensor = Sensor.get(mojo, "com")
+    assert sensor.get_sensor_type() == SensorType.SUBTREE_COM
+
+
+def test_sensor_group(mojo: Mojo, body: Body):
+    geom = Geom.create(mojo)
+    joint = Joint.create(mojo, parent=geom.parent, joint_type=JointType.SLIDE)
+    position = Sensor.create(mojo, SensorType.FRAME_POSITION, body)
+    joint_position = Sensor.create(mojo, SensorType.JOINT_POSITION, joint)
+    group = SensorGroup(mojo, [position, joint_position])
+    mojo.step()
+    readings = group.read()
+    assert readings.shape == (4,)
+    assert_array_almost_equal(readings[group.slices[0]], position.data)
+    assert_array_almost_equal(readings[group.slices[1]], joint_position.data)
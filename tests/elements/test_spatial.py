@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from mojo import Mojo
+from mojo.elements import Body, Camera, Geom
+from mojo.spatial import SpatialIndex, world_aabbs
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+def _box(mojo: Mojo, position, size=0.1) -> Body:
+    body = Body.create(mojo, position=np.array(position))
+    Geom.create(mojo, parent=body, size=np.full(3, size))
+    return body
+
+
+def test_world_aabbs(mojo: Mojo):
+    body = _box(mojo, [1, 2, 3])
+    body.set_quaternion(np.array([0.9238795, 0, 0, 0.3826834]))
+    mojo.forward_kinematics()
+    geom_id = mojo.physics.bind(body.geoms[0].mjcf).element_id
+    lower, upper = world_aabbs(mojo.model, mojo.data, np.array([geom_id]))
+    half = 0.1 * np.sqrt(2)
+    assert_array_almost_equal(lower[0], [1 - half, 2 - half, 2.9])
+    assert_array_almost_equal(upper[0], [1 + half, 2 + half, 3.1])
+
+
+def test_distances(mojo: Mojo):
+    gripper = _box(mojo, [0, 0, 1])
+    near = _box(mojo, [0.5, 0, 1])
+    far = _box(mojo, [5, 0, 1])
+    distances, segments = mojo.distances([gripper], [near, far], max_dist=1.0)
+    assert distances.shape == (1, 2)
+    assert distances[0, 0] == pytest.approx(0.3)
+    assert distances[0, 1] == 1.0
+    assert_array_almost_equal(segments[0, 0, [0, 3]], [0.1, 0.4])
+    assert np.isnan(segments[0, 1]).all()
+
+
+def test_distances_of_bodies_use_closest_geom(mojo: Mojo):
+    gripper = _box(mojo, [0, 0, 1])
+    Geom.create(
+        mojo, parent=gripper, size=np.full(3, 0.1), position=np.array([0.3, 0, 0])
+    )
+    target = _box(mojo, [1, 0, 1])
+    distances, _ = mojo.distances([gripper, gripper.geoms[0]], [target])
+    assert_array_almost_equal(distances[:, 0], [0.5, 0.8])
+
+
+def test_distances_of_bodies_include_child_bodies(mojo: Mojo):
+    robot = Body.create(mojo, position=np.array([0, 0, 1]))
+    link = Body.create(mojo, parent=robot, position=np.array([0.5, 0, 0]))
+    Geom.create(mojo, parent=link, size=np.full(3, 0.1))
+    target = _box(mojo, [1, 0, 1])
+    distances, segments = mojo.distances([robot], [target])
+    assert distances[0, 0] == pytest.approx(0.3)
+    assert not np.isnan(segments[0, 0]).any()
+
+
+def test_distances_penetration(mojo: Mojo):
+    first = _box(mojo, [0, 0, 1])
+    second = _box(mojo, [0.15, 0, 1])
+    distances, _ = mojo.distances([first], [second])
+    assert distances[0, 0] == pytest.approx(-0.05)
+
+
+@pytest.mark.parametrize("cell_size", [None, 0.5])
+def test_query_box_and_sphere(mojo: Mojo, cell_size):
+    table_objects = [_box(mojo, [x, 0, 1.1]) for x in (0, 0.5)]
+    far = _box(mojo, [3, 3, 1.1])
+    index = SpatialIndex(mojo, cell_size=cell_size)
+    found = index.query_box([-0.5, -0.5, 1.0], [1, 0.5, 2], per_body=True)
+    assert found == table_objects
+    found = index.query_sphere([3, 3, 1.3], 0.15, per_body=True)
+    assert found == [far]
+    assert index.query_sphere([3, 3, 1.3], 0.05) == []
+
+
+def test_grid_matches_brute_force(mojo: Mojo):
+    rng = np.random.default_rng(0)
+    for position, size in zip(rng.uniform(-2, 2, (30, 3)), rng.uniform(0.05, 0.4, 30)):
+        _box(mojo, position, size)
+    grid = SpatialIndex(mojo, cell_size=0.25, update_on_step=False)
+    brute_force = SpatialIndex(mojo, update_on_step=False)
+    for center, half_size in zip(rng.uniform(-3, 3, (50, 3)), rng.uniform(0, 2, 50)):
+        lower, upper = center - half_size, center + half_size
+        assert grid.query_box(lower, upper) == brute_force.query_box(lower, upper)
+
+
+@pytest.mark.parametrize("cell_size", [0.1, 0.2, 0.7, 2.0, 1e-6])
+def test_grid_with_plane(mojo: Mojo, cell_size: float):
+    floor = Geom.get(mojo, "floor")
+    box = _box(mojo, [0.3, 0, 1.1])
+    index = SpatialIndex(mojo, cell_size=cell_size, update_on_step=False)
+    assert index.query_box([-0.5, -0.5, -0.5], [0.5, 0.5, 0.5]) == [floor]
+    assert box in index.query_sphere([0.3, 0, 1.1], 0.05, per_body=True)
+
+
+def test_index_updates_on_step(mojo: Mojo):
+    body = _box(mojo, [0, 0, 2])
+    body.set_kinematic(True)
+    index = SpatialIndex(mojo, cell_size=0.5)
+    index.update()
+    assert index.query_box([-1, -1, 1.5], [1, 1, 2.5], per_body=True) == [body]
+    for _ in range(50):
+        mojo.step()
+    assert index.query_box([-1, -1, 1.5], [1, 1, 2.5], per_body=True) == []
+    index.close()
+
+
+def test_query_frustum(mojo: Mojo):
+    camera = Camera.create(mojo, position=np.array([0, 0, 5]), fovy=45)
+    visible = _box(mojo, [0, 0, 1])
+    outside = _box(mojo, [5, 0, 1])
+    behind = _box(mojo, [0, 0, 6])
+    found = mojo.query_frustum(camera, per_body=True)
+    assert visible in found
+    assert outside not in found
+    assert behind not in found
+    assert visible not in mojo.query_frustum(camera, far=3, per_body=True)
+
+
+def test_mojo_queries_use_current_poses(mojo: Mojo):
+    body = _box(mojo, [0, 0, 1])
+    assert mojo.query_sphere([0, 0, 1], 0.2) == body.geoms
+    body.set_position(np.array([2, 0, 1]))
+    mojo.forward_kinematics()
+    assert mojo.query_sphere([0, 0, 1], 0.2) == []
+    assert mojo.query_box([1.5, -1, 0.5], [2.5, 1, 1.5]) == body.geoms
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import mujoco
+import numpy as np
+
+from mojo import Mojo
+from mojo.elements import Geom
+from mojo.elements.utils import model_from_mjb
+from mojo.variants import SceneVariant, compile_variants
+
+WORLD_PATH = str(Path(__file__).parents[1] / "world.xml")
+SPHERE_PATH = str(Path(__file__).parents[1] / "assets" / "models" / "sphere.xml")
+
+
+def add_boxes(mojo: Mojo, count: int):
+    for i in range(count):
+        Geom.create(mojo, position=np.array([i, 0, 0]))
+
+
+def test_compile_variants():
+    variants = [
+        SceneVariant(),
+        SceneVariant(models=[SPHERE_PATH], handle_freejoints=True),
+        SceneVariant(build=add_boxes, parameters={"count": 3}),
+    ]
+    mjbs = compile_variants(WORLD_PATH, variants, max_workers=2)
+    models = [model_from_mjb(mjb) for mjb in mjbs]
+    base_ngeom = models[0].ngeom
+    assert models[1].nbody == models[0].nbody + 1
+    assert models[2].ngeom == base_ngeom + 3
+    data = mujoco.MjData(models[1])
+    mujoco.mj_step(models[1], data)
+
+
+def test_compile_variants_as_models():
+    models = compile_variants(WORLD_PATH, [SceneVariant()], as_models=True)
+    assert isinstance(models[0], mujoco.MjModel)
+
+
+def test_compile_variants_from_mojo():
+    mojo = Mojo(WORLD_PATH, timestep=0.002)
+    Geom.create(mojo, position=np.array([0, 0, 1]))
+    models = compile_variants(
+        mojo,
+        [SceneVariant(), SceneVariant(build=add_boxes, parameters={"count": 2})],
+        as_models=True,
+    )
+    assert models[0].ngeom == mojo.model.ngeom
+    assert models[1].ngeom == mojo.model.ngeom + 2
+    assert models[0].opt.timestep == 0.002
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from dm_control import mjcf
+from numpy.testing import assert_array_equal
+
+from mojo import Mojo
+from mojo.bundle import load_physics, read_bundle, write_bundle
+from mojo.elements import Body, Geom
+from mojo.elements.consts import GeomType, TextureMapping
+
+ASSETS = Path(__file__).parents[1] / "assets"
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+def test_write_read_sections(tmp_path: Path):
+    sections = {"a": b"123", "b": np.arange(5.0).tobytes()}
+    write_bundle(tmp_path / "bundle.bin", sections, {"key": 1})
+    metadata, read = read_bundle(tmp_path / "bundle.bin")
+    assert metadata == {"key": 1}
+    assert bytes(read["a"]) == b"123"
+    assert_array_equal(np.frombuffer(read["b"]), np.arange(5.0))
+
+
+def test_rejects_other_files(tmp_path: Path):
+    (tmp_path / "bundle.bin").write_bytes(b"not a bundle at all, really")
+    with pytest.raises(ValueError):
+        read_bundle(tmp_path / "bundle.bin")
+
+
+def test_save_load_bundle(mojo: Mojo, tmp_path: Path):
+    mojo.load_model(str(ASSETS / "models" / "sphere.xml"), handle_freejoints=True)
+    body = Body.create(mojo, position=np.array([0, 0, 1]))
+    body.set_kinematic(True)
+    Geom.create(mojo, parent=body, size=np.array([0.1, 0.1, 0.1]))
+    mesh = Geom.create(
+        mojo,
+        geom_type=GeomType.MESH,
+        mesh_path=str(ASSETS / "models" / "mug.obj"),
+        position=np.array([1, 0, 0]),
+    )
+    mesh.set_texture(str(ASSETS / "textures" / "texture00.png"), TextureMapping.PLANAR)
+    for _ in range(5):
+        mojo.step()
+    # Runtime changes to the compiled model are kept
+    mojo.model.geom_friction[0, 0] = 0.25
+    mojo.save_bundle(str(tmp_path / "scene.bin"))
+
+    loaded = Mojo.load_bundle(str(tmp_path / "scene.bin"))
+    assert loaded.generation == 1
+    assert loaded.data.time == mojo.data.time
+    assert_array_equal(loaded.data.qpos, mojo.data.qpos)
+    assert_array_equal(loaded.data.qvel, mojo.data.qvel)
+    assert loaded.model.geom_friction[0, 0] == 0.25
+    loaded_body = loaded.get_body(mojo.physics.bind(body.mjcf).element_id)
+    assert_array_equal(loaded_body.get_position(), body.get_position())
+    for _ in range(5):
+        mojo.step()
+        loaded.step()
+    assert_array_equal(loaded.data.qpos, mojo.data.qpos)
+    assert loaded.generation == 1
+
+
+def test_loaded_bundle_is_editable(mojo: Mojo, tmp_path: Path):
+    mojo.save_bundle(str(tmp_path / "scene.bin"))
+    loaded = Mojo.load_bundle(str(tmp_path / "scene.bin"))
+    Geom.create(loaded, parent=Body.create(loaded))
+    assert loaded.model.ngeom == mojo.model.ngeom + 1
+    loaded.save_bundle(str(tmp_path / "scene.bin"))
+    assert Mojo.load_bundle(str(tmp_path / "scene.bin")).model.ngeom == 2
+
+
+def test_load_physics_skips_mjcf(
+    mojo: Mojo, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    body = Body.create(mojo, position=np.array([0, 0, 1]))
+    Geom.create(mojo, parent=body, size=np.array([0.1, 0.1, 0.1]))
+    for _ in range(5):
+        mojo.step()
+    mojo.save_bundle(str(tmp_path / "scene.bin"))
+    monkeypatch.setattr(mjcf, "from_xml_string", None)
+    physics = load_physics(tmp_path / "scene.bin")
+    assert physics.data.time == mojo.data.time
+    assert_array_equal(physics.data.qpos, mojo.data.qpos)
+    assert_array_equal(physics.data.xpos, mojo.data.xpos)
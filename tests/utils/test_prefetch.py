@@ -0,0 +1,82 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mojo import Mojo
+from mojo.elements import Geom
+from mojo.elements.consts import TextureMapping
+from mojo.elements.utils import find_asset_files, load_mjcf
+
+ASSETS_DIR = Path(__file__).parents[1] / "assets"
+MODEL_XML = """
+<mujoco model="mug">
+  <compiler meshdir="meshes"/>
+  <asset>
+    <mesh name="mug" file="mug.obj"/>
+  </asset>
+  <worldbody>
+    <body name="mug">
+      <geom type="mesh" mesh="mug"/>
+    </body>
+  </worldbody>
+</mujoco>
+"""
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+@pytest.fixture()
+def model_path(tmp_path: Path) -> Path:
+    (tmp_path / "meshes").mkdir()
+    shutil.copy2(ASSETS_DIR / "models" / "mug.obj", tmp_path / "meshes" / "mug.obj")
+    path = tmp_path / "mug.xml"
+    path.write_text(MODEL_XML)
+    return path
+
+
+def test_find_asset_files(model_path: Path):
+    files = find_asset_files(str(model_path))
+    assert files == {"meshes/mug.obj": str(model_path.parent / "meshes" / "mug.obj")}
+
+
+def test_load_mjcf(model_path: Path):
+    model = load_mjcf(str(model_path))
+    expected = (ASSETS_DIR / "models" / "mug.obj").read_bytes()
+    assert model.asset.mesh[0].file.contents == expected
+
+
+def test_load_model(mojo: Mojo, model_path: Path):
+    mojo.load_model(str(model_path))
+    mojo.step()
+
+
+def test_prefetch(mojo: Mojo, tmp_path: Path):
+    texture_path = tmp_path / "texture.png"
+    shutil.copy2(ASSETS_DIR / "textures" / "texture00.png", texture_path)
+    mojo.prefetch([str(texture_path)])
+    # Prefetched contents are used instead of reading the file again.
+    texture_path.unlink()
+    Geom.create(mojo).set_texture(str(texture_path))
+    mojo.step()
+
+
+def test_prefetch_capped_texture(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("MOJO_CACHE_DIR", str(tmp_path / "cache"))
+    mojo = Mojo(str(Path(__file__).parents[1] / "world.xml"), texture_max_resolution=16)
+    texture_path = tmp_path / "texture.png"
+    shutil.copy2(ASSETS_DIR / "textures" / "texture00.png", texture_path)
+    mojo.prefetch([str(texture_path)], TextureMapping.CUBE)
+    assert mojo.get_prefetched(str(texture_path)) is None
+    # The capped texture is read from memory, without preprocessing it again
+    texture_path.unlink()
+    shutil.rmtree(tmp_path / "cache")
+    Geom.create(mojo).set_texture(str(texture_path))
+    mojo.step()
+    texture_id = mojo.model.ntex - 1
+    assert (
+        max(mojo.model.tex_width[texture_id], mojo.model.tex_height[texture_id]) <= 16
+    )
@@ -0,0 +1,61 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from mojo import Mojo
+from mojo.elements import Geom
+from mojo.recorder import Recorder, RecordingReader
+
+CHUNK_SIZE = 4
+NUM_STEPS = 10
+
+
+@pytest.fixture()
+def mojo() -> Mojo:
+    return Mojo(str(Path(__file__).parents[1] / "world.xml"))
+
+
+@pytest.fixture()
+def geom(mojo: Mojo) -> Geom:
+    geom = Geom.create(mojo, position=np.array([0, 0, 1]))
+    geom.set_kinematic(True)
+    return geom
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_record_and_read(mojo: Mojo, geom: Geom, compress: bool):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        expected_qpos, expected_pos = [], []
+        with Recorder(
+            mojo,
+            temp_dir,
+            fields=("qpos", "time"),
+            bodies=[geom.parent],
+            chunk_size=CHUNK_SIZE,
+            compress=compress,
+        ) as recorder:
+            for _ in range(NUM_STEPS):
+                mojo.step()
+                expected_qpos.append(mojo.data.qpos.copy())
+                expected_pos.append(mojo.physics.bind(geom.parent.mjcf).xpos.copy())
+        assert recorder.num_steps == NUM_STEPS
+        reader = RecordingReader(temp_dir)
+        assert len(reader) == NUM_STEPS
+        assert set(reader.fields) == {"qpos", "time", "body_pos", "body_quat"}
+        assert reader["qpos"].shape == (NUM_STEPS, 7)
+        assert_array_equal(reader["qpos"][:], expected_qpos)
+        assert_array_equal(reader["qpos"][3:7], expected_qpos[3:7])
+        assert_array_equal(reader["qpos"][-1], expected_qpos[-1])
+        assert_array_equal(reader["body_pos"][::3][:, 0], np.array(expected_pos)[::3])
+
+
+def test_recording_stops_after_close(mojo: Mojo, geom: Geom):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        recorder = Recorder(mojo, temp_dir, chunk_size=CHUNK_SIZE)
+        mojo.step()
+        recorder.close()
+        mojo.step()
+        assert len(RecordingReader(temp_dir)) == 1
@@ -0,0 +1,158 @@
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from mojo import Mojo
+from mojo.elements import Actuator, Body, Geom, Joint
+from mojo.server import SimulationClient, SimulationServer, encode_frame, read_frame
+
+
+def create_scene(gear: float = 1.0) -> Mojo:
+    mojo = Mojo(str(Path(__file__).parents[1] / "world.xml"))
+    body = Body.create(mojo, position=[0, 0, 1])
+    Geom.create(mojo, parent=body)
+    joint = Joint.create(mojo, parent=body, range=[-1, 1])
+    Actuator.create(mojo, joint, gear=gear)
+    return mojo
+
+
+async def serve(test):
+    server = SimulationServer(create_scene, max_workers=2, max_sessions=4)
+    host, port = await server.start()
+    client = await SimulationClient.connect(host, port)
+    try:
+        await test(server, client)
+    finally:
+        await client.close()
+        await server.close()
+
+
+def test_frame_roundtrip():
+    async def roundtrip():
+        reader = asyncio.StreamReader()
+        arrays = {"a": np.arange(6.0).reshape(2, 3), "b": np.zeros(0, np.int32)}
+        reader.feed_data(encode_frame({"op": "step"}, arrays))
+        return await read_frame(reader)
+
+    header, arrays = asyncio.run(roundtrip())
+    assert header == {"op": "step"}
+    assert_array_equal(arrays["a"], np.arange(6.0).reshape(2, 3))
+    assert arrays["b"].dtype == np.int32 and arrays["b"].shape == (0,)
+
+
+def test_sessions_are_independent():
+    async def test(server: SimulationServer, client: SimulationClient):
+        sessions = await asyncio.gather(*[client.create() for _ in range(3)])
+        assert sorted(sessions) == [0, 1, 2]
+        # Requests of one tick are batched, and run in order per session
+        observations = await asyncio.gather(
+            client.step(sessions[0], ctrl=[0.5], num_steps=10),
+            client.step(sessions[0], num_steps=10),
+            client.step(sessions[1]),
+            client.observe(sessions[2]),
+        )
+        assert observations[0]["time"] < observations[1]["time"]
+        assert observations[1]["time"] == pytest.approx(20 * observations[2]["time"])
+        assert observations[3]["time"] == 0
+        assert_array_equal(observations[1]["ctrl"], [0.5])
+        assert observations[1]["qpos"][0] > 0
+        reset = await client.reset(sessions[0])
+        assert reset["time"] == 0 and reset["qpos"][0] == 0
+        await client.close_session(sessions[2])
+        assert server.num_sessions == 2
+        with pytest.raises(RuntimeError, match="Unknown session"):
+            await client.observe(sessions[2])
+
+    asyncio.run(serve(test))
+
+
+def test_create_options_and_limits():
+    async def test(server: SimulationServer, client: SimulationClient):
+        session = await client.create(gear=2.0)
+        assert (await client.observe(session))["qpos"].shape == (1,)
+        with pytest.raises(RuntimeError, match="unexpected keyword"):
+            await client.create(unknown=1)
+        results = await asyncio.gather(
+            *[client.create() for _ in range(4)], return_exceptions=True
+        )
+        assert sum(isinstance(r, RuntimeError) for r in results) == 1
+
+    asyncio.run(serve(test))
+
+
+def test_requests_queued_behind_close_fail():
+    async def test(server: SimulationServer, client: SimulationClient):
+        session = await client.create()
+        step = asyncio.create_task(client.step(session, num_steps=5000))
+        await asyncio.sleep(0.01)
+        close = asyncio.create_task(client.close_session(session))
+        await asyncio.sleep(0.01)
+        with pytest.raises(RuntimeError, match="Unknown session"):
+            await client.observe(session)
+        await asyncio.gather(step, close)
+        assert server.num_sessions == 0
+
+    asyncio.run(serve(test))
+
+
+def test_disconnect_closes_sessions():
+    async def test():
+        server = SimulationServer(create_scene)
+        host, port = await server.start()
+        clients = [await SimulationClient.connect(host, port) for _ in range(2)]
+        try:
+            await clients[0].create()
+            await asyncio.gather(clients[1].create(), clients[1].create())
+            assert server.num_sessions == 3
+            await clients[1].close()
+            for _ in range(100):
+                if server.num_sessions == 1:
+                    break
+                await asyncio.sleep(0.01)
+            assert server.num_sessions == 1
+        finally:
+            await clients[0].close()
+            await server.close()
+
+    asyncio.run(test())
+
+
+def test_sessions_belong_to_their_client():
+    async def test():
+        server = SimulationServer(create_scene)
+        host, port = await server.start()
+        clients = [await SimulationClient.connect(host, port) for _ in range(2)]
+        try:
+            session = await clients[0].create()
+            with pytest.raises(RuntimeError, match="Unknown session"):
+                await clients[1].observe(session)
+            with pytest.raises(RuntimeError, match="Unknown session"):
+                await clients[1].close_session(session)
+            assert server.num_sessions == 1
+            assert (await clients[0].observe(session))["time"] == 0
+        finally:
+            for client in clients:
+                await client.close()
+            await server.close()
+
+    asyncio.run(test())
+
+
+def test_close_disconnects_clients():
+    async def test():
+        server = SimulationServer(create_scene)
+        host, port = await server.start()
+        client = await SimulationClient.connect(host, port)
+        try:
+            session = await client.create()
+            await server.close()
+            assert server.num_sessions == 0
+            with pytest.raises(ConnectionError):
+                await client.observe(session)
+        finally:
+            await client.close()
+
+    asyncio.run(test())
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from mojo import Mojo
+from mojo.elements import Geom
+from mojo.elements.consts import TextureMapping
+from mojo.elements.texture_cache import preprocess_texture
+
+MAX_RESOLUTION = 64
+
+
+@pytest.fixture()
+def cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setenv("MOJO_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture()
+def large_texture(tmp_path: Path) -> Path:
+    path = tmp_path / "large.jpg"
+    pixels = np.random.randint(0, 255, (256, 512, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+    return path
+
+
+def test_downsample(cache_dir: Path, large_texture: Path):
+    processed = preprocess_texture(str(large_texture), MAX_RESOLUTION)
+    with Image.open(processed) as image:
+        assert image.size == (MAX_RESOLUTION, MAX_RESOLUTION // 2)
+        assert image.format == "PNG"
+    assert processed == preprocess_texture(str(large_texture), MAX_RESOLUTION)
+    assert len(list(cache_dir.rglob("*.png"))) == 1
+
+
+def test_small_png_is_unchanged(cache_dir: Path):
+    path = str(Path(__file__).parents[1] / "assets" / "textures" / "texture00.png")
+    assert preprocess_texture(path, MAX_RESOLUTION * 8) == path
+
+
+def test_mojo_texture_cap(cache_dir: Path, large_texture: Path):
+    mojo = Mojo(
+        str(Path(__file__).parents[1] / "world.xml"),
+        texture_max_resolution={TextureMapping.PLANAR: MAX_RESOLUTION},
+    )
+    geom = Geom.create(mojo)
+    geom.set_texture(str(large_texture), mapping=TextureMapping.PLANAR)
+    texture = geom.mjcf.material.texture
+    assert texture.file.prefix.endswith(f"{MAX_RESOLUTION}x{MAX_RESOLUTION // 2}")
+    assert mojo.get_texture_max_resolution(TextureMapping.CUBE) is None
+    mojo.step()